@@ -62,6 +62,12 @@ class _ScipyMatrix(_SparseMatrix):
     `_ScipyMatrix` is always NxN.
     Allows basic python operations __add__, __sub__ etc.
     Facilitate matrix populating in an easy way.
+
+    Contributions from `addAt` and `addAtDiagonal` are queued as COO
+    triplets, and `put` is queued as an overwrite, and they are only
+    applied to the CSR matrix, in order, when `matrix` is next accessed,
+    so that a term with several contributions only sorts and reallocates
+    the matrix once.
     """
 
     def __init__(self, matrix):
@@ -72,6 +78,75 @@ class _ScipyMatrix(_SparseMatrix):
         """
         self.matrix = matrix
 
+    def _getMatrix(self):
+        if self._pending:
+            self._assemble()
+        return self._matrix
+
+    def _setMatrix(self, matrix):
+        self._matrix = matrix
+        self._pending = []
+
+    def _delMatrix(self):
+        del self._matrix
+        self._pending = []
+
+    matrix = property(_getMatrix, _setMatrix, _delMatrix)
+
+    def _assemble(self):
+        """Sum all queued COO triplets into the CSR matrix in one pass.
+
+            >>> L = _ScipyMatrixFromShape(size=3)
+            >>> L.addAt([1., 2.], [0, 1], [0, 1])
+            >>> L.addAt([3., 4.], [0, 2], [0, 1])
+            >>> len(L._pending)
+            2
+            >>> print L
+             4.000000      ---        ---    
+                ---     2.000000      ---    
+                ---     4.000000      ---    
+            >>> len(L._pending)
+            0
+        """
+        pending = self._pending
+        self._pending = []
+
+        additions = []
+        for operation in pending:
+            if isinstance(operation, _ScipyPut):
+                self._addTriplets(additions)
+                additions = []
+                self._putTriplets(*operation.triplets)
+            else:
+                additions.append(operation)
+        self._addTriplets(additions)
+
+    def _addTriplets(self, pending):
+        if len(pending) == 0:
+            return
+
+        pattern = self._getSparsityPattern(pending)
+        if pattern is None:
+            vector, id1, id2 = [numerix.concatenate(a) for a in zip(*pending)]
+            temp = sp.csr_matrix((vector, (id1, id2)), self._matrix.shape)
+        else:
+            temp = pattern.fill(numerix.concatenate(zip(*pending)[0]))
+
+        if self._matrix.nnz == 0:
+            self._matrix = temp
+        else:
+            self._matrix = self._matrix + temp
+
+    def _putTriplets(self, vector, id1, id2):
+        # done in such a way to vectorize everything
+        tempVec = vector - self._matrix[id1, id2].flat
+        tempMat = sp.csr_matrix((tempVec, (id1, id2)), self._matrix.shape)
+
+        self._matrix = self._matrix + tempMat
+
+    def _getSparsityPattern(self, pending):
+        return None
+
     def getCoupledClass(self):
         return _CoupledScipyMeshMatrix
 
@@ -89,7 +164,14 @@ class _ScipyMatrix(_SparseMatrix):
         return self._iadd(other)
 
     def _iadd(self, other, sign=1):
-        if hasattr(other, "matrix"):
+        if (isinstance(other, _ScipyMatrix) and other._matrix.nnz == 0
+            and not [operation for operation in other._pending if isinstance(operation, _ScipyPut)]):
+            # defer summation so that all terms are assembled together
+            for vector, id1, id2 in other._pending:
+                if sign != 1:
+                    vector = sign * vector
+                self._pending.append((vector, id1, id2))
+        elif hasattr(other, "matrix"):
             self.matrix = self.matrix + (sign * other.matrix)
         elif type(other) in [float, int]:
             fillVec = numerix.repeat(other, self.matrix.nnz)
@@ -199,7 +281,7 @@ class _ScipyMatrix(_SparseMatrix):
 
     @property
     def _shape(self):
-        return self.matrix.shape
+        return self._matrix.shape
 
     @property
     def _range(self):
@@ -215,14 +297,27 @@ class _ScipyMatrix(_SparseMatrix):
                 ---    10.000000   3.000000  
                 ---     3.141593      ---    
              2.500000      ---        ---    
+
+        It overwrites what was added before it, but not what is added
+        after it, even though both are only applied when the matrix is
+        next used
+
+            >>> L = _ScipyMatrixFromShape(size=3)
+            >>> L.addAt([1., 1.], [0, 1], [0, 1])
+            >>> L.put([5.], [0], [0])
+            >>> L.addAt([2., 2.], [0, 1], [0, 1])
+            >>> len(L._pending)
+            3
+            >>> print L
+             7.000000      ---        ---    
+                ---     3.000000      ---    
+                ---        ---        ---    
         """
         assert(len(id1) == len(id2) == len(vector))
 
-        # done in such a way to vectorize everything
-        tempVec = numerix.array(vector) - self.matrix[id1, id2].flat
-        tempMat = sp.csr_matrix((tempVec, (id1, id2)), self.matrix.shape)
-
-        self.matrix = self.matrix + tempMat
+        self._pending.append(_ScipyPut(numerix.array(vector).ravel(),
+                                       _flat(id1),
+                                       _flat(id2)))
 
     def putDiagonal(self, vector):
         """
@@ -262,12 +357,24 @@ class _ScipyMatrix(_SparseMatrix):
             12.300000  10.000000   3.000000  
                 ---     3.141593   2.960000  
              2.500000      ---     2.200000  
+
+        The elements are only added when the matrix is next used, but the
+        arrays passed in can be reused right away
+
+            >>> L = _ScipyMatrixFromShape(size=3)
+            >>> i = numerix.array([0, 1])
+            >>> j = numerix.array([0, 1])
+            >>> L.addAt([1., 2.], i, j)
+            >>> i[:] = 2
+            >>> j[:] = 2
+            >>> print numerix.allclose(L.takeDiagonal(), (1., 2., 0.))
+            True
         """
         assert(len(id1) == len(id2) == len(vector))
 
-        temp = sp.csr_matrix((vector, (id1, id2)), self.matrix.shape)
-
-        self.matrix = self.matrix + temp
+        self._pending.append((numerix.array(vector).ravel(),
+                              _flat(id1),
+                              _flat(id2)))
 
     def addAtDiagonal(self, vector):
         if type(vector) in [type(1), type(1.)]:
@@ -289,6 +396,97 @@ class _ScipyMatrix(_SparseMatrix):
     def __getitem__(self, indices):
         return self.matrix[indices]
 
+def _flat(ids):
+    """`ids` as a flat array that the caller can no longer change, which is
+    `ids` itself if it already is a flat, read-only array, like the cached
+    ID arrays of a mesh topology, and a copy otherwise."""
+    if isinstance(ids, numerix.ndarray) and ids.ndim == 1 and not ids.flags.writeable:
+        return ids
+    return numerix.array(ids).ravel()
+
+class _ScipyPut(object):
+    """Queued overwrite of the elements at (`id1`, `id2`) with `vector`.
+    """
+    def __init__(self, vector, id1, id2):
+        self.triplets = (vector, id1, id2)
+
+class _ScipySparsityPattern(object):
+    """CSR structure of an assembled matrix.
+
+    Holds the `indptr` and `indices` of the CSR matrix built from a given
+    sequence of COO (`id1`, `id2`) coordinates, together with the slot
+    in `data` that each coordinate sums into. A matrix with the same
+    stencil can then be filled without sorting.
+    """
+    def __init__(self, pending, shape):
+        vectors, id1s, id2s = zip(*pending)
+        self.id1 = numerix.concatenate(id1s)
+        self.id2 = numerix.concatenate(id2s)
+        self.shape = shape
+        self.fingerprint = self._fingerprint(pending)
+        # the arrays this pattern was last matched with
+        self._seen = [(id1, id2) for vector, id1, id2 in pending]
+
+        rows, cols = shape
+        keys = self.id1.astype('int64') * cols + self.id2
+        keys, self.slots = numerix.unique(keys, return_inverse=True)
+
+        if max(rows, cols, len(keys)) < 2**31:
+            indexType = numerix.int32
+        else:
+            indexType = numerix.int64
+        self.indices = (keys % cols).astype(indexType)
+        self.indptr = numerix.searchsorted(keys // cols,
+                                           numerix.arange(rows + 1)).astype(indexType)
+
+    @staticmethod
+    def _fingerprint(pending):
+        """A few of the coordinates of each contribution, which tell most
+        different stencils apart without comparing them all.
+        """
+        fingerprint = []
+        for vector, id1, id2 in pending:
+            if len(id1) > 0:
+                samples = numerix.linspace(0, len(id1) - 1, 5).astype(int)
+                fingerprint.append((tuple(id1[samples]), tuple(id2[samples])))
+            else:
+                fingerprint.append(())
+        return tuple(fingerprint)
+
+    def matches(self, pending, fingerprint):
+        """Whether the queued (`vector`, `id1`, `id2`) triplets have this stencil.
+
+        Contributions whose coordinate arrays are the read-only arrays
+        this pattern was last matched with are not compared again.
+        """
+        if fingerprint != self.fingerprint or len(pending) != len(self._seen):
+            return False
+
+        start = 0
+        for (vector, id1, id2), (seen1, seen2) in zip(pending, self._seen):
+            stop = start + len(id1)
+            if not (self._same(id1, seen1, self.id1[start:stop])
+                    and self._same(id2, seen2, self.id2[start:stop])):
+                return False
+            start = stop
+
+        if start != len(self.id1):
+            return False
+
+        self._seen = [(id1, id2) for vector, id1, id2 in pending]
+        return True
+
+    @staticmethod
+    def _same(ids, seen, stored):
+        return ((ids is seen and not ids.flags.writeable)
+                or numerix.array_equal(ids, stored))
+
+    def fill(self, vector):
+        data = numerix.bincount(self.slots, weights=vector,
+                                minlength=len(self.indices))
+        return sp.csr_matrix((data, self.indices.copy(), self.indptr.copy()),
+                             shape=self.shape)
+
 class _ScipyMatrixFromShape(_ScipyMatrix):
 
     def __init__(self, size, bandwidth=0, sizeHint=None, matrix=None, storeZeros=True):
@@ -307,6 +505,8 @@ class _ScipyMatrixFromShape(_ScipyMatrix):
 
 class _ScipyMeshMatrix(_ScipyMatrixFromShape):
 
+    _patternsPerKey = 4
+
     def __init__(self, mesh, bandwidth=0, sizeHint=None, matrix=None, numberOfVariables=1, numberOfEquations=1, storeZeros=True):
 
         """Creates a `_ScipyMatrixFromShape` associated with a `Mesh`.
@@ -326,6 +526,65 @@ class _ScipyMeshMatrix(_ScipyMatrixFromShape):
         assert numberOfEquations == self.numberOfVariables
         _ScipyMatrixFromShape.__init__(self, size=size, matrix=matrix)
 
+    def _getSparsityPattern(self, pending):
+        """Return the cached `_ScipySparsityPattern` for the stencil of the
+        queued triplets.
+
+        Patterns are kept on the mesh, so the matrices built for a given
+        set of terms on successive sweeps share one pattern. A few patterns
+        are kept for each size of contributions, so that equations whose
+        stencils differ but have the same size do not evict each other.
+
+            >>> from fipy import Grid1D
+            >>> mesh = Grid1D(nx=3)
+            >>> L = _ScipyMeshMatrix(mesh=mesh)
+            >>> L.addAt([1., 2., 3.], [0, 1, 2], [1, 2, 0])
+            >>> L.addAtDiagonal(1.)
+            >>> pending = list(L._pending)
+            >>> print numerix.allequal(L.numpyArray, [[1, 1, 0],
+            ...                                       [0, 1, 2],
+            ...                                       [3, 0, 1]])
+            True
+            >>> pattern = L._getSparsityPattern(pending)
+            >>> L = _ScipyMeshMatrix(mesh=mesh)
+            >>> L.addAt([4., 5., 6.], [0, 1, 2], [1, 2, 0])
+            >>> L.addAtDiagonal(2.)
+            >>> print numerix.allequal(L.numpyArray, [[2, 4, 0],
+            ...                                       [0, 2, 5],
+            ...                                       [6, 0, 2]])
+            True
+            >>> L._getSparsityPattern(pending) is pattern
+            True
+
+            >>> L = _ScipyMeshMatrix(mesh=mesh)
+            >>> L.addAt([1., 2., 3.], [1, 2, 0], [0, 1, 2])
+            >>> L.addAtDiagonal(1.)
+            >>> other = L._getSparsityPattern(list(L._pending))
+            >>> other is pattern
+            False
+            >>> L._getSparsityPattern(pending) is pattern
+            True
+        """
+        if not hasattr(self.mesh, "_sparsityPatterns"):
+            self.mesh._sparsityPatterns = {}
+        patterns = self.mesh._sparsityPatterns
+
+        key = (self._matrix.shape, tuple([len(id1) for vector, id1, id2 in pending]))
+        fingerprint = _ScipySparsityPattern._fingerprint(pending)
+        candidates = patterns.setdefault(key, [])
+        for pattern in candidates:
+            if pattern.matches(pending, fingerprint):
+                # most recently used first
+                candidates.remove(pattern)
+                candidates.insert(0, pattern)
+                return pattern
+
+        pattern = _ScipySparsityPattern(pending, self._matrix.shape)
+        candidates.insert(0, pattern)
+        del candidates[self._patternsPerKey:]
+
+        return pattern
+
     def __mul__(self, other):
         if isinstance(other, _ScipyMeshMatrix):
             return _ScipyMeshMatrix(mesh=self.mesh,
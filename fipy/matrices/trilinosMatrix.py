@@ -592,6 +592,57 @@ class _TrilinosMatrixFromShape(_TrilinosMatrix):
                                      domainMap=domainMap,
                                      bandwidth=bandwidth)
 
+class _TrilinosMeshMaps(object):
+    """Row and column IDs and Epetra maps of the matrices of a `Mesh`
+
+    They only depend on the mesh and on the numbers of equations and
+    variables, so they are built once, kept on the mesh and shared by every
+    matrix assembled on it, for every term and every sweep.
+
+    :Parameters:
+      - `mesh`: The `Mesh` to assemble matrices for.
+      - `numberOfEquations`: The number of blocks of rows.
+      - `numberOfVariables`: The number of blocks of columns.
+    """
+    def __init__(self, mesh, numberOfEquations, numberOfVariables):
+        def expand(IDs, M, N):
+            return (numerix.vstack([IDs] * M) + numerix.indices((M, len(IDs)))[0] * N).flatten()
+
+        N = mesh.globalNumberOfCells
+        self.globalNonOverlappingRowIDs = expand(mesh._globalNonOverlappingCellIDs, numberOfEquations, N)
+        self.globalNonOverlappingColIDs = expand(mesh._globalNonOverlappingCellIDs, numberOfVariables, N)
+        self.globalOverlappingRowIDs = expand(mesh._globalOverlappingCellIDs, numberOfEquations, N)
+        self.globalOverlappingColIDs = expand(mesh._globalOverlappingCellIDs, numberOfVariables, N)
+
+        N = mesh.numberOfCells
+        self.localNonOverlappingRowIDs = expand(mesh._localNonOverlappingCellIDs, numberOfEquations, N)
+        self.localNonOverlappingColIDs = expand(mesh._localNonOverlappingCellIDs, numberOfVariables, N)
+
+        # whether each local row belongs to this processor, so stencils
+        # are masked by lookup rather than by a set operation
+        self.ownedRows = numerix.in1d(self.globalOverlappingRowIDs, self.globalNonOverlappingRowIDs)
+
+        comm = mesh.communicator.epetra_comm
+        self.rowMap = Epetra.Map(-1, list(self.globalNonOverlappingRowIDs), 0, comm)
+        self.colMap = Epetra.Map(-1, list(self.globalOverlappingColIDs), 0, comm)
+        self.domainMap = self.rowMap
+
+    @property
+    def importer(self):
+        """Imports non-overlapping vectors to overlapping ones"""
+        if not hasattr(self, '_importer'):
+            self._importer = Epetra.Import(self.colMap, self.domainMap)
+        return self._importer
+
+    @classmethod
+    def _forMesh(cls, mesh, numberOfEquations, numberOfVariables):
+        if not hasattr(mesh, '_trilinosMapsCache'):
+            mesh._trilinosMapsCache = {}
+        key = (numberOfEquations, numberOfVariables)
+        if key not in mesh._trilinosMapsCache:
+            mesh._trilinosMapsCache[key] = cls(mesh, numberOfEquations, numberOfVariables)
+        return mesh._trilinosMapsCache[key]
+
 class _TrilinosMeshMatrix(_TrilinosMatrixFromShape):
     def __init__(self, mesh, bandwidth=0, sizeHint=None, numberOfVariables=1, numberOfEquations=1):
         """Creates a `_TrilinosMatrixFromShape` associated with a `Mesh`
@@ -607,51 +658,30 @@ class _TrilinosMeshMatrix(_TrilinosMatrixFromShape):
         self.numberOfVariables = numberOfVariables
         self.numberOfEquations = numberOfEquations
 
-        comm = mesh.communicator.epetra_comm
-        rowMap = Epetra.Map(-1, list(self._globalNonOverlappingRowIDs), 0, comm)
-        colMap = Epetra.Map(-1, list(self._globalOverlappingColIDs), 0, comm)
-        domainMap = rowMap
+        self._maps = _TrilinosMeshMaps._forMesh(mesh,
+                                                numberOfEquations=numberOfEquations,
+                                                numberOfVariables=numberOfVariables)
 
         _TrilinosMatrixFromShape.__init__(self,
                                  rows=self.numberOfEquations * self.mesh.globalNumberOfCells,
                                  cols=self.numberOfVariables * self.mesh.globalNumberOfCells,
                                  bandwidth=bandwidth,
                                  sizeHint=sizeHint,
-                                 rowMap=rowMap,
-                                 colMap=colMap,
-                                 domainMap=domainMap)
-
-    def _cellIDsToGlobalRowIDs(self, IDs):
-         N = len(IDs)
-         M = self.numberOfEquations
-         return (numerix.vstack([IDs] * M) + numerix.indices((M,N))[0] * self.mesh.globalNumberOfCells).flatten()
-
-    def _cellIDsToGlobalColIDs(self, IDs):
-         N = len(IDs)
-         M = self.numberOfVariables
-         return (numerix.vstack([IDs] * M) + numerix.indices((M,N))[0] * self.mesh.globalNumberOfCells).flatten()
-
-    def _cellIDsToLocalRowIDs(self, IDs):
-         M = self.numberOfEquations
-         N = len(IDs)
-         return (numerix.vstack([IDs] * M) + numerix.indices((M,N))[0] * self.mesh.numberOfCells).flatten()
-
-    def _cellIDsToLocalColIDs(self, IDs):
-         M = self.numberOfVariables
-         N = len(IDs)
-         return (numerix.vstack([IDs] * M) + numerix.indices((M,N))[0] * self.mesh.numberOfCells).flatten()
+                                 rowMap=self._maps.rowMap,
+                                 colMap=self._maps.colMap,
+                                 domainMap=self._maps.domainMap)
 
     @property
     def _globalNonOverlappingRowIDs(self):
-        return self._cellIDsToGlobalRowIDs(self.mesh._globalNonOverlappingCellIDs)
+        return self._maps.globalNonOverlappingRowIDs
 
     @property
     def _globalNonOverlappingColIDs(self):
-        return self._cellIDsToGlobalColIDs(self.mesh._globalNonOverlappingCellIDs)
+        return self._maps.globalNonOverlappingColIDs
 
     @property
     def _globalOverlappingRowIDs(self):
-        return self._cellIDsToGlobalRowIDs(self.mesh._globalOverlappingCellIDs)
+        return self._maps.globalOverlappingRowIDs
 
     @property
     def _globalCommonColIDs(self):
@@ -659,15 +689,19 @@ class _TrilinosMeshMatrix(_TrilinosMatrixFromShape):
 
     @property
     def _globalOverlappingColIDs(self):
-        return self._cellIDsToGlobalColIDs(self.mesh._globalOverlappingCellIDs)
+        return self._maps.globalOverlappingColIDs
 
     @property
     def _localNonOverlappingRowIDs(self):
-        return self._cellIDsToLocalRowIDs(self.mesh._localNonOverlappingCellIDs)
+        return self._maps.localNonOverlappingRowIDs
 
     @property
     def _localNonOverlappingColIDs(self):
-        return self._cellIDsToLocalColIDs(self.mesh._localNonOverlappingCellIDs)
+        return self._maps.localNonOverlappingColIDs
+
+    @property
+    def _colImporter(self):
+        return self._maps.importer
 
     def copy(self):
         tmp = _TrilinosMatrixFromShape.copy(self)
@@ -680,12 +714,9 @@ class _TrilinosMeshMatrix(_TrilinosMatrixFromShape):
         return self
 
     def _getStencil(self, id1, id2):
-        id1 = self._globalOverlappingRowIDs[id1]
-        id2 = self._globalOverlappingColIDs[id2]
-
-        mask = numerix.in1d(id1, self._globalNonOverlappingRowIDs)
-        id1 = id1[mask]
-        id2 = id2[mask]
+        mask = self._maps.ownedRows[id1]
+        id1 = self._globalOverlappingRowIDs[id1][mask]
+        id2 = self._globalOverlappingColIDs[id2][mask]
 
         return id1, id2, mask
 
@@ -732,8 +763,7 @@ class _TrilinosMeshMatrix(_TrilinosMatrixFromShape):
 
         overlapping_result = Epetra.Vector(self.colMap)
         overlapping_result.Import(nonoverlapping_result,
-                                  Epetra.Import(self.colMap,
-                                                self.domainMap),
+                                  self._colImporter,
                                   Epetra.Insert)
 
         return overlapping_result
@@ -814,8 +844,7 @@ class _TrilinosMeshMatrix(_TrilinosMatrixFromShape):
                     if other_map.SameAs(self.colMap):
                         overlapping_result = Epetra.Vector(self.colMap)
                         overlapping_result.Import(nonoverlapping_result,
-                                                  Epetra.Import(self.colMap,
-                                                                self.domainMap),
+                                                  self._colImporter,
                                                   Epetra.Insert)
 
                         return overlapping_result
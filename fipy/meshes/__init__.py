@@ -5,6 +5,8 @@ from fipy.meshes.periodicGrid3D import *
 from fipy.meshes.skewedGrid2D import *
 from fipy.meshes.tri2D import *
 from fipy.meshes.gmshMesh import *
+from fipy.meshes.meshPartitioner import *
+from fipy.meshes.meshConcatenation import *
 
 __all__ = []
 __all__.extend(factoryMeshes.__all__)
@@ -14,3 +16,5 @@ __all__.extend(periodicGrid3D.__all__)
 __all__.extend(skewedGrid2D.__all__)
 __all__.extend(tri2D.__all__)
 __all__.extend(gmshMesh.__all__)
+__all__.extend(meshPartitioner.__all__)
+__all__.extend(meshConcatenation.__all__)
@@ -59,6 +59,56 @@ from fipy.tools.dimensions.physicalField import PhysicalField
 from fipy.meshes.representations.abstractRepresentation import _AbstractRepresentation
 from fipy.meshes.topologies.abstractTopology import _AbstractTopology
 
+def _sparseDot(matrix, values, out=None):
+    """
+    `matrix` applied to the last axis of `values`.
+
+    When `out` has the type of the product and is contiguous, the product
+    of a CSR `matrix` is accumulated directly into it, without a
+    temporary, as long as the SciPy in use still has the routine for it
+
+        >>> from scipy import sparse # doctest: +SCIPY
+        >>> matrix = sparse.csr_matrix([[1., 1., 0.], [0., 2., 1.]]) # doctest: +SCIPY
+        >>> out = numerix.empty((2, 2))
+        >>> print _sparseDot(matrix, numerix.array([[1., 2., 3.], [0., 1., 0.]]), out=out) is out # doctest: +SCIPY
+        True
+        >>> print out # doctest: +SCIPY
+        [[ 3.  7.]
+         [ 1.  2.]]
+    """
+    values = numerix.asarray(values)
+    leading = values.shape[:-1]
+
+    matvec = None
+    if (out is not None
+        and matrix.format == 'csr'
+        and out.flags.c_contiguous
+        and out.dtype == matrix.dtype == numerix.result_type(matrix.dtype, values.dtype)):
+        try:
+            # not part of the public SciPy API, so it may move or go away
+            from scipy.sparse._sparsetools import csr_matvec as matvec
+        except ImportError:
+            pass
+
+    if matvec is not None:
+        rows, columns = matrix.shape
+        vectors = numerix.ascontiguousarray(values, dtype=out.dtype).reshape((-1, columns))
+        results = out.reshape((-1, rows))
+        results[...] = 0
+        for vector, result in zip(vectors, results):
+            # accumulates `matrix * vector` into `result`
+            matvec(rows, columns, matrix.indptr, matrix.indices, matrix.data,
+                   vector, result)
+        return out
+
+    vectors = values.reshape((-1, values.shape[-1])).swapaxes(0, 1)
+    product = matrix.dot(vectors).swapaxes(0, 1).reshape(leading + (matrix.shape[0],))
+    if out is None:
+        return product
+    else:
+        out[...] = product
+        return out
+
 class MeshAdditionError(Exception):
     pass
 
@@ -105,6 +155,237 @@ class AbstractMesh(object):
     def getNearestCell(self, point):
         return self._getCellsByID([self._getNearestCellID(point)])[0]
 
+    def _locateCells(self, points, cellIDs=None, chunkSize=100000):
+        """
+        Find the local cells that contain `points`.
+
+        Starting from the cell nearest to each point, or from `cellIDs`,
+        walk across the face that the point lies furthest outside of,
+        until the point is inside all faces of the cell. A point outside
+        the mesh ends in the cell where its walk reaches the boundary.
+
+        :Parameters:
+          - `points`: `(D, P)` array of points.
+          - `cellIDs`: Optional global IDs of cells to start walking from.
+          - `chunkSize`: Number of points to walk at a time.
+
+        >>> from fipy import Tri2D
+        >>> mesh = Tri2D(nx=2, ny=1)
+        >>> points = numerix.array(((0.1, 0.5, 0.9, 1.5, 2.5),
+        ...                         (0.5, 0.9, 0.5, 0.2, 0.5)))
+        >>> print mesh._locateCells(points)
+        [4 2 0 7 1]
+
+        The same cells are found when every walk starts from the same cell
+
+        >>> print mesh._locateCells(points, cellIDs=[6, 6, 6, 6, 6])
+        [4 2 0 7 1]
+        """
+        points = numerix.array(points, dtype=float)
+        points = points.reshape((points.shape[0], -1))
+
+        if cellIDs is None:
+            cellIDs = self._getNearestCellID(points)
+        globalToLocal = -numerix.ones((self.globalNumberOfCells,), dtype=numerix.INT_DTYPE)
+        globalToLocal[self._globalOverlappingCellIDs] = numerix.arange(self.numberOfCells)
+        cellIDs = globalToLocal[numerix.asarray(cellIDs, dtype=numerix.INT_DTYPE).ravel()]
+        cellIDs[cellIDs < 0] = 0
+
+        cellFaceIDs = MA.filled(self.cellFaceIDs, 0)
+        faceMask = MA.getmaskarray(self.cellFaceIDs)
+        cellToCellIDs = MA.filled(self._cellToCellIDs, -1)
+        cellNormals = MA.filled(self._cellNormals, 0.)
+        faceCenters = numerix.asarray(self._faceCenters)
+
+        scale = max(numerix.ptp(faceCenters, axis=1).max(), 1.)
+        tolerance = 1e-10 * scale
+
+        for start in range(0, points.shape[-1], chunkSize):
+            active = numerix.arange(start, min(start + chunkSize, points.shape[-1]))
+            for step in range(self.numberOfCells):
+                cells = cellIDs[active]
+                # (D, F, A) distance of each point outside each face of its cell
+                outside = ((points[:, numerix.newaxis, active]
+                            - faceCenters[:, cellFaceIDs[:, cells]])
+                           * cellNormals[..., cells]).sum(0)
+                outside[faceMask[:, cells]] = -numerix.inf
+                face = outside.argmax(0)
+                neighbors = cellToCellIDs[face, cells]
+                move = ((outside[face, numerix.arange(len(cells))] > tolerance)
+                        & (neighbors >= 0))
+                if not move.any():
+                    break
+                active = active[move]
+                cellIDs[active] = neighbors[move]
+
+        return cellIDs
+
+    @property
+    def _cellLinearReconstruction(self):
+        """
+        Least-squares gradient weights of each local cell.
+
+        The gradient in cell `c` is `sum_n M[c] . d[n, c] (phi_n - phi_c)`
+        over its neighbors `n`, where `d` are the displacements to the
+        neighboring cell centers and `M` is the pseudo-inverse of
+        `sum_n d d^T`. It is exact for linear fields, including in
+        boundary cells.
+
+        Returns the `(F, C)` neighbor IDs (`-1` where absent), the
+        `(D, F, C)` displacements and the `(C, D, D)` matrices `M`.
+        """
+        if not hasattr(self, "_cellLinearReconstructionCache"):
+            centers = numerix.asarray(self._cellCenters)
+            neighbors = MA.filled(self._cellToCellIDs, -1)
+            displacements = numerix.take(centers, neighbors, axis=1) - centers[:, numerix.newaxis]
+            displacements[..., neighbors < 0] = 0.
+
+            normal = numerix.einsum('ifc,jfc->cij', displacements, displacements)
+            U, S, V = numerix.linalg.svd(normal)
+            Sinv = numerix.where(S > 1e-10 * S.max(axis=-1)[..., numerix.newaxis],
+                                 1. / numerix.where(S == 0, 1., S), 0.)
+            pinv = numerix.einsum('cji,cj,ckj->cik', V, Sinv, U)
+
+            self._cellLinearReconstructionCache = (neighbors, displacements, pinv)
+
+        return self._cellLinearReconstructionCache
+
+    @property
+    def _cellToFaceInterpolation(self):
+        """
+        Sparse `(F, C)` matrix of the arithmetic interpolation of cell
+        values to the faces, or `None` if `scipy` is not available.
+
+        The sparsity pattern comes from the topology, so only the weights
+        are recalculated, and only if the geometry of the mesh changes.
+
+            >>> from fipy import Grid1D
+            >>> mesh = Grid1D(dx=(1., 3.))
+            >>> print mesh._cellToFaceInterpolation.toarray() # doctest: +SCIPY
+            [[ 1.    0.  ]
+             [ 0.75  0.25]
+             [ 0.    1.  ]]
+            >>> print mesh._cellToFaceInterpolation is mesh._cellToFaceInterpolation # doctest: +SCIPY
+            True
+        """
+        incidence = self.topology._faceCellIncidence
+        if incidence is None:
+            return None
+
+        alpha = numerix.asarray(MA.filled(self._faceToCellDistanceRatio))
+        cache = getattr(self, "_cellToFaceInterpolationCache", None)
+        if cache is None or not (cache[0] is alpha or numerix.array_equal(cache[0], alpha)):
+            from scipy import sparse
+            indices, indptr = incidence
+            firstIsID1 = (indices[::2] == self._adjacentCellIDs[0])
+            weights = numerix.where(firstIsID1, 1. - alpha, alpha)
+            data = numerix.column_stack((weights, 1. - weights)).ravel()
+            matrix = sparse.csr_matrix((data, indices, indptr),
+                                       shape=(self.numberOfFaces, self.numberOfCells))
+            cache = self._cellToFaceInterpolationCache = (alpha, matrix)
+
+        return cache[1]
+
+    def _interpolateToFaces(self, cellValues, out=None):
+        """
+        Arithmetic interpolation of an array of local cell values, applied
+        as a single sparse product. Requires `scipy`.
+
+            >>> from fipy import Grid1D
+            >>> print Grid1D(dx=(1., 3.))._interpolateToFaces(numerix.array([[0., 4.],
+            ...                                                               [1., 1.]])) # doctest: +SCIPY
+            [[ 0.  1.  4.]
+             [ 1.  1.  1.]]
+        """
+        return _sparseDot(self._cellToFaceInterpolation, cellValues, out=out)
+
+    def _sumOverCellFaces(self, faceValues, out=None):
+        """
+        Sum over the faces of each cell of the local `faceValues`, signed
+        by whether the normal of each face points out of the cell, applied
+        as a single sparse product. Requires `scipy`.
+
+            >>> from fipy import Grid1D
+            >>> print Grid1D(nx=2)._sumOverCellFaces(numerix.array([1., 3., 6.])) # doctest: +SCIPY
+            [ 4.  3.]
+        """
+        return _sparseDot(self.topology._cellFaceIncidence, faceValues, out=out)
+
+    def cellInterpolator(self, points, order=1, nearestCellIDs=None):
+        r"""
+        Build an operator that interpolates `CellVariable` values on this
+        mesh to `points`.
+
+        The operator can be applied to any number of `CellVariable` objects
+        or arrays of global cell values, so interpolating the same points
+        many times only costs a weighted sum per application.
+
+        :Parameters:
+          - `points`: A point or set of points in the format (X, Y, Z)
+          - `order`: 0 to take the value of the nearest cell, or 1 to
+            interpolate linearly within the cell that contains each point,
+            using the least-squares gradient of that cell and its
+            neighbors. Points outside the mesh are extrapolated from the
+            cell where they leave it.
+          - `nearestCellIDs`: Optional global IDs of the cells nearest to
+            `points`
+
+        >>> from fipy import Grid2D, Tri2D, CellVariable
+        >>> mesh = Tri2D(nx=3, ny=2)
+        >>> x, y = mesh.cellCenters
+        >>> interpolator = mesh.cellInterpolator(((0.1, 1.5, 2.9), (1.9, 0.5, 0.8)))
+        >>> print interpolator(CellVariable(mesh=mesh, value=2 * x - y + 1))
+        [-0.7  3.5  6. ]
+        >>> print interpolator(CellVariable(mesh=mesh, value=(x, y), rank=1))
+        [[ 0.1  1.5  2.9]
+         [ 1.9  0.5  0.8]]
+
+        Linear fields are also reproduced in boundary cells, where the
+        face-value gradient of the cell is not exact
+
+        >>> mesh = Grid2D(nx=4, ny=1)
+        >>> var = CellVariable(mesh=mesh, value=mesh.x)
+        >>> print mesh.cellInterpolator(((0.1, 1.9),  (0.5, 0.5)))(var)
+        [ 0.1  1.9]
+        >>> print mesh.cellInterpolator(((0.1, 1.9),  (0.5, 0.5)), order=0)(var)
+        [ 0.5  1.5]
+        """
+        from fipy.meshes.cellInterpolator import _CellInterpolator
+
+        points = numerix.array(points, dtype=float)
+        shape = points.shape[1:]
+        points = points.reshape((points.shape[0], -1))
+
+        if order == 0:
+            if nearestCellIDs is None:
+                nearestCellIDs = self._getNearestCellID(points)
+            return _CellInterpolator(cellIDs=numerix.asarray(nearestCellIDs).reshape((1, -1)),
+                                     weights=numerix.ones((1, points.shape[-1])),
+                                     shape=shape,
+                                     numberOfCells=self.globalNumberOfCells)
+        elif order != 1:
+            raise ValueError, 'order should be either 0 or 1'
+
+        cellIDs = self._locateCells(points, cellIDs=nearestCellIDs)
+        neighbors, displacements, pinv = self._cellLinearReconstruction
+
+        offsets = points - numerix.asarray(self._cellCenters)[..., cellIDs]
+        # (F, P) weight of each neighbor relative to the containing cell
+        neighborWeights = numerix.einsum('ip,pij,jfp->fp', offsets,
+                                         pinv[cellIDs], displacements[..., cellIDs])
+        neighborIDs = neighbors[:, cellIDs]
+        neighborWeights[neighborIDs < 0] = 0.
+
+        localIDs = numerix.concatenate((cellIDs[numerix.newaxis],
+                                        numerix.where(neighborIDs < 0, cellIDs, neighborIDs)))
+        weights = numerix.concatenate(((1. - neighborWeights.sum(0))[numerix.newaxis],
+                                       neighborWeights))
+
+        return _CellInterpolator(cellIDs=self._globalOverlappingCellIDs[localIDs],
+                                 weights=weights,
+                                 shape=shape,
+                                 numberOfCells=self.globalNumberOfCells)
+
     def _getCellFaceIDsInternal(self):
         return self._cellFaceIDs
 
@@ -229,6 +510,10 @@ class AbstractMesh(object):
         `faces2` are not altered, they still remain as members of
         exterior faces.
 
+        The faces of several boundaries can be connected in one call, by
+        concatenating them, so that the topology and geometry of the mesh
+        are only recalculated once. See `_connectFacePairs()`.
+
            >>> from fipy.meshes.nonUniformGrid2D import NonUniformGrid2D
            >>> mesh = NonUniformGrid2D(nx = 2, ny = 2, dx = 1., dy = 1.)
 
@@ -248,14 +533,12 @@ class AbstractMesh(object):
 
         """
         ## check for errors
+        faces0 = numerix.array(faces0).ravel()
+        faces1 = numerix.array(faces1).ravel()
 
         ## check that faces are members of exterior faces
-        from fipy.variables.faceVariable import FaceVariable
-        faces = FaceVariable(mesh=self, value=False)
-        faces[faces0] = True
-        faces[faces1] = True
-
-        assert (faces | self.exteriorFaces == self.exteriorFaces).all()
+        exteriorFaces = numerix.array(self.exteriorFaces)
+        assert exteriorFaces[faces0].all() and exteriorFaces[faces1].all()
 
         ## following assert checks number of faces are equal, normals are opposite and areas are the same
         assert numerix.allclose(numerix.take(self._areaProjections, faces0, axis=1),
@@ -284,24 +567,14 @@ class AbstractMesh(object):
         numerix.put(self._cellDistances, faces0, MA.take(faceToCellDistances0 + faceToCellDistances1, faces0))
 
         ## change the direction of the face normals for faces0
-        for dim in range(self.dim):
-            faceNormals = self.faceNormals[dim].copy()
-            numerix.put(faceNormals, faces0, MA.take(faceNormals, faces1))
-            self.faceNormals[dim] = faceNormals
-
-        ## Cells that are adjacent to faces1 are changed to point at faces0
-        ## get the cells adjacent to faces1
-        faceCellIDs = MA.take(self.faceCellIDs[0], faces1)
-        ## get all the adjacent faces for those particular cells
-        cellFaceIDs = numerix.take(self.cellFaceIDs, faceCellIDs, axis=1)
-        for i in range(cellFaceIDs.shape[0]):
-            ## if the faces is a member of faces1 then change the face to point at
-            ## faces0
-            cellFaceIDs[i] = MA.where(cellFaceIDs[i] == faces1,
-                                      faces0,
-                                      cellFaceIDs[i])
-            ## add those faces back to the main self.cellFaceIDs
-            numerix.put(self.cellFaceIDs[i], faceCellIDs, cellFaceIDs[i])
+        self.faceNormals[..., faces0] = self.faceNormals[..., faces1]
+
+        ## Cells that are adjacent to faces1 are changed to point at
+        ## faces0, by mapping every face of every cell at once
+        faceMap = numerix.arange(self.numberOfFaces)
+        faceMap[faces1] = faces0
+        self.cellFaceIDs = MA.array(faceMap[MA.filled(self.cellFaceIDs, 0)],
+                                    mask=MA.getmask(self.cellFaceIDs))
 
         ## calculate new topology
         self._setTopology()
@@ -311,6 +584,29 @@ class AbstractMesh(object):
 
         self.scale = self.scale['length']
 
+    def _connectFacePairs(self, *pairs):
+        """
+        Merge each pair `(faces0, faces1)` of boundaries, given as masks of
+        the faces of the mesh, with a single call to `_connectFaces()`.
+
+           >>> from fipy.meshes.nonUniformGrid2D import NonUniformGrid2D
+           >>> mesh = NonUniformGrid2D(nx = 2, ny = 2, dx = 1., dy = 1.)
+           >>> mesh._connectFacePairs((mesh.facesLeft, mesh.facesRight),
+           ...                        (mesh.facesBottom, mesh.facesTop))
+
+           >>> print (mesh.cellFaceIDs == [[0, 1, 2, 3],
+           ...                             [7, 6, 10, 9],
+           ...                             [2, 3, 0, 1],
+           ...                             [6, 7, 9, 10]]).flatten().all() # doctest: +PROCESSOR_0
+           True
+           >>> print mesh.faceCellIDs.filled(-1) # doctest: +PROCESSOR_0
+           [[ 2  3  0  1  2  3  1  0  1  3  2  3]
+            [ 0  1  2  3 -1 -1  0  1 -1  2  3 -1]]
+
+        """
+        self._connectFaces(numerix.concatenate([numerix.nonzero(pair[0])[0] for pair in pairs]),
+                           numerix.concatenate([numerix.nonzero(pair[1])[0] for pair in pairs]))
+
     @property
     def _concatenableMesh(self):
         raise NotImplementedError
@@ -329,196 +625,8 @@ class AbstractMesh(object):
         :Returns:
           A `dict` with 3 elements: the new mesh vertexCoords, faceVertexIDs, and cellFaceIDs.
         """
-
-        selfc = self._concatenableMesh
-        otherc = other._concatenableMesh
-
-        selfNumFaces = selfc.faceVertexIDs.shape[-1]
-        selfNumVertices = selfc.vertexCoords.shape[-1]
-        otherNumFaces = otherc.faceVertexIDs.shape[-1]
-        otherNumVertices = otherc.vertexCoords.shape[-1]
-        ## check dimensions
-        if(selfc.vertexCoords.shape[0] != otherc.vertexCoords.shape[0]):
-            raise MeshAdditionError, "Dimensions do not match"
-
-        ## compute vertex correlates
-
-        """
-        from fipy.tools.debug import PRINT
-        PRINT("selfNumFaces", selfNumFaces)
-        PRINT("otherNumFaces", otherNumVertices)
-        PRINT("selfNumVertices", selfNumVertices)
-        PRINT("otherNumVertices", otherNumVertices)
-
-        from fipy.tools.debug import PRINT
-        from fipy.tools.debug import PRINT
-        PRINT("otherExt", otherc.exteriorFaces.value)
-        raw_input()
-        PRINT("selfExt", selfc.exteriorFaces.value)
-
-        PRINT("self filled", selfc.faceVertexIDs.filled())
-        PRINT("othe filled", otherc.faceVertexIDs.filled())
-        raw_input()
-
-        PRINT("selfc.faceVertexIDs.filled()\n",selfc.faceVertexIDs.filled())
-        PRINT("flat\n",selfc.faceVertexIDs.filled()[...,
-            selfc.exteriorFaces.value].flatten())
-        PRINT("selfc.exteriorFaces.value\n",selfc.exteriorFaces.value)
-        PRINT("extfaces type", type(selfc.exteriorFaces))
-        PRINT("extfaces mesh", selfc.exteriorFaces.mesh)
-        """
-
-        ## only try to match along the operation manifold
-        if hasattr(self, "opManifold"):
-            self_faces = self.opManifold(selfc)
-        else:
-            self_faces = selfc.exteriorFaces.value
-        if hasattr(other, "opManifold"):
-            other_faces = other.opManifold(otherc)
-        else:
-            other_faces = otherc.exteriorFaces.value
-
-        ## only try to match exterior (X) vertices
-        self_Xvertices = numerix.unique(selfc.faceVertexIDs.filled()[...,
-            self_faces].flatten())
-        other_Xvertices = numerix.unique(otherc.faceVertexIDs.filled()[...,
-            other_faces].flatten())
-
-        self_XvertexCoords = selfc.vertexCoords[..., self_Xvertices]
-        other_XvertexCoords = otherc.vertexCoords[..., other_Xvertices]
-
-        closest = numerix.nearest(self_XvertexCoords, other_XvertexCoords)
-
-        # just because they're closest, doesn't mean they're close
-        tmp = self_XvertexCoords[..., closest] - other_XvertexCoords
-        distance = numerix.sqrtDot(tmp, tmp)
-        # only want vertex pairs that are 100x closer than the smallest
-        # cell-to-cell distance
-        close = distance < resolution * min(selfc._cellToCellDistances.min(),
-                                            otherc._cellToCellDistances.min())
-        vertexCorrelates = numerix.array((self_Xvertices[closest[close]],
-                                          other_Xvertices[close]))
-
-        # warn if meshes don't touch, but allow it
-        if (selfc._numberOfVertices > 0
-            and otherc._numberOfVertices > 0
-            and vertexCorrelates.shape[-1] == 0):
-            import warnings
-            warnings.warn("Vertices are not aligned", UserWarning, stacklevel=4)
-
-        ## compute face correlates
-
-        # ensure that both sets of faceVertexIDs have the same maximum number of (masked) elements
-        self_faceVertexIDs = selfc.faceVertexIDs
-        other_faceVertexIDs = otherc.faceVertexIDs
-
-        diff = self_faceVertexIDs.shape[0] - other_faceVertexIDs.shape[0]
-        if diff > 0:
-            other_faceVertexIDs = numerix.append(other_faceVertexIDs,
-                                                 -1 * numerix.ones((diff,)
-                                                                   + other_faceVertexIDs.shape[1:], 'l'),
-                                                 axis=0)
-            other_faceVertexIDs = MA.masked_values(other_faceVertexIDs, -1)
-        elif diff < 0:
-            self_faceVertexIDs = numerix.append(self_faceVertexIDs,
-                                                -1 * numerix.ones((-diff,)
-                                                                  + self_faceVertexIDs.shape[1:], 'l'),
-                                                axis=0)
-            self_faceVertexIDs = MA.masked_values(self_faceVertexIDs, -1)
-
-        # want self's Faces for which all faceVertexIDs are in vertexCorrelates
-        self_matchingFaces = numerix.in1d(self_faceVertexIDs,
-                                          vertexCorrelates[0]).reshape(self_faceVertexIDs.shape).all(axis=0).nonzero()[0]
-
-        # want other's Faces for which all faceVertexIDs are in vertexCorrelates
-        other_matchingFaces = numerix.in1d(other_faceVertexIDs,
-                                           vertexCorrelates[1]).reshape(other_faceVertexIDs.shape).all(axis=0).nonzero()[0]
-
-        # map other's Vertex IDs to new Vertex IDs,
-        # accounting for overlaps with self's Vertex IDs
-        vertex_map = numerix.empty(otherNumVertices, dtype=numerix.INT_DTYPE)
-        verticesToAdd = numerix.delete(numerix.arange(otherNumVertices), vertexCorrelates[1])
-        vertex_map[verticesToAdd] = numerix.arange(otherNumVertices - len(vertexCorrelates[1])) + selfNumVertices
-        vertex_map[vertexCorrelates[1]] = vertexCorrelates[0]
-
-        # calculate hashes of faceVertexIDs for comparing Faces
-
-        if self_matchingFaces.shape[-1] == 0:
-            self_faceHash = numerix.empty(self_matchingFaces.shape[:-1] + (0,), dtype="str")
-        else:
-            # sort each of self's Face's vertexIDs for canonical comparison
-            self_faceHash = numerix.sort(self_faceVertexIDs[..., self_matchingFaces], axis=0)
-            # then hash the Faces for comparison (NumPy set operations are only for 1D arrays)
-            self_faceHash = numerix.apply_along_axis(str, axis=0, arr=self_faceHash)
-
-        face_sort = numerix.argsort(self_faceHash)
-        self_faceHash = self_faceHash[face_sort]
-        self_matchingFaces = self_matchingFaces[face_sort]
-
-        if other_matchingFaces.shape[-1] == 0:
-            other_faceHash = numerix.empty(other_matchingFaces.shape[:-1] + (0,), dtype="str")
-        else:
-            # convert each of other's Face's vertexIDs to new IDs
-            other_faceHash = vertex_map[other_faceVertexIDs[..., other_matchingFaces]]
-            # sort each of other's Face's vertexIDs for canonical comparison
-            other_faceHash = numerix.sort(other_faceHash, axis=0)
-            # then hash the Faces for comparison (NumPy set operations are only for 1D arrays)
-            other_faceHash = numerix.apply_along_axis(str, axis=0, arr=other_faceHash)
-
-        face_sort = numerix.argsort(other_faceHash)
-        other_faceHash = other_faceHash[face_sort]
-        other_matchingFaces = other_matchingFaces[face_sort]
-
-        self_matchingFaces = self_matchingFaces[numerix.in1d(self_faceHash,
-                                                             other_faceHash)]
-        other_matchingFaces = other_matchingFaces[numerix.in1d(other_faceHash,
-                                                               self_faceHash)]
-
-        faceCorrelates = numerix.array((self_matchingFaces,
-                                        other_matchingFaces))
-
-        # warn if meshes don't touch, but allow it
-        if (selfc.numberOfFaces > 0
-            and otherc.numberOfFaces > 0
-            and faceCorrelates.shape[-1] == 0):
-            import warnings
-            warnings.warn("Faces are not aligned", UserWarning, stacklevel=4)
-
-        # map other's Face IDs to new Face IDs,
-        # accounting for overlaps with self's Face IDs
-        face_map = numerix.empty(otherNumFaces, dtype=numerix.INT_DTYPE)
-        facesToAdd = numerix.delete(numerix.arange(otherNumFaces), faceCorrelates[1])
-        face_map[facesToAdd] = numerix.arange(otherNumFaces - len(faceCorrelates[1])) + selfNumFaces
-        face_map[faceCorrelates[1]] = faceCorrelates[0]
-
-        other_faceVertexIDs = vertex_map[otherc.faceVertexIDs[..., facesToAdd]]
-
-        # ensure that both sets of cellFaceIDs have the same maximum number of (masked) elements
-        self_cellFaceIDs = selfc.cellFaceIDs
-        other_cellFaceIDs = face_map[otherc.cellFaceIDs]
-        diff = self_cellFaceIDs.shape[0] - other_cellFaceIDs.shape[0]
-        if diff > 0:
-            other_cellFaceIDs = numerix.append(other_cellFaceIDs,
-                                               -1 * numerix.ones((diff,)
-                                                                 + other_cellFaceIDs.shape[1:], 'l'),
-                                               axis=0)
-            other_cellFaceIDs = MA.masked_values(other_cellFaceIDs, -1)
-        elif diff < 0:
-            self_cellFaceIDs = numerix.append(self_cellFaceIDs,
-                                              -1 * numerix.ones((-diff,)
-                                                                + self_cellFaceIDs.shape[1:], 'l'),
-                                              axis=0)
-            self_cellFaceIDs = MA.masked_values(self_cellFaceIDs, -1)
-
-        # concatenate everything and return
-        return {
-            'vertexCoords': numerix.concatenate((selfc.vertexCoords,
-                                                 otherc.vertexCoords[..., verticesToAdd]), axis=1),
-            'faceVertexIDs': numerix.concatenate((self_faceVertexIDs,
-                                                  other_faceVertexIDs), axis=1),
-            'cellFaceIDs': MA.concatenate((self_cellFaceIDs,
-                                           other_cellFaceIDs), axis=1)
-            }
+        from fipy.meshes.meshConcatenation import _concatenatedMeshValues
+        return _concatenatedMeshValues([self, other], resolution=resolution)
 
     """
     Topology -- maybe should be elsewhere?
@@ -526,18 +634,34 @@ class AbstractMesh(object):
 
     @property
     def interiorFaceIDs(self):
-        if not hasattr(self, '_interiorFaceIDs'):
-            self._interiorFaceIDs = numerix.nonzero(self.interiorFaces)[0]
-        return self._interiorFaceIDs
+        """IDs of the interior faces.
+
+        The array is shared with the terms that assemble on this mesh, so
+        it is read-only.
+
+        >>> from fipy import Grid1D
+        >>> mesh = Grid1D(nx=3)
+        >>> print mesh.interiorFaceIDs
+        [1 2]
+        >>> mesh.interiorFaceIDs[0] = 0
+        Traceback (most recent call last):
+            ...
+        ValueError: assignment destination is read-only
+        """
+        return self.topology._interiorFaceIDs
 
     @property
     def interiorFaceCellIDs(self):
-        if not hasattr(self, '_interiorFaceCellIDs'):
-            ## Commented line is better, but doesn't work for zero length arrays
-            ##  self.interiorFaceCellIDs = self.getFaceCellIDs()[..., self.getInteriorFaceIDs()]
-            self._interiorFaceCellIDs = numerix.take(self.faceCellIDs,
-                                                     self.interiorFaceIDs, axis=1)
-        return self._interiorFaceCellIDs
+        """IDs of the cells on either side of each interior face.
+
+        Like `interiorFaceIDs`, the array is shared and read-only.
+
+        >>> from fipy import Grid1D
+        >>> print Grid1D(nx=3).interiorFaceCellIDs
+        [[0 1]
+         [1 2]]
+        """
+        return self.topology._interiorFaceCellIDs
 
     @property
     def _numberOfFacesPerCell(self):
@@ -969,6 +1093,9 @@ class AbstractMesh(object):
         Traceback (most recent call last):
         ...
         MeshAdditionError: Dimensions do not match
+
+        Many `Mesh` objects are concatenated faster in one pass with
+        :func:`~fipy.meshes.meshConcatenation.concatenateMeshes`.
         """
         if isinstance(other, AbstractMesh):
             return self._concatenatedClass(**self._getAddedMeshValues(other=other))
@@ -1027,11 +1154,8 @@ class AbstractMesh(object):
 
     @property
     def _VTKCellType(self):
-        try:
-            from tvtk.api import tvtk
-        except ImportError, e:
-            from enthought.tvtk.api import tvtk
-        return tvtk.ConvexPointSet().cell_type
+        # VTK_CONVEX_POINT_SET
+        return 41
 
     @property
     def VTKCellDataSet(self):
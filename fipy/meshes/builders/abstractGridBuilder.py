@@ -59,7 +59,7 @@ class _AbstractGridBuilder(object):
     NumPtsCalcClass = None
 
     def buildGridData(self, ds, ns, overlap, communicator,
-                            cacheOccupiedNodes=False):
+                            cacheOccupiedNodes=False, decomposition="slab"):
         """
         Build and save any information relevant to the construction of a grid.
         Generalized to handle any dimension. Has side-effects.
@@ -81,6 +81,9 @@ class _AbstractGridBuilder(object):
             - `ds` - A list containing grid spacing information, e.g. [dx, dy]
             - `ns` - A list containing number of grid points, e.g. [nx, ny, nz]
             - `overlap`
+            - `decomposition` - "slab" to divide the grid among processes
+              along its last axis only, or "block" to divide it along every
+              axis (see `_calcPartitions`)
         """
 
         dim = len(ns)
@@ -121,28 +124,21 @@ class _AbstractGridBuilder(object):
         procID = communicator.procID
         Nproc = communicator.Nproc
 
-        overlap = min(overlap, newNs[-1])
-        cellsPerNode = max(newNs[-1] // Nproc, overlap)
-        occupiedNodes = min(newNs[-1] // (cellsPerNode or 1), Nproc)
-
-        (firstOverlap,
-         secOverlap,
-         overlap) = self._buildOverlap(overlap, procID, occupiedNodes)
-
-        offsetArg = min(procID, occupiedNodes-1) * cellsPerNode - firstOverlap
-        offset = self._packOffset(offsetArg)
-
-        """
-        local nx, [ny, [nz]] calculation
-        """
-        local_n = cellsPerNode * (procID < occupiedNodes)
-
-        if procID == occupiedNodes - 1:
-            local_n += (newNs[-1] - cellsPerNode * occupiedNodes)
-
-        local_n += firstOverlap + secOverlap
-
-        newNs = tuple(newNs[:-1] + [local_n])
+        globalNs = tuple(newNs)
+
+        if decomposition == "block" and dim > 1:
+            (newNs,
+             overlap,
+             offset,
+             occupiedNodes) = self._buildBlock(newNs, overlap, procID,
+                                               self._calcPartitions(newNs, overlap, Nproc))
+        elif decomposition in ("slab", "block"):
+            (newNs,
+             overlap,
+             offset,
+             occupiedNodes) = self._buildSlab(newNs, overlap, procID, Nproc)
+        else:
+            raise ValueError, "decomposition must be 'slab' or 'block', not %s" % repr(decomposition)
 
         """
         post-parallel
@@ -169,6 +165,7 @@ class _AbstractGridBuilder(object):
         self.dim     = dim
         self.ds      = newDs
         self.ns      = newNs
+        self.globalNs = globalNs
         self.scale   = scale
 
         self.globalNumberOfCells = globalNumCells
@@ -184,6 +181,138 @@ class _AbstractGridBuilder(object):
         if cacheOccupiedNodes:
             self.occupiedNodes = occupiedNodes
 
+    def _buildSlab(self, newNs, overlap, procID, Nproc):
+        """
+        Local number of cells along each axis, overlaps, offset and number
+        of occupied processes of a division of the grid into slabs along
+        its last axis.
+        """
+        overlap = min(overlap, newNs[-1])
+        cellsPerNode = max(newNs[-1] // Nproc, overlap)
+        occupiedNodes = min(newNs[-1] // (cellsPerNode or 1), Nproc)
+
+        (firstOverlap,
+         secOverlap,
+         overlap) = self._buildOverlap(overlap, procID, occupiedNodes)
+
+        offsetArg = min(procID, occupiedNodes-1) * cellsPerNode - firstOverlap
+        offset = self._packOffset(offsetArg)
+
+        """
+        local nx, [ny, [nz]] calculation
+        """
+        local_n = cellsPerNode * (procID < occupiedNodes)
+
+        if procID == occupiedNodes - 1:
+            local_n += (newNs[-1] - cellsPerNode * occupiedNodes)
+
+        local_n += firstOverlap + secOverlap
+
+        newNs = tuple(newNs[:-1] + [local_n])
+
+        return newNs, overlap, offset, occupiedNodes
+
+    @staticmethod
+    def _calcPartitions(ns, overlap, Nproc):
+        """
+        Number of processes along each axis of a block decomposition of a
+        grid with `ns` cells along each axis.
+
+        Each process must own at least `overlap` cells along each axis it
+        shares with a neighbor. Among the process grids that occupy as many
+        processes as possible, the one with the smallest total area of the
+        boundaries between processes, and so the fewest ghost cells, is
+        chosen.
+
+        >>> print _AbstractGridBuilder._calcPartitions([100, 100], 2, 4)
+        (2, 2)
+        >>> print _AbstractGridBuilder._calcPartitions([1000, 10], 2, 4)
+        (4, 1)
+        >>> print _AbstractGridBuilder._calcPartitions([1000, 1000, 64], 2, 256)
+        (16, 16, 1)
+        >>> print _AbstractGridBuilder._calcPartitions([1000, 1000, 64], 2, 4096)
+        (32, 32, 4)
+
+        Processes that can't own enough cells are left empty
+
+        >>> print _AbstractGridBuilder._calcPartitions([4, 3], 2, 8)
+        (2, 1)
+        """
+        def factorizations(N, dims):
+            if dims == 1:
+                yield (N,)
+            else:
+                for p in range(1, N + 1):
+                    if N % p == 0:
+                        for rest in factorizations(N // p, dims - 1):
+                            yield (p,) + rest
+
+        def feasible(n, p):
+            cellsPerNode = max(n // p, min(overlap, n))
+            return n // (cellsPerNode or 1) >= p
+
+        for occupied in range(Nproc, 0, -1):
+            best = None
+            for partitions in factorizations(occupied, len(ns)):
+                if False in [feasible(n, p) for n, p in zip(ns, partitions)]:
+                    continue
+                # area of the cuts normal to each axis
+                area = 0
+                for axis, p in enumerate(partitions):
+                    area += (p - 1) * reduce(lambda x, y: x * y, ns[:axis] + ns[axis + 1:], 1)
+                if best is None or area < best[0]:
+                    best = (area, partitions)
+            if best is not None:
+                return best[1]
+
+        return (1,) * len(ns)
+
+    def _buildBlock(self, newNs, overlap, procID, partitions):
+        """
+        Local number of cells along each axis, overlaps, offset and number
+        of occupied processes of a division of the grid into `partitions`
+        blocks along each axis. Processes are numbered with the first
+        axis varying fastest.
+        """
+        occupiedNodes = reduce(self._mult, partitions)
+
+        coordinates = []
+        remainder = min(procID, occupiedNodes - 1)
+        for p in partitions:
+            coordinates.append(remainder % p)
+            remainder //= p
+
+        localNs = []
+        overlaps = []
+        offsets = []
+        for n, p, c in zip(newNs, partitions, coordinates):
+            axisOverlap = min(overlap, n)
+            cellsPerNode = max(n // p, axisOverlap)
+
+            first = axisOverlap * (c > 0)
+            second = axisOverlap * (c < p - 1)
+
+            local_n = cellsPerNode
+            if c == p - 1:
+                local_n += n - cellsPerNode * p
+
+            localNs.append(local_n + first + second)
+            overlaps.append((first, second))
+            offsets.append(c * cellsPerNode - first)
+
+        if procID >= occupiedNodes:
+            localNs = [0 for n in localNs]
+            overlaps = [(0, 0) for o in overlaps]
+
+        overlap = {}
+        for (first, second), names in zip(overlaps, [('left', 'right'),
+                                                     ('bottom', 'top'),
+                                                     ('front', 'back')]):
+            overlap[names[0]] = first
+            overlap[names[1]] = second
+
+        return tuple(localNs), overlap, tuple(offsets), occupiedNodes
+
     @property
     def gridData(self):
         """
@@ -206,7 +335,8 @@ class _AbstractGridBuilder(object):
                 self.numberOfCells,
                 self._calcShape(),
                 self._calcPhysicalShape(),
-                self._calcMeshSpacing()]
+                self._calcMeshSpacing(),
+                self.globalNs]
 
     def _calcShape(self):
         raise NotImplementedError
@@ -238,7 +368,7 @@ class _AbstractGridBuilder(object):
         """
         Dimensionally independent face-number calculation.
 
-        >>> from fipy.meshes.builders import *
+        >>> from fipy.meshes.builders import _Grid1DBuilder, _Grid2DBuilder, _Grid3DBuilder
 
         >>> gb = _Grid1DBuilder()
         >>> gb._calcGlobalNumFaces([1])
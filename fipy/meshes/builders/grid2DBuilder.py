@@ -256,10 +256,11 @@ class _UniformGrid2DBuilder(_Grid2DBuilder):
 
         super(_UniformGrid2DBuilder, self).__init__()
 
-    def buildGridData(self, ds, ns, overlap, communicator, origin):
+    def buildGridData(self, ds, ns, overlap, communicator, origin, decomposition="slab"):
         # call super for side-effects
         super(_UniformGrid2DBuilder, self).buildGridData(ds, ns, overlap,
-                                                        communicator)
+                                                        communicator,
+                                                        decomposition=decomposition)
 
         self.origin = _UniformOrigin.calcOrigin(origin,
                                                 self.offset, self.ds, self.scale)
@@ -242,9 +242,10 @@ class _UniformGrid3DBuilder(_Grid3DBuilder):
 
         super(_UniformGrid3DBuilder, self).__init__()
 
-    def buildGridData(self, ds, ns, overlap, communicator, origin):
+    def buildGridData(self, ds, ns, overlap, communicator, origin, decomposition="slab"):
         super(_UniformGrid3DBuilder, self).buildGridData(ds, ns, overlap,
-                                                        communicator)
+                                                        communicator,
+                                                        decomposition=decomposition)
 
         self.origin = _UniformOrigin.calcOrigin(origin,
                                                 self.offset, self.ds, self.scale)
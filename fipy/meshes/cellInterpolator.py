@@ -0,0 +1,122 @@
+#!/usr/bin/env python
+
+##
+ # -*-Pyth-*-
+ # ###################################################################
+ #  FiPy - Python-based finite volume PDE solver
+ #
+ #  FILE: "cellInterpolator.py"
+ #
+ #  Author: Jonathan Guyer <guyer@nist.gov>
+ #  Author: Daniel Wheeler <daniel.wheeler@nist.gov>
+ #  Author: James Warren   <jwarren@nist.gov>
+ #    mail: NIST
+ #     www: http://www.ctcms.nist.gov/fipy/
+ #
+ # ========================================================================
+ # This software was developed at the National Institute of Standards
+ # of Standards and Technology, an agency of the Federal Government.
+ # Pursuant to title 17 section 105 of the United States Code,
+ # United States Code this software is not subject to copyright
+ # protection, and this software is considered to be in the public domain.
+ # FiPy is an experimental system.
+ # NIST assumes no responsibility whatsoever for its use by whatsoever for its use by
+ # other parties, and makes no guarantees, expressed or implied, about
+ # its quality, reliability, or any other characteristic.  We would
+ # appreciate acknowledgement if the software is used.
+ #
+ # To the extent that NIST may hold copyright in countries other than the
+ # United States, you are hereby granted the non-exclusive irrevocable and
+ # unconditional right to print, publish, prepare derivative works and
+ # distribute this software, in any medium, or authorize others to do so on
+ # your behalf, on a royalty-free basis throughout the world.
+ #
+ # You may improve, modify, and create derivative works of the software or
+ # any portion of the software, and you may copy and distribute such
+ # modifications or works.  Modified works should carry a notice stating
+ # that you changed the software and should note the date and nature of any
+ # such change.  Please explicitly acknowledge the National Institute of
+ # Standards and Technology as the original source.
+ #
+ # This software can be redistributed and/or modified freely provided that
+ # any derivative works bear some notice that they are derived from it, and
+ # any modified versions bear some notice that they have been modified.
+ # ========================================================================
+ #
+ # ###################################################################
+ ##
+
+__docformat__ = 'restructuredtext'
+
+__all__ = []
+
+from fipy.tools import numerix
+
+class _CellInterpolator(object):
+    """
+    Linear operator that interpolates cell values to a fixed set of points.
+
+    Each point is interpolated from at most `K` cells, so the operator is
+    stored as `(K, P)` arrays of global cell IDs and weights. Applying it
+    costs one gather and one weighted sum, no matter how the weights were
+    found.
+
+    :Parameters:
+      - `cellIDs`: `(K, P)` array of global cell IDs.
+      - `weights`: `(K, P)` array of weights, zero for unused entries.
+      - `shape`: Shape of the set of points, excluding the coordinate axis.
+      - `numberOfCells`: Global number of cells of the mesh.
+
+    >>> interpolator = _CellInterpolator(cellIDs=[[0, 1, 2], [1, 2, 0]],
+    ...                                  weights=[[0.5, 1., 0.25], [0.5, 0., 0.]],
+    ...                                  shape=(3,), numberOfCells=3)
+    >>> print interpolator(numerix.array([10., 20., 30.]))
+    [ 15.   20.    7.5]
+
+    Vector values are interpolated component by component
+
+    >>> print interpolator(numerix.array([[10., 20., 30.], [1., 2., 3.]]))
+    [[ 15.    20.     7.5 ]
+     [  1.5    2.     0.75]]
+
+    The operator can also be converted to a `scipy.sparse` matrix
+
+    >>> print interpolator.matrix.toarray() # doctest: +SCIPY
+    [[ 0.5   0.5   0.  ]
+     [ 0.    1.    0.  ]
+     [ 0.    0.    0.25]]
+    """
+    def __init__(self, cellIDs, weights, shape, numberOfCells):
+        self.cellIDs = numerix.asarray(cellIDs, dtype=numerix.INT_DTYPE)
+        self.weights = numerix.asarray(weights, dtype=float)
+        self.shape = tuple(shape)
+        self.numberOfCells = numberOfCells
+
+    def __call__(self, values):
+        """
+        Interpolate `values`, a `CellVariable` or an array of global
+        cell values, to the points.
+        """
+        if hasattr(values, "globalValue"):
+            values = values.globalValue
+        values = numerix.asarray(values)
+        interpolated = (values[..., self.cellIDs] * self.weights).sum(-2)
+        return interpolated.reshape(values.shape[:-1] + self.shape)
+
+    @property
+    def matrix(self):
+        """The operator as a `(P, N)` `scipy.sparse` matrix, where `N` is
+        the global number of cells."""
+        from scipy import sparse
+        K, P = self.cellIDs.shape
+        rows = numerix.repeat(numerix.arange(P)[numerix.newaxis], K, axis=0)
+        return sparse.csr_matrix((self.weights.ravel(),
+                                  (rows.ravel(), self.cellIDs.ravel())),
+                                 shape=(P, self.numberOfCells))
+
+def _test():
+    import fipy.tests.doctestPlus
+    return fipy.tests.doctestPlus.testmod()
+
+if __name__ == "__main__":
+    _test()
@@ -92,7 +92,7 @@ def _dnl(dx, nx, Lx):
 def Grid3D(dx=1., dy=1., dz=1.,
            nx=None, ny=None, nz=None,
            Lx=None, Ly=None, Lz=None,
-           overlap=2, communicator=parallelComm):
+           overlap=2, communicator=parallelComm, decomposition="slab"):
 
     r""" Factory function to select between UniformGrid3D and
     NonUniformGrid3D.  If `Lx` is specified the length of the domain
@@ -116,6 +116,10 @@ def Grid3D(dx=1., dy=1., dz=1.,
         `fipy.tools.serialComm`. Select `fipy.tools.serialComm` to create a
         serial mesh when running in parallel. Mostly used for test
         purposes.
+      - `decomposition`: "slab" to divide the mesh among parallel
+        processes along `z` only, or "block" to divide it along `x`, `y`
+        and `z`, with the numbers of processes along each axis chosen to
+        minimize the number of overlapping cells.
 
     """
 
@@ -129,13 +133,16 @@ def Grid3D(dx=1., dy=1., dz=1.,
         from fipy.meshes.uniformGrid3D import UniformGrid3D
         return UniformGrid3D(dx = dx, dy = dy, dz = dz,
                              nx = nx or 1, ny = ny or 1, nz = nz or 1,
-                             overlap=overlap, communicator=communicator)
+                             overlap=overlap, communicator=communicator,
+                             decomposition=decomposition)
     else:
         from fipy.meshes.nonUniformGrid3D import NonUniformGrid3D
         return NonUniformGrid3D(dx = dx, dy = dy, dz = dz, nx = nx, ny = ny, nz = nz,
-                                overlap=overlap, communicator=communicator)
+                                overlap=overlap, communicator=communicator,
+                                decomposition=decomposition)
 
-def Grid2D(dx=1., dy=1., nx=None, ny=None, Lx=None, Ly=None, overlap=2, communicator=parallelComm):
+def Grid2D(dx=1., dy=1., nx=None, ny=None, Lx=None, Ly=None, overlap=2, communicator=parallelComm,
+           decomposition="slab"):
     r""" Factory function to select between UniformGrid2D and
     NonUniformGrid2D.  If `Lx` is specified the length of the domain
     is always `Lx` regardless of `dx`.
@@ -155,6 +162,10 @@ def Grid2D(dx=1., dy=1., nx=None, ny=None, Lx=None, Ly=None, overlap=2, communic
           `fipy.tools.serialComm`. Select `fipy.tools.serialComm` to create a
           serial mesh when running in parallel. Mostly used for test
           purposes.
+        - `decomposition`: "slab" to divide the mesh among parallel
+          processes along `y` only, or "block" to divide it along both `x`
+          and `y`, with the numbers of processes along each axis chosen to
+          minimize the number of overlapping cells.
 
     >>> print Grid2D(Lx=3., nx=2).dx
     1.5
@@ -170,10 +181,12 @@ def Grid2D(dx=1., dy=1., nx=None, ny=None, Lx=None, Ly=None, overlap=2, communic
         return UniformGrid2D(dx=dx, dy=dy,
                              nx=nx, ny=ny,
                              overlap=overlap,
-                             communicator=communicator)
+                             communicator=communicator,
+                             decomposition=decomposition)
     else:
         from fipy.meshes.nonUniformGrid2D import NonUniformGrid2D
-        return NonUniformGrid2D(dx=dx, dy=dy, nx=nx, ny=ny, overlap=overlap, communicator=communicator)
+        return NonUniformGrid2D(dx=dx, dy=dy, nx=nx, ny=ny, overlap=overlap, communicator=communicator,
+                                decomposition=decomposition)
 
 def Grid1D(dx=1., nx=None, Lx=None, overlap=2, communicator=parallelComm):
     r""" Factory function to select between UniformGrid1D and
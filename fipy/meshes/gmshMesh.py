@@ -590,77 +590,173 @@ class MSHFile(GmshFile):
         """
         Uses element information obtained from `_parseElementFile` to deliver
         `facesToVertices` and `cellsToFaces`.
+
+        Cells are grouped by shape so that every candidate face is gathered
+        into a single array, which is deduplicated by sorting rather than
+        by hashing each face. Faces are numbered in the order they are
+        first encountered, cell by cell.
+
+        Also returns the sorted vertex IDs of each face, padded with -1,
+        for matching against the faces tagged by Gmsh.
         """
 
         allShapes  = nx.unique(shapeTypes).tolist()
         maxFaces   = max([self.numFacesPerCell[x] for x in allShapes])
 
+        numVerts = nx.array([len(cell) for cell in cellsToVertIDs])
+
+        groups = []
+        for shapeType, numVert in set(zip(shapeTypes.tolist(), numVerts.tolist())):
+            cellIDs = nx.nonzero((shapeTypes == shapeType) & (numVerts == numVert))[0]
+            groups.append((cellIDs, numVert, self._faceOrderings(shapeType, numVert)))
+
+        maxFaceLen = max([max([len(o) for o in orderings]) for cellIDs, numVert, orderings in groups])
+
+        candidateFaces = []
+        candidatePositions = []
+        for cellIDs, numVert, orderings in groups:
+            # pad short faces with -1 by indexing an extra column
+            orderings = nx.array([[numVert] * (maxFaceLen - len(o)) + list(o) for o in orderings])
+            verts = nx.ones((len(cellIDs), numVert + 1), dtype=nx.INT_DTYPE) * -1
+            verts[:, :numVert] = [cellsToVertIDs[i] for i in cellIDs]
+
+            candidateFaces.append(verts[:, orderings].reshape((-1, maxFaceLen)))
+            candidatePositions.append((cellIDs[:, nx.newaxis] * maxFaces
+                                       + nx.arange(len(orderings))).ravel())
+
+        # put candidate faces in the order they are encountered
+        candidatePositions = nx.concatenate(candidatePositions)
+        order = nx.argsort(candidatePositions)
+        candidatePositions = candidatePositions[order]
+        candidateFaces = nx.concatenate(candidateFaces)[order]
+
+        # NB: keys are sorted to spot duplicates
+        candidateKeys = nx.sort(candidateFaces, axis=1)
+        keyOrder = self._sortRows(candidateKeys)
+        sortedKeys = candidateKeys[keyOrder]
+        newFace = nx.concatenate(([True],
+                                  (sortedKeys[1:] != sortedKeys[:-1]).any(axis=1)))
+
+        # the sort is stable, so the first of each duplicate is the first encountered
+        firstCandidates = keyOrder[newFace]
+        faceIDs = nx.empty(len(firstCandidates), dtype=nx.INT_DTYPE)
+        faceIDs[nx.argsort(firstCandidates)] = nx.arange(len(firstCandidates))
+        candidateFaceIDs = nx.empty(len(keyOrder), dtype=nx.INT_DTYPE)
+        candidateFaceIDs[keyOrder] = faceIDs[nx.cumsum(newFace) - 1]
+
         # `cellsToFaces` must be padded with -1; see mesh.py
-        currNumFaces = 0
         cellsToFaces = nx.ones((numCells, maxFaces), 'l') * -1
-        facesDict    = {}
-        uniqueFaces  = []
-
-        # we now build `cellsToFaces` and `uniqueFaces`,
-        # the latter will result in `facesToVertices`.
-        for cellIdx in range(numCells):
-            shapeType = shapeTypes[cellIdx]
-            cell = cellsToVertIDs[cellIdx]
-
-            if shapeType in [5, 12, 17]: # hexahedron
-                faces = self._extractOrderedFaces(cell=cell,
-                                                  faceOrderings=[[0, 1, 2, 3], # ordering of vertices gleaned from
-                                                                 [4, 5, 6, 7], # a one-cube Grid3D example
-                                                                 [0, 1, 5, 4],
-                                                                 [3, 2, 6, 7],
-                                                                 [0, 3, 7, 4],
-                                                                 [1, 2, 6, 5]])
-            elif shapeType in [6, 13, 18]: # prism
-                faces = self._extractOrderedFaces(cell=cell,
-                                                  faceOrderings=[[0, 1, 2],
-                                                                 [5, 4, 3],
-                                                                 [3, 4, 1, 0],
-                                                                 [4, 5, 2, 1],
-                                                                 [5, 3, 0, 2]])
-            elif shapeType in [7, 14, 19]: # pyramid
-                faces = self._extractOrderedFaces(cell=cell,
-                                                  faceOrderings=[[0, 1, 2, 3],
-                                                                 [0, 1, 4],
-                                                                 [1, 2, 4],
-                                                                 [2, 3, 4],
-                                                                 [3, 0, 4]])
-            else:
-                if shapeType in [2, 9, 20, 21, 22, 23, 24, 25]:
-                    faceLength = 2 # triangle
-                elif shapeType in [3, 10, 16]:
-                    faceLength = 2 # quadrangle
-                elif shapeType in [4, 11, 29, 30, 31]:
-                    faceLength = 3 # tetrahedron
-
-                faces = self._extractRegularFaces(cell=cell,
-                                                  faceLength=faceLength,
-                                                  facesPerCell=self.numFacesPerCell[shapeType])
-
-            for faceIdx in range(len(faces)):
-                # NB: currFace is sorted for the key to spot duplicates
-                currFace = faces[faceIdx]
-                keyStr   = ' '.join([str(x) for x in sorted(currFace)])
-
-                if keyStr in facesDict:
-                    cellsToFaces[cellIdx][faceIdx] = facesDict[keyStr]
-                else: # new face
-                    facesDict[keyStr] = currNumFaces
-                    cellsToFaces[cellIdx][faceIdx] = currNumFaces
-                    uniqueFaces.append(currFace)
-                    currNumFaces += 1
-
-        # pad short faces with -1
-        maxFaceLen = max([len(f) for f in uniqueFaces])
-        uniqueFaces = [[-1] * (maxFaceLen - len(f)) + f for f in uniqueFaces]
-
-        facesToVertices = nx.array(uniqueFaces, dtype=nx.INT_DTYPE)
-
-        return facesToVertices.swapaxes(0,1)[::-1], cellsToFaces.swapaxes(0,1).copy('C'), facesDict
+        cellsToFaces.flat[candidatePositions] = candidateFaceIDs
+
+        firstCandidates = nx.sort(firstCandidates)
+        facesToVertices = candidateFaces[firstCandidates].astype(nx.INT_DTYPE)
+        faceKeys = candidateKeys[firstCandidates]
+
+        return facesToVertices.swapaxes(0,1)[::-1], cellsToFaces.swapaxes(0,1).copy('C'), faceKeys
+
+    def _matchFaces(self, faceKeys, facesToVertIDs):
+        """Find the faces derived by `_deriveCellsAndFaces` that Gmsh tagged.
+
+        :Parameters:
+          - `faceKeys`: The sorted and padded vertex IDs of the FiPy faces.
+          - `facesToVertIDs`: The vertex IDs of each Gmsh face element.
+
+        :Returns:
+          Tuple of (FiPy face IDs, indices of the matching Gmsh faces)
+        """
+        maxFaceLen = faceKeys.shape[1]
+        tagIDs = nx.array([i for i, face in enumerate(facesToVertIDs)
+                           if len(face) <= maxFaceLen], dtype=nx.INT_DTYPE)
+        tagKeys = nx.ones((len(tagIDs), maxFaceLen), dtype=faceKeys.dtype) * -1
+        for row, i in enumerate(tagIDs):
+            face = facesToVertIDs[i]
+            tagKeys[row, maxFaceLen - len(face):] = face
+        tagKeys = nx.sort(tagKeys, axis=1)
+
+        # sort FiPy faces ahead of any Gmsh faces with the same vertices
+        keys = nx.concatenate((faceKeys, tagKeys))
+        isTag = nx.concatenate((nx.zeros(len(faceKeys), dtype=bool),
+                                nx.ones(len(tagKeys), dtype=bool)))
+        ids = nx.concatenate((nx.arange(len(faceKeys)), tagIDs))
+
+        keyOrder = self._sortRows(keys, tiebreak=isTag)
+        sortedKeys = keys[keyOrder]
+        newKey = nx.concatenate(([True],
+                                 (sortedKeys[1:] != sortedKeys[:-1]).any(axis=1)))
+        keyStart = nx.maximum.accumulate(nx.where(newKey, nx.arange(len(keyOrder)), 0))
+
+        isTag = isTag[keyOrder]
+        ids = ids[keyOrder]
+        match = isTag & ~isTag[keyStart]
+
+        return ids[keyStart][match], ids[match]
+
+    @staticmethod
+    def _sortRows(rows, tiebreak=None):
+        """Return the indices that stably sort the rows of an array of IDs
+        (which may be padded with -1) lexicographically.
+
+        Neighboring columns are packed into as few `int64` keys as the
+        largest ID allows, as sorting on each column in turn is slow.
+
+        >>> rows = nx.array([[3, 1], [-1, 5], [3, 0], [-1, 5]])
+        >>> print MSHFile._sortRows(rows)
+        [1 3 2 0]
+        >>> print MSHFile._sortRows(rows, tiebreak=nx.array([0, 1, 0, 0]))
+        [3 1 2 0]
+        """
+        rows = rows.astype('int64') + 1
+        bits = max(int(rows.max()).bit_length(), 1)
+        perKey = max(63 // bits, 1)
+
+        keys = []
+        for start in range(0, rows.shape[1], perKey):
+            key = nx.zeros(len(rows), dtype='int64')
+            for column in rows[:, start:start + perKey].swapaxes(0,1):
+                key = (key << bits) | column
+            keys.append(key)
+
+        if tiebreak is not None:
+            keys.append(tiebreak)
+
+        if len(keys) == 1:
+            return nx.argsort(keys[0], kind='mergesort')
+        else:
+            return nx.lexsort(keys[::-1])
+
+    def _faceOrderings(self, shapeType, numVerts):
+        """Return the positions, within a cell's vertices, of each of its faces.
+        """
+        if shapeType in [5, 12, 17]: # hexahedron
+            return [[0, 1, 2, 3], # ordering of vertices gleaned from
+                    [4, 5, 6, 7], # a one-cube Grid3D example
+                    [0, 1, 5, 4],
+                    [3, 2, 6, 7],
+                    [0, 3, 7, 4],
+                    [1, 2, 6, 5]]
+        elif shapeType in [6, 13, 18]: # prism
+            return [[0, 1, 2],
+                    [5, 4, 3],
+                    [3, 4, 1, 0],
+                    [4, 5, 2, 1],
+                    [5, 3, 0, 2]]
+        elif shapeType in [7, 14, 19]: # pyramid
+            return [[0, 1, 2, 3],
+                    [0, 1, 4],
+                    [1, 2, 4],
+                    [2, 3, 4],
+                    [3, 0, 4]]
+        else:
+            if shapeType in [2, 9, 20, 21, 22, 23, 24, 25]:
+                faceLength = 2 # triangle
+            elif shapeType in [3, 10, 16]:
+                faceLength = 2 # quadrangle
+            elif shapeType in [4, 11, 29, 30, 31]:
+                faceLength = 3 # tetrahedron
+
+            # faces of a regular poly(gon|hedron); we may wrap
+            return [[(i + j) % numVerts for j in range(faceLength)]
+                    for i in range(self.numFacesPerCell[shapeType])]
 
     def _translateNodesToVertices(self, entitiesNodes, vertexMap):
         """Translates entitiesNodes from Gmsh node IDs to `vertexCoords` indices.
@@ -676,32 +772,6 @@ class MSHFile(GmshFile):
 
         return entitiesVertices
 
-    def _extractRegularFaces(self, cell, faceLength, facesPerCell):
-        """Return faces for a regular poly(gon|hedron)
-
-        Given `cell`, defined by node IDs, returns an array of
-        `facesPerCell` faces of length `faceLength` in terms of nodes.
-        """
-        faces = []
-        for i in range(facesPerCell):
-            aFace = []
-            for j in range(faceLength):
-                aVertex = (i + j) % len(cell) # we may wrap
-                aFace.append(int(cell[aVertex]))
-            faces.append(aFace)
-        return faces
-
-    def _extractOrderedFaces(self, cell, faceOrderings):
-        """Return faces for a 8-node hexahedron cell.
-        """
-        def orderingToFace(vertList):
-            aFace = []
-            for i in vertList:
-                aFace.append(int(cell[i]))
-            return aFace
-
-        return [orderingToFace(o) for o in faceOrderings]
-
     def read(self):
         """
         0. Build cellsToVertices
@@ -823,32 +893,26 @@ class MSHFile(GmshFile):
             parprint("Building cells and faces.")
             (facesToV,
              cellsToF,
-             facesDict) = self._deriveCellsAndFaces(cellsToVertIDs,
-                                                    allShapeTypes,
-                                                    numCellsTotal)
+             faceKeys) = self._deriveCellsAndFaces(cellsToVertIDs,
+                                                   allShapeTypes,
+                                                   numCellsTotal)
 
             # cell entities were easy to record on parsing
             # but we don't use Gmsh faces, so we need to correlate the nodes
             # that make up the Gmsh faces with the vertex IDs of the FiPy faces
             # so that we can check if any are named
-            faceEntitiesDict = dict()
 
             # translate Gmsh IDs to `vertexCoord` indices
             facesToVertIDs = self._translateNodesToVertices(facesData.nodes,
                                                             vertIDtoIdx)
 
-            for face, physicalEntity, geometricalEntity in zip(facesToVertIDs,
-                                                               facesData.physicalEntities,
-                                                               facesData.geometricalEntities):
-                faceEntitiesDict[' '.join([str(x) for x in sorted(face)])] = (physicalEntity, geometricalEntity)
-
             self.physicalFaceMap = nx.zeros(facesToV.shape[-1:], 'l')
             self.geometricalFaceMap = nx.zeros(facesToV.shape[-1:], 'l')
-            for face in facesDict.keys():
-                # not all faces are necessarily tagged
-                if face in faceEntitiesDict:
-                    self.physicalFaceMap[facesDict[face]] = faceEntitiesDict[face][0]
-                    self.geometricalFaceMap[facesDict[face]] = faceEntitiesDict[face][1]
+
+            # not all faces are necessarily tagged
+            faceIDs, tagIDs = self._matchFaces(faceKeys, facesToVertIDs)
+            self.physicalFaceMap[faceIDs] = nx.array(facesData.physicalEntities, dtype='l')[tagIDs]
+            self.geometricalFaceMap[faceIDs] = nx.array(facesData.geometricalEntities, dtype='l')[tagIDs]
 
             self.physicalNames = self._parseNamesFile()
 
@@ -579,8 +579,44 @@ class Mesh(AbstractMesh):
 
     """scaling"""
 
-    def _getNearestCellID(self, points):
+    @property
+    def _cellCenterTree(self):
+        """KD-tree of the global cell centers, or `None` if `scipy` is not
+        available.
+
+        The tree is built on first use and kept until the scaled cell
+        centers change.
+        """
+        centers = self._scaledCellCenters
+        cache = getattr(self, "_cellCenterTreeCache", None)
+        if cache is None or cache[0] is not centers:
+            try:
+                from scipy.spatial import cKDTree
+            except ImportError:
+                tree = None
+            else:
+                if isinstance(centers, PhysicalField):
+                    # dimensional meshes use the brute force search
+                    tree = None
+                else:
+                    data = numerix.array(self.cellCenters.globalValue, dtype=float)
+                    if data.shape[-1] > 0:
+                        tree = cKDTree(data.swapaxes(0, 1))
+                    else:
+                        tree = None
+            cache = (centers, tree)
+            self._cellCenterTreeCache = cache
+        return cache[1]
+
+    def _getNearestCellID(self, points, chunkSize=100000):
         """
+        Find the cells whose centers are nearest to `points`.
+
+        A KD-tree of the cell centers is cached on the mesh and queried
+        `chunkSize` points at a time, so the cost is O(N log N) with
+        bounded memory. Without `scipy`, the brute force search of
+        `numerix.nearest()` is used instead.
+
         Test cases
 
            >>> from fipy import *
@@ -588,9 +624,32 @@ class Mesh(AbstractMesh):
            >>> m1 = Grid2D(nx=2, ny=2, dx=5., dy=5.)
            >>> print m0._getNearestCellID(m1.cellCenters.globalValue)
            [4 5 7 8]
+           >>> print m0._getNearestCellID(m1.cellCenters.globalValue, chunkSize=3)
+           [4 5 7 8]
+           >>> print m0._getNearestCellID(m1.cellCenters.globalValue[..., 3])
+           8
+
+        The tree is built once and reused
+
+           >>> tree = m0._cellCenterTree
+           >>> print tree is None or tree is m0._cellCenterTree
+           True
 
         """
-        return numerix.nearest(data=self.cellCenters.globalValue, points=points)
+        tree = self._cellCenterTree
+        if tree is None or isinstance(points, PhysicalField):
+            return numerix.nearest(data=self.cellCenters.globalValue, points=points)
+
+        points = numerix.asarray(points, dtype=float)
+        shape = points.shape[1:]
+        points = points.reshape((points.shape[0], -1)).swapaxes(0, 1)
+
+        nearestIndices = numerix.empty((len(points),), dtype=numerix.INT_DTYPE)
+        for start in range(0, len(points), chunkSize):
+            stop = start + chunkSize
+            nearestIndices[start:stop] = tree.query(points[start:stop])[1]
+
+        return nearestIndices.reshape(shape)
 
     def _test(self):
         """
@@ -0,0 +1,269 @@
+"""Concatenation of any number of meshes
+
+Adding two meshes merges the vertices of one that coincide with vertices of
+the other, and then the faces made of the same merged vertices. Coincident
+vertices are found by hashing their coordinates into bins of the size of the
+matching tolerance and comparing only the vertices in neighboring bins, and
+coincident faces by sorting their vertex IDs, so the cost grows as
+:math:`N \log N` in the number of vertices and faces instead of as the product
+of the sizes of the two meshes. `concatenateMeshes` merges a whole list of meshes
+the same way in a single pass, with the same result as adding them one after
+the other.
+"""
+__docformat__ = 'restructuredtext'
+
+__all__ = ["concatenateMeshes"]
+
+import itertools
+
+from fipy.tools import numerix
+from fipy.tools.numerix import MA
+
+def _columnIDs(columns):
+    """
+    Integer labels of the columns of the `(D, N)` integer array `columns`,
+    which are the same for equal columns and different for different ones.
+
+        >>> print _columnIDs(numerix.array([[3, 1, 3, 3],
+        ...                                 [7, 7, 7, 2]]))
+        [2 0 2 1]
+    """
+    ids = numerix.zeros(columns.shape[-1:], dtype=numerix.INT_DTYPE)
+    for row in columns:
+        values, row = numerix.unique(row, return_inverse=True)
+        values, ids = numerix.unique(ids * len(values) + row, return_inverse=True)
+    return ids
+
+def _closePairs(points0, points1, tolerance):
+    """
+    All pairs of `points0` and `points1` that are closer than `tolerance`.
+
+    The points are hashed into bins twice the size of `tolerance`, so the
+    partner of a point can only be in its own bin or in the bin on the
+    nearer side of it in each direction.
+
+        >>> points0 = numerix.array([[0., 1., 2., 3.],
+        ...                          [0., 0., 0., 0.]])
+        >>> points1 = numerix.array([[1.001, 5., 2.999, 0.999],
+        ...                          [0., 0., 0.001, 0.]])
+        >>> ids0, ids1, distances = _closePairs(points0, points1, 0.01)
+        >>> print ids0, ids1
+        [1 3 1] [0 2 3]
+
+    :Returns:
+      The indices of each pair in `points0` and in `points1`, ordered by
+      `points1`, and the distance between them.
+    """
+    points0 = numerix.array(points0, dtype=float)
+    points1 = numerix.array(points1, dtype=float)
+    D = points0.shape[0]
+
+    scaled0 = points0 / (2 * tolerance)
+    scaled1 = points1 / (2 * tolerance)
+    bins0 = numerix.floor(scaled0).astype(numerix.INT_DTYPE)
+    bins1 = numerix.floor(scaled1).astype(numerix.INT_DTYPE)
+    nearer = numerix.where(scaled1 - bins1 < 0.5, -1, 1)
+
+    offsets = numerix.array(list(itertools.product((0, 1), repeat=D)), dtype=numerix.INT_DTYPE).T
+    # (D, M, 2**D) bins of each of points1 to look in
+    queries = bins1[..., numerix.newaxis] + nearer[..., numerix.newaxis] * offsets[:, numerix.newaxis, :]
+    queries = queries.reshape((D, -1))
+
+    ids = _columnIDs(numerix.concatenate((bins0, queries), axis=1))
+    binIDs0 = ids[:points0.shape[-1]]
+    queryIDs = ids[points0.shape[-1]:]
+
+    order = numerix.argsort(binIDs0, kind='mergesort')
+    sortedBinIDs0 = binIDs0[order]
+    lower = numerix.searchsorted(sortedBinIDs0, queryIDs, side='left')
+    counts = numerix.searchsorted(sortedBinIDs0, queryIDs, side='right') - lower
+
+    queries = numerix.repeat(numerix.arange(len(queryIDs)), counts)
+    starts = numerix.cumsum(counts) - counts
+    ids0 = order[lower[queries] + numerix.arange(len(queries)) - starts[queries]]
+    ids1 = queries // 2**D
+
+    separation = points0[..., ids0] - points1[..., ids1]
+    distances = numerix.sqrt((separation**2).sum(axis=0))
+    close = distances < tolerance
+
+    return ids0[close], ids1[close], distances[close]
+
+def _concatenatedMeshValues(meshes, resolution=1e-2):
+    """Calculate the parameters to define a concatenation of `meshes`
+
+    The vertices and faces of each mesh that coincide with those of an
+    earlier mesh are replaced by them.
+
+    :Parameters:
+      - `meshes`: The :class:`~fipy.meshes.Mesh` objects to concatenate
+      - `resolution`: How close vertices have to be (relative to the smallest
+        cell-to-cell distance in any mesh) to be considered the same
+
+    :Returns:
+      A `dict` with 3 elements: the new mesh vertexCoords, faceVertexIDs, and cellFaceIDs.
+    """
+    from fipy.meshes.abstractMesh import MeshAdditionError
+
+    concatenables = [mesh._concatenableMesh for mesh in meshes]
+
+    dims = set([concatenable.vertexCoords.shape[0] for concatenable in concatenables])
+    if len(dims) > 1:
+        raise MeshAdditionError, "Dimensions do not match"
+
+    numVertices = [concatenable.vertexCoords.shape[-1] for concatenable in concatenables]
+    numFaces = [concatenable.faceVertexIDs.shape[-1] for concatenable in concatenables]
+    vertexOffsets = numerix.cumsum([0] + numVertices)
+    faceOffsets = numerix.cumsum([0] + numFaces)
+
+    vertexMeshes = numerix.repeat(numerix.arange(len(meshes)), numVertices)
+    faceMeshes = numerix.repeat(numerix.arange(len(meshes)), numFaces)
+
+    vertexCoords = numerix.concatenate([numerix.array(concatenable.vertexCoords)
+                                        for concatenable in concatenables], axis=1)
+
+    def pad(ids, rows):
+        ids = MA.filled(ids, -1)
+        return numerix.concatenate((ids, -numerix.ones((rows - ids.shape[0],) + ids.shape[1:],
+                                                       dtype=ids.dtype)), axis=0)
+
+    def globalIDs(ids, offsets):
+        rows = max([ids_.shape[0] for ids_ in ids])
+        return numerix.concatenate([numerix.where(pad(ids_, rows) >= 0, pad(ids_, rows) + offset, -1)
+                                    for ids_, offset in zip(ids, offsets)], axis=1)
+
+    faceVertexIDs = globalIDs([concatenable.faceVertexIDs for concatenable in concatenables],
+                              vertexOffsets)
+    cellFaceIDs = globalIDs([concatenable.cellFaceIDs for concatenable in concatenables],
+                            faceOffsets)
+
+    ## compute vertex correlates
+
+    # only try to match exterior (X) vertices along the operation manifold
+    Xvertices = []
+    for mesh, concatenable, offset in zip(meshes, concatenables, vertexOffsets):
+        if hasattr(mesh, "opManifold"):
+            faces = mesh.opManifold(concatenable)
+        else:
+            faces = concatenable.exteriorFaces.value
+        Xvertices.append(numerix.unique(concatenable.faceVertexIDs.filled()[..., faces].flatten()) + offset)
+    Xvertices = numerix.concatenate(Xvertices).astype(numerix.INT_DTYPE)
+
+    vertexMap = numerix.arange(len(vertexCoords[0]))
+    if len(Xvertices) > 0 and len(meshes) > 1:
+        # only want vertex pairs that are 100x closer than the smallest
+        # cell-to-cell distance
+        distances = [concatenable._cellToCellDistances for concatenable in concatenables
+                     if concatenable._cellToCellDistances.shape[-1] > 0]
+        tolerance = resolution * min([distance.min() for distance in distances])
+
+        XvertexCoords = vertexCoords[..., Xvertices]
+        ids0, ids1, separations = _closePairs(XvertexCoords, XvertexCoords, tolerance)
+        earlier = vertexMeshes[Xvertices[ids0]] < vertexMeshes[Xvertices[ids1]]
+        ids0, ids1, separations = ids0[earlier], ids1[earlier], separations[earlier]
+
+        # each vertex is replaced by the closest vertex of any earlier mesh,
+        # which may in turn be replaced by one of a mesh before that
+        closest = numerix.lexsort((ids0, separations, ids1))
+        first = numerix.ones(closest.shape, dtype=bool)
+        first[1:] = ids1[closest][1:] != ids1[closest][:-1]
+        vertexMap[Xvertices[ids1[closest][first]]] = Xvertices[ids0[closest][first]]
+        while True:
+            replaced = vertexMap[vertexMap]
+            if (replaced == vertexMap).all():
+                break
+            vertexMap = replaced
+
+    matchedMeshes = set(vertexMeshes[vertexMap != numerix.arange(len(vertexMap))])
+
+    ## compute face correlates
+
+    # faces match if they are made of the same vertices
+    mappedFaceVertexIDs = numerix.where(faceVertexIDs >= 0, vertexMap[faceVertexIDs], -1)
+    faceKeys = _columnIDs(numerix.sort(mappedFaceVertexIDs, axis=0))
+    order = numerix.argsort(faceKeys, kind='mergesort')
+    sortedKeys = faceKeys[order]
+    firstOfKey = numerix.ones(sortedKeys.shape, dtype=bool)
+    firstOfKey[1:] = sortedKeys[1:] != sortedKeys[:-1]
+    firstFaces = numerix.empty(faceKeys.shape, dtype=numerix.INT_DTYPE)
+    firstFaces[order] = order[firstOfKey][numerix.cumsum(firstOfKey) - 1]
+
+    faceMap = numerix.where(faceMeshes[firstFaces] < faceMeshes, firstFaces,
+                            numerix.arange(len(faceKeys)))
+
+    matchedFaceMeshes = set(faceMeshes[faceMap != numerix.arange(len(faceMap))])
+
+    # warn if meshes don't touch, but allow it
+    import warnings
+    for i in range(1, len(meshes)):
+        if numVertices[i] > 0 and sum(numVertices[:i]) > 0 and i not in matchedMeshes:
+            warnings.warn("Vertices are not aligned", UserWarning, stacklevel=4)
+        if numFaces[i] > 0 and sum(numFaces[:i]) > 0 and i not in matchedFaceMeshes:
+            warnings.warn("Faces are not aligned", UserWarning, stacklevel=4)
+
+    # renumber the vertices and faces that are left, in order
+    def renumber(idMap):
+        kept = idMap == numerix.arange(len(idMap))
+        newIDs = numerix.cumsum(kept) - 1
+        return kept, newIDs[idMap]
+
+    keptVertices, newVertexIDs = renumber(vertexMap)
+    keptFaces, newFaceIDs = renumber(faceMap)
+
+    faceVertexIDs = faceVertexIDs[..., keptFaces]
+    faceVertexIDs = MA.masked_values(numerix.where(faceVertexIDs >= 0, newVertexIDs[faceVertexIDs], -1), -1)
+    cellFaceIDs = MA.masked_values(numerix.where(cellFaceIDs >= 0, newFaceIDs[cellFaceIDs], -1), -1)
+
+    return {
+        'vertexCoords': vertexCoords[..., keptVertices],
+        'faceVertexIDs': faceVertexIDs,
+        'cellFaceIDs': cellFaceIDs
+        }
+
+def concatenateMeshes(meshes, resolution=1e-2):
+    """
+    Concatenate `meshes`, in a single pass.
+
+    The result is the same as adding them in turn
+
+        >>> from fipy import Grid2D, Tri2D
+        >>> blocks = [Grid2D(nx=2, ny=2) + ((2 * i,), (0,)) for i in range(3)]
+        >>> blocks.append(Tri2D(nx=1, ny=1) + ((6,), (0,)))
+        >>> concatenated = concatenateMeshes(blocks)
+        >>> added = blocks[0] + blocks[1] + blocks[2] + blocks[3]
+        >>> print concatenated.numberOfCells, concatenated.numberOfFaces, len(concatenated.vertexCoords[0])
+        16 39 24
+        >>> for attr in ("vertexCoords", "faceVertexIDs", "cellFaceIDs"):
+        ...     print numerix.allequal(getattr(concatenated, attr), getattr(added, attr))
+        True
+        True
+        True
+
+    and the blocks are connected through their shared faces
+
+        >>> print concatenated._cellToCellIDs[..., 5]
+        [-- 8 7 4]
+
+    Meshes of different dimensions cannot be concatenated
+
+        >>> from fipy import Grid3D
+        >>> concatenateMeshes([Grid3D(nx=1, ny=1, nz=1), blocks[0]]) # doctest: +IGNORE_EXCEPTION_DETAIL
+        Traceback (most recent call last):
+        ...
+        MeshAdditionError: Dimensions do not match
+
+    :Parameters:
+      - `meshes`: A sequence of :class:`~fipy.meshes.Mesh` objects of the
+        same dimension.
+      - `resolution`: How close vertices have to be (relative to the smallest
+        cell-to-cell distance in any mesh) to be considered the same.
+    """
+    meshes = list(meshes)
+    return meshes[0]._concatenatedClass(**_concatenatedMeshValues(meshes, resolution=resolution))
+
+def _test():
+    import fipy.tests.doctestPlus
+    return fipy.tests.doctestPlus.testmod()
+
+if __name__ == "__main__":
+    _test()
@@ -0,0 +1,279 @@
+"""Parallel distribution of arbitrary meshes
+
+`Grid` meshes divide themselves among processes and `Gmsh` meshes are
+partitioned by Gmsh, but a `Mesh` assembled directly from its vertices,
+faces and cells, or by adding or scaling other meshes, is not. `partitionMesh`
+divides such a mesh by recursive coordinate bisection of its cell centers and
+gives each process the submesh of the cells it owns, surrounded by `overlap`
+layers of ghost cells found from the cell-to-cell adjacency of the mesh.
+"""
+__docformat__ = 'restructuredtext'
+
+__all__ = ["partitionMesh"]
+
+from fipy.tools import numerix
+from fipy.tools.numerix import MA
+from fipy.tools import parallelComm
+
+from fipy.meshes.topologies.meshTopology import _MeshTopology
+
+def _recursiveCoordinateBisection(points, parts):
+    """
+    Assign each of `points` to one of `parts` partitions of nearly equal
+    size, by repeatedly dividing the points along the axis of their largest
+    extent.
+
+        >>> x = numerix.array([[0., 1., 2., 3., 0., 1., 2., 3.],
+        ...                    [0., 0., 0., 0., 1., 1., 1., 1.]])
+        >>> print _recursiveCoordinateBisection(x, 2)
+        [0 0 1 1 0 0 1 1]
+        >>> print _recursiveCoordinateBisection(x, 4)
+        [0 1 2 3 0 1 2 3]
+        >>> print _recursiveCoordinateBisection(x, 3)
+        [0 0 1 2 0 1 1 2]
+
+    :Parameters:
+      - `points`: A `(dim, N)` array of coordinates.
+      - `parts`: The number of partitions.
+    """
+    owners = numerix.zeros((points.shape[-1],), dtype=numerix.INT_DTYPE)
+
+    pending = [(numerix.arange(points.shape[-1]), 0, parts)]
+    while len(pending) > 0:
+        ids, first, count = pending.pop()
+        if count == 1 or len(ids) == 0:
+            owners[ids] = first
+            continue
+
+        coords = points[..., ids]
+        axis = numerix.argmax(coords.max(axis=1) - coords.min(axis=1))
+        ordered = ids[numerix.argsort(coords[axis], kind='mergesort')]
+
+        lower = count // 2
+        split = (len(ids) * lower + count // 2) // count
+        pending.append((ordered[:split], first, lower))
+        pending.append((ordered[split:], first + lower, count - lower))
+
+    return owners
+
+def _ghostCellIDs(mesh, cellIDs, overlap):
+    """
+    IDs of the `overlap` layers of cells that surround `cellIDs`, nearest
+    layer first.
+
+        >>> from fipy import Grid2D
+        >>> mesh = Grid2D(nx=4, ny=3)
+        >>> print _ghostCellIDs(mesh, numerix.array([0, 1]), 1)
+        [2 4 5]
+        >>> print _ghostCellIDs(mesh, numerix.array([0, 1]), 2)
+        [2 4 5 3 6 8 9]
+    """
+    neighbors = MA.filled(mesh._cellToCellIDs, -1)
+
+    inside = numerix.zeros((mesh.numberOfCells,), dtype=bool)
+    inside[cellIDs] = True
+
+    layers = [numerix.zeros((0,), dtype=numerix.INT_DTYPE)]
+    front = cellIDs
+    for layer in range(overlap):
+        adjacent = neighbors[..., front].ravel()
+        adjacent = adjacent[adjacent >= 0]
+        front = numerix.unique(adjacent[~inside[adjacent]])
+        inside[front] = True
+        layers.append(front)
+
+    return numerix.concatenate(layers).astype(numerix.INT_DTYPE)
+
+def _extractCells(mesh, cellIDs):
+    """
+    Vertices, faces and cells of the part of `mesh` made of `cellIDs`, in
+    that order, renumbered from zero, followed by the IDs in `mesh` of the
+    faces of the part.
+
+        >>> from fipy import Grid1D
+        >>> mesh = Grid1D(nx=4)._concatenableMesh
+        >>> vertexCoords, faceVertexIDs, cellFaceIDs, faceIDs = _extractCells(mesh, [2, 1])
+        >>> print vertexCoords
+        [[ 1.  2.  3.]]
+        >>> print faceVertexIDs
+        [[0 1 2]]
+        >>> print cellFaceIDs
+        [[1 0]
+         [2 1]]
+        >>> print faceIDs
+        [1 2 3]
+    """
+    cellFaceIDs = MA.array(mesh.cellFaceIDs)[..., cellIDs]
+    faceIDs = numerix.unique(cellFaceIDs.compressed())
+    faceMap = numerix.zeros((mesh.numberOfFaces,), dtype=numerix.INT_DTYPE)
+    faceMap[faceIDs] = numerix.arange(len(faceIDs))
+
+    faceVertexIDs = MA.array(mesh.faceVertexIDs)[..., faceIDs]
+    vertexIDs = numerix.unique(faceVertexIDs.compressed())
+    vertexMap = numerix.zeros((mesh.vertexCoords.shape[-1],), dtype=numerix.INT_DTYPE)
+    vertexMap[vertexIDs] = numerix.arange(len(vertexIDs))
+
+    def renumber(ids, idMap):
+        mask = MA.getmaskarray(ids)
+        renumbered = idMap[MA.filled(ids, 0)]
+        renumbered[mask] = -1
+        return renumbered
+
+    return (numerix.array(mesh.vertexCoords)[..., vertexIDs],
+            renumber(faceVertexIDs, vertexMap),
+            renumber(cellFaceIDs, faceMap),
+            faceIDs)
+
+class _PartitionedMeshTopology(_MeshTopology):
+    """Global and local cell and face IDs of a `Mesh` produced by
+    `partitionMesh`, whose cells and faces are numbered in the order of
+    their global IDs, whether they are owned by this process or are
+    ghosts."""
+
+    @property
+    def _globalNonOverlappingCellIDs(self):
+        return self.mesh._cellGlobalIDs[self.mesh._ownedCells]
+
+    @property
+    def _globalOverlappingCellIDs(self):
+        return self.mesh._cellGlobalIDs
+
+    @property
+    def _localNonOverlappingCellIDs(self):
+        return numerix.nonzero(self.mesh._ownedCells)[0]
+
+    @property
+    def _localOverlappingCellIDs(self):
+        return numerix.arange(self.mesh.numberOfCells)
+
+    @property
+    def _faceGlobalIDs(self):
+        # `Mesh.__init__` needs the face IDs before `partitionMesh` can set
+        # them, and until then the faces are those of a serial mesh
+        return getattr(self.mesh, '_faceGlobalIDs', numerix.arange(self.mesh.numberOfFaces))
+
+    @property
+    def _ownedFaces(self):
+        return getattr(self.mesh, '_ownedFaces', numerix.ones((self.mesh.numberOfFaces,), dtype=bool))
+
+    @property
+    def _globalNonOverlappingFaceIDs(self):
+        return self._faceGlobalIDs[self._ownedFaces]
+
+    @property
+    def _globalOverlappingFaceIDs(self):
+        return self._faceGlobalIDs
+
+    @property
+    def _localNonOverlappingFaceIDs(self):
+        return numerix.nonzero(self._ownedFaces)[0]
+
+    @property
+    def _localOverlappingFaceIDs(self):
+        return numerix.arange(self.mesh.numberOfFaces)
+
+def partitionMesh(mesh, communicator=parallelComm, overlap=2):
+    """
+    Divide `mesh` among the processes of `communicator`.
+
+    Every process must pass the same, complete `mesh`. Each process gets back
+    a `Mesh` of the cells it owns and of up to `overlap` layers of ghost
+    cells owned by its neighbors, in the same order as in `mesh`, which can
+    be solved in parallel like a partitioned `Grid` or `Gmsh` mesh.
+
+    Each cell is owned by exactly one process, as is each face, by the
+    owner of the first cell next to it
+
+        >>> from fipy import Grid2D, CellVariable
+        >>> from fipy.tools.comms.dummyComm import DummyComm
+        >>> class _Comm(DummyComm):
+        ...     def __init__(self, procID, Nproc):
+        ...         self._procID, self._Nproc = procID, Nproc
+        ...     procID = property(lambda self: self._procID)
+        ...     Nproc = property(lambda self: self._Nproc)
+        ...     def allgather(self, obj):
+        ...         return [share(part) for part in parts]
+        >>> whole = Grid2D(nx=6, ny=4) + ((3.,), (0.,))
+        >>> parts = [partitionMesh(whole, communicator=_Comm(procID, 3), overlap=1)
+        ...          for procID in range(3)]
+        >>> owned = numerix.concatenate([part._globalNonOverlappingCellIDs for part in parts])
+        >>> print numerix.sort(owned)
+        [ 0  1  2  3  4  5  6  7  8  9 10 11 12 13 14 15 16 17 18 19 20 21 22 23]
+        >>> print [part.globalNumberOfCells for part in parts]
+        [24, 24, 24]
+        >>> share = lambda part: part._globalNonOverlappingFaceIDs
+        >>> gathered = [part.topology._faceDistribution._gathered[0] for part in parts]
+        >>> print numerix.sort(gathered[0])
+        [ 0  1  2  3  4  5  6  7  8  9 10 11 12 13 14 15 16 17 18 19 20 21 22 23 24
+         25 26 27 28 29 30 31 32 33 34 35 36 37 38 39 40 41 42 43 44 45 46 47 48 49
+         50 51 52 53 54 55 56 57]
+
+    and the cells of each process, ghosts included, are those of the same
+    IDs in the whole mesh
+
+        >>> for part in parts:
+        ...     print numerix.allclose(part.cellCenters,
+        ...                            whole.cellCenters[..., part._globalOverlappingCellIDs])
+        True
+        True
+        True
+        >>> print parts[0]._globalOverlappingCellIDs
+        [ 0  1  2  6  7  8 12 13 14 18 19 20]
+        >>> var = CellVariable(mesh=parts[0], value=parts[0].x)
+        >>> print numerix.allclose(var.value[parts[0]._localNonOverlappingCellIDs],
+        ...                        whole.x[..., parts[0]._globalNonOverlappingCellIDs])
+        True
+
+    Face values gathered from all processes land on the same faces of the
+    whole mesh
+
+        >>> from fipy import FaceVariable
+        >>> faces = [FaceVariable(mesh=part, rank=1, value=part.faceCenters) for part in parts]
+        >>> share = lambda part: faces[parts.index(part)].value[..., part._localNonOverlappingFaceIDs]
+        >>> for face in faces:
+        ...     print numerix.allclose(face.globalValue, whole.faceCenters)
+        True
+        True
+        True
+
+    :Parameters:
+      - `mesh`: The mesh to divide. Any mesh will do, but the `Grid` and
+        `Gmsh` classes are better off dividing themselves.
+      - `communicator`: The processes to divide `mesh` among.
+      - `overlap`: The number of layers of ghost cells around the cells
+        owned by each process.
+    """
+    from fipy.meshes.mesh import Mesh
+    from fipy.meshes.mesh1D import Mesh1D
+    from fipy.meshes.mesh2D import Mesh2D
+
+    owners = _recursiveCoordinateBisection(numerix.array(mesh.cellCenters), communicator.Nproc)
+    owned = numerix.nonzero(owners == communicator.procID)[0].astype(numerix.INT_DTYPE)
+    ghosts = _ghostCellIDs(mesh, owned, overlap)
+
+    cellIDs = numerix.sort(numerix.concatenate((owned, ghosts)))
+    concatenableMesh = mesh._concatenableMesh
+    vertexCoords, faceVertexIDs, cellFaceIDs, faceIDs = _extractCells(concatenableMesh, cellIDs)
+
+    MeshClass = {1: Mesh1D, 2: Mesh2D}.get(mesh.dim, Mesh)
+    part = MeshClass(vertexCoords=vertexCoords,
+                     faceVertexIDs=faceVertexIDs,
+                     cellFaceIDs=cellFaceIDs,
+                     communicator=communicator,
+                     _TopologyClass=_PartitionedMeshTopology)
+
+    part._cellGlobalIDs = cellIDs
+    part._ownedCells = owners[cellIDs] == communicator.procID
+    part.globalNumberOfCells = mesh.globalNumberOfCells
+    part._faceGlobalIDs = faceIDs
+    part._ownedFaces = owners[concatenableMesh.faceCellIDs[0, faceIDs].filled(0)] == communicator.procID
+    part.globalNumberOfFaces = mesh.globalNumberOfFaces
+
+    return part
+
+def _test():
+    import fipy.tests.doctestPlus
+    return fipy.tests.doctestPlus.testmod()
+
+if __name__ == "__main__":
+    _test()
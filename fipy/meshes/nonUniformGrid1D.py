@@ -108,6 +108,7 @@ class NonUniformGrid1D(Mesh1D):
          self.shape,
          self.physicalShape,
          self._meshSpacing,
+         self._globalShape,
          self.occupiedNodes,
          vertices,
          faces,
@@ -75,6 +75,7 @@ class NonUniformGrid3D(Mesh):
     Faces: XY faces numbered first, then XZ faces, then YZ faces. Within each subcategory, it is numbered in the usual way.
     """
     def __init__(self, dx = 1., dy = 1., dz = 1., nx = None, ny = None, nz = None, overlap=2, communicator=parallelComm,
+                 decomposition="slab",
                  _RepresentationClass=_Grid3DRepresentation, _TopologyClass=_Grid3DTopology):
 
         builder = _NonuniformGrid3DBuilder()
@@ -87,10 +88,11 @@ class NonUniformGrid3D(Mesh):
             'ny': ny,
             'nz': nz,
             'overlap': overlap,
+            'decomposition': decomposition,
         }
 
         builder.buildGridData([dx, dy, dz], [nx, ny, nz], overlap,
-                              communicator)
+                              communicator, decomposition=decomposition)
 
         ([self.dx, self.dy, self.dz],
          [self.nx, self.ny, self.nz],
@@ -106,6 +108,7 @@ class NonUniformGrid3D(Mesh):
          self.shape,
          self.physicalShape,
          self._meshSpacing,
+         self._globalShape,
          self.numberOfXYFaces,
          self.numberOfXZFaces,
          self.numberOfYZFaces,
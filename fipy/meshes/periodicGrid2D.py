@@ -142,20 +142,16 @@ class PeriodicGrid2D(_BasePeriodicGrid2D):
     """
 
     def _makePeriodic(self):
-        self._connectFaces(numerix.nonzero(self.facesLeft),
-                           numerix.nonzero(self.facesRight))
-        self._connectFaces(numerix.nonzero(self.facesBottom),
-                           numerix.nonzero(self.facesTop))
+        self._connectFacePairs((self.facesLeft, self.facesRight),
+                               (self.facesBottom, self.facesTop))
 
 class PeriodicGrid2DLeftRight(_BasePeriodicGrid2D):
     def _makePeriodic(self):
-        self._connectFaces(numerix.nonzero(self.facesLeft),
-                           numerix.nonzero(self.facesRight))
+        self._connectFacePairs((self.facesLeft, self.facesRight))
 
 class PeriodicGrid2DTopBottom(_BasePeriodicGrid2D):
     def _makePeriodic(self):
-        self._connectFaces(numerix.nonzero(self.facesBottom),
-                           numerix.nonzero(self.facesTop))
+        self._connectFacePairs((self.facesBottom, self.facesTop))
 
 def _test():
     import fipy.tests.doctestPlus
@@ -160,12 +160,9 @@ class PeriodicGrid3D(_BasePeriodicGrid3D):
     """
 
     def _makePeriodic(self):
-        self._connectFaces(numerix.nonzero(self.facesLeft),
-                           numerix.nonzero(self.facesRight))
-        self._connectFaces(numerix.nonzero(self.facesBottom),
-                           numerix.nonzero(self.facesTop))
-        self._connectFaces(numerix.nonzero(self.facesFront),
-                           numerix.nonzero(self.facesBack))
+        self._connectFacePairs((self.facesLeft, self.facesRight),
+                               (self.facesBottom, self.facesTop),
+                               (self.facesFront, self.facesBack))
 
     def _test(self):
         """
@@ -186,39 +183,30 @@ class PeriodicGrid3D(_BasePeriodicGrid3D):
 
 class PeriodicGrid3DLeftRight(_BasePeriodicGrid3D):
     def _makePeriodic(self):
-        self._connectFaces(numerix.nonzero(self.facesLeft),
-                           numerix.nonzero(self.facesRight))
+        self._connectFacePairs((self.facesLeft, self.facesRight))
 
 class PeriodicGrid3DLeftRightTopBottom(_BasePeriodicGrid3D):
     def _makePeriodic(self):
-        self._connectFaces(numerix.nonzero(self.facesLeft),
-                           numerix.nonzero(self.facesRight))
-        self._connectFaces(numerix.nonzero(self.facesBottom),
-                           numerix.nonzero(self.facesTop))
+        self._connectFacePairs((self.facesLeft, self.facesRight),
+                               (self.facesBottom, self.facesTop))
 
 class PeriodicGrid3DLeftRightFrontBack(_BasePeriodicGrid3D):
     def _makePeriodic(self):
-        self._connectFaces(numerix.nonzero(self.facesLeft),
-                           numerix.nonzero(self.facesRight))
-        self._connectFaces(numerix.nonzero(self.facesFront),
-                           numerix.nonzero(self.facesBack))
+        self._connectFacePairs((self.facesLeft, self.facesRight),
+                               (self.facesFront, self.facesBack))
 
 class PeriodicGrid3DTopBottom(_BasePeriodicGrid3D):
     def _makePeriodic(self):
-        self._connectFaces(numerix.nonzero(self.facesBottom),
-                           numerix.nonzero(self.facesTop))
+        self._connectFacePairs((self.facesBottom, self.facesTop))
 
 class PeriodicGrid3DTopBottomFrontBack(_BasePeriodicGrid3D):
     def _makePeriodic(self):
-        self._connectFaces(numerix.nonzero(self.facesBottom),
-                           numerix.nonzero(self.facesTop))
-        self._connectFaces(numerix.nonzero(self.facesFront),
-                           numerix.nonzero(self.facesBack))
+        self._connectFacePairs((self.facesBottom, self.facesTop),
+                               (self.facesFront, self.facesBack))
 
 class PeriodicGrid3DFrontBack(_BasePeriodicGrid3D):
     def _makePeriodic(self):
-        self._connectFaces(numerix.nonzero(self.facesFront),
-                           numerix.nonzero(self.facesBack))
+        self._connectFacePairs((self.facesFront, self.facesBack))
 
 
 
@@ -73,7 +73,13 @@ def _suite():
         'fipy.meshes.cylindricalNonUniformGrid2D',
         'fipy.meshes.factoryMeshes',
         'fipy.meshes.abstractMesh',
-        'fipy.meshes.representations.gridRepresentation'))
+        'fipy.meshes.cellInterpolator',
+        'fipy.meshes.meshPartitioner',
+        'fipy.meshes.meshConcatenation',
+        'fipy.meshes.representations.gridRepresentation',
+        'fipy.meshes.topologies.abstractTopology',
+        'fipy.meshes.topologies.gridTopology',
+        'fipy.meshes.builders.abstractGridBuilder'))
 
 if __name__ == '__main__':
     fipy.tests.testProgram.main(defaultTest='_suite')
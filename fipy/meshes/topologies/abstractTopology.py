@@ -58,6 +58,210 @@ class _AbstractTopology(object):
     def __init__(self, mesh):
         self.mesh = mesh
 
+    @staticmethod
+    def _readOnly(ids):
+        ids = numerix.array(ids, dtype=numerix.INT_DTYPE)
+        ids.flags.writeable = False
+        return ids
+
+    @property
+    def _interiorFaceIDs(self):
+        """IDs of the interior faces.
+
+        Like the other face and cell ID arrays below, this is computed once
+        per mesh, is read-only and is shared by all terms that assemble on
+        the mesh.
+
+        >>> from fipy import Grid2D
+        >>> topology = Grid2D(nx=3, ny=2).topology
+        >>> print topology._interiorFaceIDs
+        [ 3  4  5 10 11 14 15]
+        >>> print topology._interiorFaceIDs is topology._interiorFaceIDs
+        True
+        >>> topology._interiorFaceIDs[0] = 0
+        Traceback (most recent call last):
+            ...
+        ValueError: assignment destination is read-only
+        """
+        if not hasattr(self, '_interiorFaceIDsCache'):
+            self._interiorFaceIDsCache = self._readOnly(numerix.nonzero(self.mesh.interiorFaces)[0])
+        return self._interiorFaceIDsCache
+
+    @property
+    def _interiorFaceCellIDs(self):
+        """IDs of the cells on either side of each interior face.
+
+        >>> from fipy import Grid2D
+        >>> print Grid2D(nx=3, ny=2).topology._interiorFaceCellIDs
+        [[0 1 2 0 1 3 4]
+         [3 4 5 1 2 4 5]]
+        """
+        if not hasattr(self, '_interiorFaceCellIDsCache'):
+            id1, id2 = self.mesh._adjacentCellIDs
+            self._interiorFaceCellIDsCache = self._readOnly((numerix.take(id1, self._interiorFaceIDs),
+                                                             numerix.take(id2, self._interiorFaceIDs)))
+        return self._interiorFaceCellIDsCache
+
+    @property
+    def _cellFaceIncidence(self):
+        """Sparse `(C, F)` matrix of the orientation of the normal of each
+        face of each cell, `1` if it points out of the cell and `-1` if it
+        points in, or `None` if `scipy` is not available.
+
+        Cells only have entries for the faces they actually have, so cells
+        with fewer than the maximum number of faces cost nothing extra.
+
+        >>> from fipy import Grid2D
+        >>> topology = Grid2D(nx=2, ny=1).topology
+        >>> print topology._cellFaceIncidence.toarray() # doctest: +SCIPY
+        [[ 1.  0.  1.  0.  1.  1.  0.]
+         [ 0.  1.  0.  1.  0. -1.  1.]]
+        >>> print topology._cellFaceIncidence is topology._cellFaceIncidence # doctest: +SCIPY
+        True
+        """
+        if not hasattr(self, '_cellFaceIncidenceCache'):
+            try:
+                from scipy import sparse
+            except ImportError:
+                self._cellFaceIncidenceCache = None
+            else:
+                cellFaceIDs = self.mesh.cellFaceIDs
+                present = ~numerix.MA.getmaskarray(cellFaceIDs).swapaxes(0, 1)
+                faceIDs = numerix.MA.filled(cellFaceIDs, 0).swapaxes(0, 1)[present]
+                orientations = numerix.MA.filled(self.mesh._cellToFaceOrientations, 0).swapaxes(0, 1)[present]
+                indptr = numerix.concatenate(([0], numerix.cumsum(present.sum(axis=1))))
+                self._cellFaceIncidenceCache = sparse.csr_matrix((orientations.astype(float), faceIDs, indptr),
+                                                                 shape=(self.mesh.numberOfCells,
+                                                                        self.mesh.numberOfFaces))
+        return self._cellFaceIncidenceCache
+
+    @property
+    def _faceCellIncidence(self):
+        """Column indices and row pointers of a sparse `(F, C)` matrix with
+        an entry for each of the two cells adjacent to each face, or `None`
+        if `scipy` is not available. Exterior faces refer to their cell
+        twice. The indices of each face are sorted, so `scipy` never needs
+        to reorder them.
+
+        >>> from fipy import Grid1D
+        >>> indices, indptr = Grid1D(nx=2).topology._faceCellIncidence # doctest: +SCIPY
+        >>> print indices # doctest: +SCIPY
+        [0 0 0 1 1 1]
+        >>> print indptr # doctest: +SCIPY
+        [0 2 4 6]
+        """
+        if not hasattr(self, '_faceCellIncidenceCache'):
+            try:
+                from scipy import sparse
+            except ImportError:
+                self._faceCellIncidenceCache = None
+            else:
+                id1, id2 = self.mesh._adjacentCellIDs
+                indices = numerix.sort(numerix.column_stack((id1, id2)), axis=1).ravel()
+                indptr = numerix.arange(0, len(indices) + 1, 2)
+                self._faceCellIncidenceCache = (self._readOnly(indices), self._readOnly(indptr))
+        return self._faceCellIncidenceCache
+
+    @property
+    def _cellDistribution(self):
+        """Maps between the local and global cells of a parallel mesh,
+        which are only gathered from the other processes once.
+
+        >>> from fipy import Grid1D
+        >>> topology = Grid1D(nx=3).topology
+        >>> print topology._cellDistribution.allgather(numerix.array([1., 2., 3.]))
+        [ 1.  2.  3.]
+        >>> print topology._cellDistribution is topology._cellDistribution
+        True
+        """
+        if not hasattr(self, '_cellDistributionCache'):
+            from fipy.tools.comms.distribution import _Distribution
+            self._cellDistributionCache = _Distribution(communicator=self.mesh.communicator,
+                                                        localIDs=self._localNonOverlappingCellIDs,
+                                                        globalIDs=self._globalNonOverlappingCellIDs,
+                                                        overlappingGlobalIDs=self._globalOverlappingCellIDs)
+        return self._cellDistributionCache
+
+    @property
+    def _faceDistribution(self):
+        """Maps between the local and global faces of a parallel mesh."""
+        if not hasattr(self, '_faceDistributionCache'):
+            from fipy.tools.comms.distribution import _Distribution
+            self._faceDistributionCache = _Distribution(communicator=self.mesh.communicator,
+                                                        localIDs=self._localNonOverlappingFaceIDs,
+                                                        globalIDs=self._globalNonOverlappingFaceIDs,
+                                                        overlappingGlobalIDs=self._globalOverlappingFaceIDs)
+        return self._faceDistributionCache
+
+    def _reshapeIDs(self, ids, vectorSize):
+        """Cell `ids` of the `(vectorSize, vectorSize)` blocks of a coupled
+        variable's matrix."""
+        shape = (vectorSize, vectorSize, ids.shape[-1])
+        ids = numerix.resize(ids, shape)
+        X, Y = numerix.indices(shape[:-1])
+        X *= self.mesh.numberOfCells
+        ids += X[..., numerix.newaxis]
+        return self._readOnly(ids)
+
+    def _reshapedCellIDs(self, vectorSize):
+        """Cell IDs reshaped for a variable with `vectorSize` components.
+
+        >>> from fipy import Grid1D
+        >>> topology = Grid1D(nx=2).topology
+        >>> print topology._reshapedCellIDs(1)
+        [[[0 1]]]
+        >>> print topology._reshapedCellIDs(2)
+        [[[0 1]
+          [0 1]]
+        <BLANKLINE>
+         [[2 3]
+          [2 3]]]
+        >>> print topology._reshapedCellIDs(2) is topology._reshapedCellIDs(2)
+        True
+        """
+        if not hasattr(self, '_reshapedCellIDsCache'):
+            self._reshapedCellIDsCache = {}
+        if vectorSize not in self._reshapedCellIDsCache:
+            self._reshapedCellIDsCache[vectorSize] = self._reshapeIDs(numerix.arange(self.mesh.numberOfCells),
+                                                                      vectorSize)
+        return self._reshapedCellIDsCache[vectorSize]
+
+    def _interiorFaceMatrixIDs(self, vectorSize):
+        """Flat row and column IDs of the matrix entries that couple the
+        cells on either side of each interior face, for a variable with
+        `vectorSize` components.
+
+        Returns `(row1, row2, column1, column2)`, where `row1` and `column1`
+        refer to the first cell of each face and `row2` and `column2` to
+        the second. The same arrays are returned on every call, so a
+        matrix can recognize a stencil it has already assembled.
+
+        >>> from fipy import Grid1D
+        >>> topology = Grid1D(nx=3).topology
+        >>> for ids in topology._interiorFaceMatrixIDs(1):
+        ...     print ids
+        [0 1]
+        [1 2]
+        [0 1]
+        [1 2]
+        >>> row1, row2, column1, column2 = topology._interiorFaceMatrixIDs(2)
+        >>> print row1
+        [0 1 0 1 3 4 3 4]
+        >>> print column1
+        [0 1 3 4 0 1 3 4]
+        >>> print row1 is topology._interiorFaceMatrixIDs(2)[0]
+        True
+        """
+        if not hasattr(self, '_interiorFaceMatrixIDsCache'):
+            self._interiorFaceMatrixIDsCache = {}
+        if vectorSize not in self._interiorFaceMatrixIDsCache:
+            id1, id2 = [self._reshapeIDs(ids, vectorSize) for ids in self._interiorFaceCellIDs]
+            self._interiorFaceMatrixIDsCache[vectorSize] = tuple(self._readOnly(ids.ravel())
+                                                                 for ids in (id1, id2,
+                                                                             id1.swapaxes(0, 1),
+                                                                             id2.swapaxes(0, 1)))
+        return self._interiorFaceMatrixIDsCache[vectorSize]
+
     @property
     def _isOrthogonal(self):
         raise NotImplementedError
@@ -241,3 +445,10 @@ class _AbstractTopology(object):
     def _cellTopology(self):
         """return a map of the topology of each cell of grid"""
         raise NotImplementedError
+
+def _test():
+    import fipy.tests.doctestPlus
+    return fipy.tests.doctestPlus.testmod()
+
+if __name__ == "__main__":
+    _test()
@@ -64,6 +64,49 @@ class _GridTopology(_AbstractTopology):
     def _isOrthogonal(self):
         return True
 
+    @staticmethod
+    def _blockCellIDs(lower, upper, offset, shape):
+        """IDs, in a grid of `shape` cells, of the block of cells from `lower`
+        up to, but not including, `upper` along each axis, once shifted by
+        `offset`. Cells are numbered with the first axis varying fastest.
+
+        >>> print _GridTopology._blockCellIDs(lower=(1, 0), upper=(3, 2),
+        ...                                   offset=(2, 1), shape=(5, 4))
+        [ 8  9 13 14]
+        >>> print _GridTopology._blockCellIDs(lower=(0, 0), upper=(0, 2),
+        ...                                   offset=(0, 0), shape=(5, 4))
+        []
+        """
+        axes = [numerix.arange(l, u) + o for l, u, o in zip(lower, upper, offset)]
+        indices = numerix.meshgrid(*axes[::-1], indexing='ij')
+        return numerix.ravel_multi_index(indices, tuple(shape)[::-1]).ravel()
+
+    @property
+    def _nonOverlappingBounds(self):
+        """First and last local cell along each axis that aren't overlapping
+        cells of another process."""
+        raise NotImplementedError
+
+    @property
+    def _globalNonOverlappingCellIDs(self):
+        lower, upper = self._nonOverlappingBounds
+        return self._blockCellIDs(lower, upper, self.mesh.offset, self.mesh._globalShape)
+
+    @property
+    def _globalOverlappingCellIDs(self):
+        shape = self.mesh.shape
+        return self._blockCellIDs((0,) * len(shape), shape, self.mesh.offset, self.mesh._globalShape)
+
+    @property
+    def _localNonOverlappingCellIDs(self):
+        lower, upper = self._nonOverlappingBounds
+        shape = self.mesh.shape
+        return self._blockCellIDs(lower, upper, (0,) * len(shape), shape)
+
+    @property
+    def _localOverlappingCellIDs(self):
+        return numerix.arange(0, self.mesh.numberOfCells)
+
 class _Grid1DTopology(_GridTopology):
 
     _concatenatedClass = Mesh1D
@@ -221,6 +264,12 @@ class _Grid2DTopology(_GridTopology):
 
     _concatenatedClass = Mesh2D
 
+    @property
+    def _nonOverlappingBounds(self):
+        overlap = self.mesh.overlap
+        return ((overlap['left'], overlap['bottom']),
+                (self.mesh.nx - overlap['right'], self.mesh.ny - overlap['top']))
+
     @property
     def _globalNonOverlappingCellIDs(self):
         """Return the IDs of the local mesh in the context of the global parallel mesh.
@@ -237,10 +286,21 @@ class _Grid2DTopology(_GridTopology):
         | 0 | 1 |  A
         ---------
 
+        and [0, 1, 4, 5] for mesh A of a block decomposition
+
+        ---------------------
+        | 12 | 13 || 14 | 15 |
+        ---------------------  C, D
+        |  8 |  9 || 10 | 11 |
+        =====================
+        |  4 |  5 ||  6 |  7 |
+        ---------------------  A, B
+        |  0 |  1 ||  2 |  3 |
+        ---------------------
+
         .. note:: Trivial except for parallel meshes
         """
-        return numerix.arange((self.mesh.offset[1] + self.mesh.overlap['bottom']) * self.mesh.nx,
-                              (self.mesh.offset[1] + self.mesh.ny - self.mesh.overlap['top']) * self.mesh.nx)
+        return super(_Grid2DTopology, self)._globalNonOverlappingCellIDs
 
     @property
     def _globalOverlappingCellIDs(self):
@@ -260,7 +320,7 @@ class _Grid2DTopology(_GridTopology):
 
         .. note:: Trivial except for parallel meshes
         """
-        return numerix.arange(self.mesh.offset[1] * self.mesh.nx, (self.mesh.offset[1] + self.mesh.ny) * self.mesh.nx)
+        return super(_Grid2DTopology, self)._globalOverlappingCellIDs
 
     @property
     def _localNonOverlappingCellIDs(self):
@@ -280,8 +340,7 @@ class _Grid2DTopology(_GridTopology):
 
         .. note:: Trivial except for parallel meshes
         """
-        return numerix.arange(self.mesh.overlap['bottom'] * self.mesh.nx,
-                              (self.mesh.ny - self.mesh.overlap['top']) * self.mesh.nx)
+        return super(_Grid2DTopology, self)._localNonOverlappingCellIDs
 
     @property
     def _localOverlappingCellIDs(self):
@@ -301,7 +360,7 @@ class _Grid2DTopology(_GridTopology):
 
         .. note:: Trivial except for parallel meshes
         """
-        return numerix.arange(0, self.mesh.ny * self.mesh.nx)
+        return super(_Grid2DTopology, self)._localOverlappingCellIDs
 
     @property
     def _cellTopology(self):
@@ -316,6 +375,14 @@ class _Grid3DTopology(_GridTopology):
 
     _concatenatedClass = Mesh
 
+    @property
+    def _nonOverlappingBounds(self):
+        overlap = self.mesh.overlap
+        return ((overlap['left'], overlap['bottom'], overlap['front']),
+                (self.mesh.nx - overlap['right'],
+                 self.mesh.ny - overlap['top'],
+                 self.mesh.nz - overlap['back']))
+
     @property
     def _globalNonOverlappingCellIDs(self):
         """
@@ -324,8 +391,7 @@ class _Grid3DTopology(_GridTopology):
 
         .. note:: Trivial except for parallel meshes
         """
-        return numerix.arange((self.mesh.offset[2] + self.mesh.overlap['front']) * self.mesh.nx * self.mesh.ny,
-                              (self.mesh.offset[2] + self.mesh.nz - self.mesh.overlap['back']) * self.mesh.nx * self.mesh.ny)
+        return super(_Grid3DTopology, self)._globalNonOverlappingCellIDs
 
     @property
     def _globalOverlappingCellIDs(self):
@@ -335,9 +401,7 @@ class _Grid3DTopology(_GridTopology):
 
         .. note:: Trivial except for parallel meshes
         """
-
-        return numerix.arange(self.mesh.offset[2] * self.mesh.nx * self.mesh.ny,
-                              (self.mesh.offset[2] + self.mesh.nz) * self.mesh.nx * self.mesh.ny)
+        return super(_Grid3DTopology, self)._globalOverlappingCellIDs
 
     @property
     def _localNonOverlappingCellIDs(self):
@@ -347,8 +411,7 @@ class _Grid3DTopology(_GridTopology):
 
         .. note:: Trivial except for parallel meshes
         """
-        return numerix.arange(self.mesh.overlap['front'] * self.mesh.nx * self.mesh.ny,
-                              (self.mesh.nz - self.mesh.overlap['back']) * self.mesh.nx * self.mesh.ny)
+        return super(_Grid3DTopology, self)._localNonOverlappingCellIDs
 
     @property
     def _localOverlappingCellIDs(self):
@@ -358,7 +421,7 @@ class _Grid3DTopology(_GridTopology):
 
         .. note:: Trivial except for parallel meshes
         """
-        return numerix.arange(0, self.mesh.ny * self.mesh.nx * self.mesh.nz)
+        return super(_Grid3DTopology, self)._localOverlappingCellIDs
 
     @property
     def _cellTopology(self):
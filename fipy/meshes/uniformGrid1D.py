@@ -114,6 +114,7 @@ class UniformGrid1D(UniformGrid):
          self.shape,
          self.physicalShape,
          self._meshSpacing,
+         self._globalShape,
          self.occupiedNodes,
          self.origin) = builder.gridData
 
@@ -313,6 +314,11 @@ class UniformGrid1D(UniformGrid):
     def _maxFacesPerCell(self):
         return 2
 
+    @property
+    def _VTKCellType(self):
+        # VTK_LINE
+        return 3
+
     @property
     def vertexCoords(self):
         return numerix.array(self.faceCenters)
@@ -71,6 +71,7 @@ class UniformGrid2D(UniformGrid):
     """
     def __init__(self, dx=1., dy=1., nx=1, ny=1, origin=((0,),(0,)),
                        overlap=2, communicator=parallelComm,
+                       decomposition="slab",
                        _RepresentationClass=_Grid2DRepresentation,
                        _TopologyClass=_Grid2DTopology):
 
@@ -87,11 +88,12 @@ class UniformGrid2D(UniformGrid):
             'nx': nx,
             'ny': ny,
             'origin': origin,
-            'overlap': overlap
+            'overlap': overlap,
+            'decomposition': decomposition
         }
 
         builder.buildGridData([dx, dy], [nx, ny], overlap, communicator,
-                              origin)
+                              origin, decomposition=decomposition)
 
         ([self.dx, self.dy],
          [self.nx, self.ny],
@@ -107,6 +109,7 @@ class UniformGrid2D(UniformGrid):
          self.shape,
          self.physicalShape,
          self._meshSpacing,
+         self._globalShape,
          self.numberOfHorizontalRows,
          self.numberOfVerticalColumns,
          self.numberOfHorizontalFaces,
@@ -466,7 +469,8 @@ class UniformGrid2D(UniformGrid):
     def _translate(self, vector):
         return self.__class__(dx = self.args['dx'], nx = self.args['nx'],
                               dy = self.args['dy'], ny = self.args['ny'],
-                             origin = numerix.array(self.args['origin']) + vector, overlap=self.args['overlap'])
+                             origin = numerix.array(self.args['origin']) + vector, overlap=self.args['overlap'],
+                              decomposition=self.args.get('decomposition', "slab"))
 
     def __mul__(self, factor):
         if numerix.shape(factor) is ():
@@ -474,7 +478,8 @@ class UniformGrid2D(UniformGrid):
 
         return UniformGrid2D(dx=self.args['dx'] * numerix.array(factor[0]), nx=self.args['nx'],
                              dy=self.args['dy'] * numerix.array(factor[1]), ny=self.args['ny'],
-                             origin=numerix.array(self.args['origin']) * factor, overlap=self.args['overlap'])
+                             origin=numerix.array(self.args['origin']) * factor, overlap=self.args['overlap'],
+                             decomposition=self.args.get('decomposition', "slab"))
 
     @property
     def _concatenableMesh(self):
@@ -497,6 +502,11 @@ class UniformGrid2D(UniformGrid):
     def _maxFacesPerCell(self):
         return 4
 
+    @property
+    def _VTKCellType(self):
+        # VTK_POLYGON
+        return 7
+
     @property
     def vertexCoords(self):
         return _Grid2DBuilder.createVertices(self.nx, self.ny,
@@ -78,6 +78,7 @@ class UniformGrid3D(UniformGrid):
     """
     def __init__(self, dx = 1., dy = 1., dz = 1., nx = 1, ny = 1, nz = 1,
                  origin = [[0], [0], [0]], overlap=2, communicator=parallelComm,
+                 decomposition="slab",
                  _RepresentationClass=_Grid3DRepresentation,
                  _TopologyClass=_Grid3DTopology):
 
@@ -95,11 +96,12 @@ class UniformGrid3D(UniformGrid):
             'ny': ny,
             'nz': nz,
             'origin': origin,
-            'overlap': overlap
+            'overlap': overlap,
+            'decomposition': decomposition
         }
 
         builder.buildGridData([dx, dy, dz], [nx, ny, nz], overlap,
-                              communicator, origin)
+                              communicator, origin, decomposition=decomposition)
 
         ([self.dx, self.dy, self.dz],
          [self.nx, self.ny, self.nz],
@@ -115,6 +117,7 @@ class UniformGrid3D(UniformGrid):
          self.shape,
          self.physicalShape,
          self._meshSpacing,
+         self._globalShape,
          self.numberOfXYFaces,
          self.numberOfXZFaces,
          self.numberOfYZFaces,
@@ -423,7 +426,8 @@ class UniformGrid3D(UniformGrid):
         return self.__class__(dx = self.args['dx'], nx = self.args['nx'],
                               dy = self.args['dy'], ny = self.args['ny'],
                               dz = self.args['dz'], nz = self.args['nz'],
-                             origin = numerix.array(self.args['origin']) + vector, overlap=self.args['overlap'])
+                             origin = numerix.array(self.args['origin']) + vector, overlap=self.args['overlap'],
+                             decomposition=self.args.get('decomposition', "slab"))
 
     def __mul__(self, factor):
         return UniformGrid3D(dx = self.dx * factor, nx = self.nx,
@@ -18,116 +18,99 @@ class SerialSolverError(Exception):
     def __init__(self, solver):
         super(SerialSolverError, self).__init__(solver + ' does not run in parallel')
 
-if solver == "pysparse":
-    if _parallelComm.Nproc > 1:
-        raise SerialSolverError('pysparse')
-    from fipy.solvers.pysparse import *
-    __all__.extend(pysparse.__all__)
-    from fipy.matrices.pysparseMatrix import _PysparseMeshMatrix
-    _MeshMatrix =  _PysparseMeshMatrix
-
-elif solver == "trilinos":
-    from fipy.solvers.trilinos import *
-    __all__.extend(trilinos.__all__)
-
-    try:
+def _importSuite(name, serial=False):
+    """Import the solvers of the package `name` into `fipy.solvers`."""
+    if serial and _parallelComm.Nproc > 1:
+        raise SerialSolverError(name.split('.')[-1])
+    suite = __import__(name, fromlist=['__all__'])
+    for attr in suite.__all__:
+        globals()[attr] = getattr(suite, attr)
+    __all__.extend(suite.__all__)
+
+def _importSolver(solver):
+    """
+    Import the solvers of the `solver` suite and the matrices they use, and
+    return the name of the suite, which is "no-pysparse" for "trilinos" when
+    Pysparse cannot be imported.
+    """
+    global _MeshMatrix
+
+    if solver == "pysparse":
+        _importSuite("fipy.solvers.pysparse", serial=True)
         from fipy.matrices.pysparseMatrix import _PysparseMeshMatrix
         _MeshMatrix =  _PysparseMeshMatrix
-    except ImportError:
+
+    elif solver == "trilinos":
+        _importSuite("fipy.solvers.trilinos")
+        try:
+            from fipy.matrices.pysparseMatrix import _PysparseMeshMatrix
+            _MeshMatrix =  _PysparseMeshMatrix
+        except ImportError:
+            solver = "no-pysparse"
+            from fipy.matrices.trilinosMatrix import _TrilinosMeshMatrix
+            _MeshMatrix =  _TrilinosMeshMatrix
+
+    elif solver == "scipy":
+        _importSuite("fipy.solvers.scipy", serial=True)
+        from fipy.matrices.scipyMatrix import _ScipyMeshMatrix
+        _MeshMatrix = _ScipyMeshMatrix
+
+    elif solver == "pyamg":
+        _importSuite("fipy.solvers.pyAMG", serial=True)
+        from fipy.matrices.scipyMatrix import _ScipyMeshMatrix
+        _MeshMatrix = _ScipyMeshMatrix
+
+    elif solver == "pyamgx":
+        _importSuite("fipy.solvers.pyamgx", serial=True)
+        from fipy.matrices.scipyMatrix import _ScipyMeshMatrix
+        _MeshMatrix = _ScipyMeshMatrix
+
+    elif solver == "no-pysparse":
+        _importSuite("fipy.solvers.trilinos")
         from fipy.matrices.trilinosMatrix import _TrilinosMeshMatrix
         _MeshMatrix =  _TrilinosMeshMatrix
 
-elif solver == "scipy":
-    if _parallelComm.Nproc > 1:
-        raise SerialSolverError('scipy')
-    from fipy.solvers.scipy import *
-    __all__.extend(scipy.__all__)
-    from fipy.matrices.scipyMatrix import _ScipyMeshMatrix
-    _MeshMatrix = _ScipyMeshMatrix
-
-elif solver == "pyamg":
-    if _parallelComm.Nproc > 1:
-        raise SerialSolverError('pyamg')
-    from fipy.solvers.pyAMG import *
-    __all__.extend(pyAMG.__all__)
-    from fipy.matrices.scipyMatrix import _ScipyMeshMatrix
-    _MeshMatrix = _ScipyMeshMatrix
-
-elif solver == "pyamgx":
-    if _parallelComm.Nproc > 1:
-        raise SerialSolverError('pyamgx')
-    from fipy.solvers.pyamgx import *
-    __all__.extend(pyamgx.__all__)
-    from fipy.matrices.scipyMatrix import _ScipyMeshMatrix
-    _MeshMatrix = _ScipyMeshMatrix
-
-elif solver == "no-pysparse":
-    from fipy.solvers.trilinos import *
-    __all__.extend(trilinos.__all__)
-    from fipy.matrices.trilinosMatrix import _TrilinosMeshMatrix
-    _MeshMatrix =  _TrilinosMeshMatrix
-
-elif solver is None:
-    # If no argument or environment variable, try importing them and seeing
-    # what works
+    else:
+        raise ImportError, 'Unknown solver package %s' % solver
 
-    exceptions = []
+    return solver
 
-    try:
-        if _parallelComm.Nproc > 1:
-            raise SerialSolverError('pysparse')
-        from fipy.solvers.pysparse import *
-        __all__.extend(pysparse.__all__)
-        solver = "pysparse"
-        from fipy.matrices.pysparseMatrix import _PysparseMeshMatrix
-        _MeshMatrix =  _PysparseMeshMatrix
+# whether the solver suite was found in the cache of `solverCache`
+_cached = False
+
+if solver is not None:
+    _importSolver(solver)
+else:
+    # If no argument or environment variable, try importing them and seeing
+    # what works, starting with the one that worked last time, if known
 
-    except (ImportError, SerialSolverError) as inst:
-        exceptions.append(inst)
+    from fipy.solvers.solverCache import _cachedSolver, _cacheSolver
 
+    _parallel = _parallelComm.Nproc > 1
+    solver = _cachedSolver(parallel=_parallel)
+    if solver is not None:
         try:
-            from fipy.solvers.trilinos import *
-            __all__.extend(trilinos.__all__)
-            solver = "trilinos"
-            try:
-                from fipy.matrices.pysparseMatrix import _PysparseMeshMatrix
-                _MeshMatrix =  _PysparseMeshMatrix
-            except ImportError:
-                solver = "no-pysparse"
-                from fipy.matrices.trilinosMatrix import _TrilinosMeshMatrix
-                _MeshMatrix =  _TrilinosMeshMatrix
-        except ImportError as inst:
-            exceptions.append(inst)
+            solver = _importSolver(solver)
+            _cached = True
+        except (ImportError, SerialSolverError):
+            solver = None
+
+    if solver is None:
+        exceptions = []
 
+        for candidate in ("pysparse", "trilinos", "pyamg", "scipy"):
             try:
-                if _parallelComm.Nproc > 1:
-                    raise SerialSolverError('pyamg')
-                from fipy.solvers.pyAMG import *
-                __all__.extend(pyAMG.__all__)
-                solver = "pyamg"
-                from fipy.matrices.scipyMatrix import _ScipyMeshMatrix
-                _MeshMatrix = _ScipyMeshMatrix
+                solver = _importSolver(candidate)
+                break
             except (ImportError, SerialSolverError) as inst:
                 exceptions.append(inst)
+        else:
+            import warnings
+            warnings.warn("Could not import any solver package. If you are using Trilinos, make sure you have all of the necessary Trilinos packages installed - Epetra, EpetraExt, AztecOO, Amesos, ML, and IFPACK.")
+            for inst in exceptions:
+                warnings.warn(inst.__class__.__name__ + ': ' + inst.message)
 
-                try:
-                    if _parallelComm.Nproc > 1:
-                        raise SerialSolverError('scipy')
-                    from fipy.solvers.scipy import *
-                    __all__.extend(scipy.__all__)
-                    solver = "scipy"
-                    from fipy.matrices.scipyMatrix import _ScipyMeshMatrix
-                    _MeshMatrix = _ScipyMeshMatrix
-                except (ImportError, SerialSolverError) as inst:
-                    exceptions.append(inst)
-                    import warnings
-                    warnings.warn("Could not import any solver package. If you are using Trilinos, make sure you have all of the necessary Trilinos packages installed - Epetra, EpetraExt, AztecOO, Amesos, ML, and IFPACK.")
-                    for inst in exceptions:
-                        warnings.warn(inst.__class__.__name__ + ': ' + inst.message)
-
-
-else:
-    raise ImportError, 'Unknown solver package %s' % solver
+        _cacheSolver(solver, parallel=_parallel)
 
 
 from fipy.tests.doctestPlus import register_skipper
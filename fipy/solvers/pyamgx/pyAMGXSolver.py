@@ -78,4 +78,6 @@ class PyAMGXSolver(Solver):
          if self.var.mesh.communicator.Nproc > 1:
              raise Exception("SciPy solvers cannot be used with multiple processors")
 
+         # the initial guess is overwritten in place
+         self.var._ownValue()
          self.var[:] = numerix.reshape(self._solve_(self.matrix, self.var.ravel(), numerix.array(self.RHSvector)), self.var.shape)
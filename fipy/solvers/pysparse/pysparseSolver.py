@@ -103,6 +103,8 @@ class PysparseSolver(_PysparseMatrixSolver):
         if self.var.mesh.communicator.Nproc > 1:
             raise Exception("Pysparse solvers cannot be used with multiple processors")
 
+        # the initial guess is overwritten in place
+        self.var._ownValue()
         array = self.var.numericValue.ravel()
 
         from fipy.terms import SolutionVariableNumberError
@@ -88,6 +88,8 @@ class _PysparseMatrixSolver(Solver):
             raise Exception("%ss cannot be used with multiple processors" \
                             % self.__class__)
 
+        # the initial guess is overwritten in place
+        self.var._ownValue()
         array = self.var.numericValue
         newArr = self._solve_(self.matrix, array, self.RHSvector)
 
@@ -48,6 +48,8 @@
 __docformat__ = 'restructuredtext'
 
 import os
+import hashlib
+from collections import OrderedDict
 
 from scipy.sparse.linalg import splu
 
@@ -61,8 +63,72 @@ class LinearLUSolver(_ScipySolver):
     The `LinearLUSolver` solves a linear system of equations using
     LU-factorization.  The `LinearLUSolver` is a wrapper class for the
     the Scipy `scipy.sparse.linalg.splu` moduleq.
+
+    The most recent factorizations are kept and reused whenever the
+    same solver is handed a matrix with identical structure and values,
+    so only the triangular solves are repeated for, e.g., a linear
+    problem with constant coefficients and a few alternating time steps.
+
+    >>> from fipy import *
+    >>> mesh = Grid1D(nx=10)
+    >>> var = CellVariable(mesh=mesh, value=0.)
+    >>> var.constrain(1., mesh.facesLeft)
+    >>> eq = TransientTerm() == DiffusionTerm()
+    >>> solver = LinearLUSolver(factorizations=2)
+    >>> for dt in (1., 1., 0.5, 1., 0.25):
+    ...     eq.solve(var=var, dt=dt, solver=solver)
+    >>> len(solver._LUcache)
+    2
+    >>> var1 = CellVariable(mesh=mesh, value=0.)
+    >>> var1.constrain(1., mesh.facesLeft)
+    >>> for dt in (1., 1., 0.5, 1., 0.25):
+    ...     eq.solve(var=var1, dt=dt, solver=LinearLUSolver())
+    >>> print numerix.allclose(var, var1)
+    True
     """
 
+    def __init__(self, tolerance=1e-10, iterations=1000, precon=None, factorizations=4):
+        """
+        :Parameters:
+          - `tolerance`: The required error tolerance.
+          - `iterations`: The maximum number of iterative steps to perform.
+          - `precon`: not used but maintains a common interface.
+          - `factorizations`: The number of LU factorizations to keep for
+            reuse. Set to `0` to factor the matrix on every solve.
+        """
+
+        super(LinearLUSolver, self).__init__(tolerance=tolerance, iterations=iterations, precon=precon)
+        self.factorizations = factorizations
+        self._LUcache = OrderedDict()
+
+    @staticmethod
+    def _fingerprint(A):
+        fingerprint = hashlib.sha1(repr((A.shape, A.dtype.str)))
+        for arr in (A.indptr, A.indices, A.data):
+            fingerprint.update(numerix.ascontiguousarray(arr))
+
+        return fingerprint.digest()
+
+    def _factorize(self, A):
+        if self.factorizations > 0:
+            key = self._fingerprint(A)
+            LU = self._LUcache.pop(key, None)
+        else:
+            LU = None
+
+        if LU is None:
+            LU = splu(A, diag_pivot_thresh=1.,
+                         relax=1,
+                         panel_size=10,
+                         permc_spec=3)
+
+        if self.factorizations > 0:
+            self._LUcache[key] = LU
+            while len(self._LUcache) > self.factorizations:
+                self._LUcache.popitem(last=False)
+
+        return LU
+
     def _solve_(self, L, x, b):
         diag = L.takeDiagonal()
         maxdiag = max(numerix.absolute(diag))
@@ -70,10 +136,7 @@ class LinearLUSolver(_ScipySolver):
         L = L * (1 / maxdiag)
         b = b * (1 / maxdiag)
 
-        LU = splu(L.matrix.asformat("csc"), diag_pivot_thresh=1.,
-                                            relax=1,
-                                            panel_size=10,
-                                            permc_spec=3)
+        LU = self._factorize(L.matrix.asformat("csc"))
 
         error0 = numerix.sqrt(numerix.sum((L * x - b)**2))
 
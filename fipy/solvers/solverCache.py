@@ -0,0 +1,191 @@
+"""Remember which solver suite was found in an environment
+
+When no solver suite is chosen with a command line flag or the
+`FIPY_SOLVERS` environment variable, `import fipy` tries to import Pysparse,
+Trilinos, PyAMG and SciPy in turn until one of them works. Failing to
+import a suite that is only partly installed can take several seconds, which
+adds up over many short jobs. When the `FIPY_SOLVERS_CACHE` environment
+variable names a file, the suite that was found is written there, for the
+interpreter, module search path and number of processes it was found with,
+and is imported directly the next time `FiPy` is imported in the same
+environment. Installing a package into a `site-packages` or
+`dist-packages` directory on the search path changes the environment, so a
+newly installed suite that comes earlier in the order is found, but a
+suite installed anywhere else is only found once the file is deleted.
+"""
+__docformat__ = 'restructuredtext'
+
+__all__ = []
+
+import os
+import sys
+
+def _cacheFile():
+    return os.environ.get('FIPY_SOLVERS_CACHE', None)
+
+def _packageDirectoryTimes():
+    """
+    The modification times of the `site-packages` and `dist-packages`
+    directories on the module search path, which change when a package is
+    installed in them or removed from them.
+
+    The other directories on the path, such as that of the script being
+    run, are left out, as their times change whenever a file is written
+    in them.
+    """
+    times = []
+    for path in sys.path:
+        if os.path.basename(os.path.normpath(path)) in ('site-packages', 'dist-packages'):
+            try:
+                times.append((path, os.stat(path).st_mtime))
+            except OSError:
+                pass
+    return times
+
+def _environmentKey(parallel):
+    """
+    An identifier of the interpreter, module search path, installed
+    packages and kind of run.
+
+        >>> _environmentKey(parallel=False) == _environmentKey(parallel=False)
+        True
+        >>> _environmentKey(parallel=False) == _environmentKey(parallel=True)
+        False
+
+    Installing a package changes the key
+
+        >>> import tempfile, shutil
+        >>> sitePackages = os.path.join(tempfile.mkdtemp(), 'site-packages')
+        >>> os.mkdir(sitePackages)
+        >>> sys.path.append(sitePackages)
+        >>> before = _environmentKey(parallel=False)
+        >>> os.utime(sitePackages, (0, 0))
+        >>> print _environmentKey(parallel=False) == before
+        False
+        >>> sys.path.remove(sitePackages)
+        >>> shutil.rmtree(os.path.dirname(sitePackages))
+    """
+    import hashlib
+    return hashlib.md5(repr((sys.executable, sys.version, sys.path,
+                             _packageDirectoryTimes(), parallel))).hexdigest()
+
+def _readCache(filename):
+    cache = {}
+    try:
+        f = open(filename, 'r')
+        try:
+            for line in f:
+                fields = line.split()
+                if len(fields) == 2:
+                    cache[fields[0]] = fields[1]
+        finally:
+            f.close()
+    except IOError:
+        pass
+    return cache
+
+def _cachedSolver(parallel, filename=None):
+    """
+    The solver suite found before in this environment, or `None`.
+
+        >>> import tempfile
+        >>> filename = tempfile.mktemp()
+        >>> print _cachedSolver(parallel=False, filename=filename)
+        None
+        >>> _cacheSolver("scipy", parallel=False, filename=filename)
+        >>> _cacheSolver("trilinos", parallel=True, filename=filename)
+        >>> print _cachedSolver(parallel=False, filename=filename)
+        scipy
+        >>> print _cachedSolver(parallel=True, filename=filename)
+        trilinos
+        >>> _cacheSolver(None, parallel=True, filename=filename)
+        >>> print _cachedSolver(parallel=True, filename=filename)
+        None
+        >>> print _cachedSolver(parallel=False, filename=filename)
+        scipy
+        >>> os.remove(filename)
+    """
+    filename = filename or _cacheFile()
+    if filename is None:
+        return None
+    return _readCache(filename).get(_environmentKey(parallel), None)
+
+def _cacheSolver(solver, parallel, filename=None):
+    """
+    Remember that `solver` was found in this environment, or forget what
+    was found if `solver` is `None`.
+
+    The file is replaced as a whole, so that the many processes of a
+    parallel run, or of many runs at once, never read it half written.
+    Failing to write it is not an error.
+    """
+    filename = filename or _cacheFile()
+    if filename is None:
+        return
+
+    cache = _readCache(filename)
+    key = _environmentKey(parallel)
+    if solver is None:
+        cache.pop(key, None)
+    else:
+        cache[key] = solver
+
+    try:
+        import tempfile
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(filename)))
+        f = os.fdopen(fd, 'w')
+        try:
+            for item in cache.items():
+                f.write("%s %s\n" % item)
+        finally:
+            f.close()
+        os.rename(tmp, filename)
+    except (IOError, OSError):
+        pass
+
+def _importTime(solversCache=None):
+    """
+    The seconds it takes a new interpreter to `import fipy`, the solver
+    suite it chose and whether it was taken from the cache.
+
+    A second import in the same environment finds the suite in the cache
+    and takes no longer than the `FIPY_IMPORT_BUDGET` seconds, 10 unless set
+    otherwise
+
+        >>> import tempfile
+        >>> filename = tempfile.mktemp()
+        >>> elapsed, first, cached = _importTime(solversCache=filename)
+        >>> print cached
+        False
+        >>> elapsed, second, cached = _importTime(solversCache=filename)
+        >>> print cached, second == first
+        True True
+        >>> print elapsed < float(os.environ.get('FIPY_IMPORT_BUDGET', 10.))
+        True
+        >>> os.remove(filename)
+    """
+    import subprocess
+    import fipy
+
+    env = dict(os.environ)
+    env.pop('FIPY_SOLVERS', None)
+    root = os.path.dirname(os.path.dirname(os.path.abspath(fipy.__file__)))
+    env['PYTHONPATH'] = os.pathsep.join([root] + [path for path in [env.get('PYTHONPATH')] if path])
+    if solversCache is None:
+        env.pop('FIPY_SOLVERS_CACHE', None)
+    else:
+        env['FIPY_SOLVERS_CACHE'] = solversCache
+
+    script = ("import time; start = time.time(); import fipy; "
+              "print time.time() - start, fipy.solvers.solver, fipy.solvers._cached")
+    output = subprocess.Popen([sys.executable, "-c", script], env=env,
+                              stdout=subprocess.PIPE).communicate()[0]
+    elapsed, solver, cached = output.split()[-3:]
+    return float(elapsed), solver, cached == "True"
+
+def _test():
+    import fipy.tests.doctestPlus
+    return fipy.tests.doctestPlus.testmod()
+
+if __name__ == "__main__":
+    _test()
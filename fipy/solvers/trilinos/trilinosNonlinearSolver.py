@@ -67,6 +67,7 @@ class _NOXInterface(NOX.Epetra.Interface.Required, NOX.Epetra.Interface.Jacobian
 
         self.colMap = globalMatrix.colMap
         self.domainMap = globalMatrix.domainMap
+        self.importer = globalMatrix._colImporter
 
         if self.solver.jacobian is None:
             # Define the Jacobian interface/operator
@@ -103,8 +104,7 @@ class _NOXInterface(NOX.Epetra.Interface.Required, NOX.Epetra.Interface.Jacobian
             overlappingVector = Epetra.Vector(self.colMap, self.solver.var)
 
             overlappingVector.Import(u,
-                                     Epetra.Import(self.colMap,
-                                                   self.domainMap),
+                                     self.importer,
                                      Epetra.Insert)
 
             self.solver.var.value = overlappingVector
@@ -125,8 +125,7 @@ class _NOXInterface(NOX.Epetra.Interface.Required, NOX.Epetra.Interface.Jacobian
             overlappingVector = Epetra.Vector(self.colMap, self.solver.var)
 
             overlappingVector.Import(u,
-                                     Epetra.Import(self.colMap,
-                                                   self.domainMap),
+                                     self.importer,
                                      Epetra.Insert)
 
             self.solver.var.value = overlappingVector
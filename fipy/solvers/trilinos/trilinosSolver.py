@@ -130,8 +130,7 @@ class TrilinosSolver(Solver):
                      nonOverlappingRHSvector)
 
         overlappingVector.Import(nonOverlappingVector,
-                                 Epetra.Import(globalMatrix.colMap,
-                                               globalMatrix.domainMap),
+                                 globalMatrix._colImporter,
                                  Epetra.Insert)
 
         self.var.value = numerix.reshape(numerix.array(overlappingVector), self.var.shape)
@@ -153,8 +152,7 @@ class TrilinosSolver(Solver):
 
             overlappingResidual = Epetra.Vector(globalMatrix.colMap)
             overlappingResidual.Import(residual,
-				       Epetra.Import(globalMatrix.colMap,
-						     globalMatrix.domainMap),
+				       globalMatrix._colImporter,
 				       Epetra.Insert)
 
             return overlappingResidual
@@ -46,6 +46,8 @@ __docformat__ = 'restructuredtext'
 from fipy.steppers.stepper import Stepper
 from fipy.steppers.pseudoRKQSStepper import PseudoRKQSStepper
 from fipy.steppers.pidStepper import PIDStepper
+from fipy.steppers.bdf2Stepper import BDF2Stepper
+from fipy.steppers.sdirkStepper import SDIRKStepper
 
 __all__ = ["L1error", "L2error", "LINFerror", "sweepMonotonic"]
 
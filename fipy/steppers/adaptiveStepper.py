@@ -0,0 +1,123 @@
+"""Time steppers that estimate their own local error
+
+A `Stepper` relies on its `sweepFn` to say how good a time step was. The
+steppers derived from `_AdaptiveStepper` instead integrate the equations of
+their `vardata` with a scheme that comes with an estimate of its local
+truncation error, and choose the size of each step from that estimate.
+
+Every scheme is made of backward Euler solutions of the equations as they
+are written,
+
+    TransientTerm(var=var) == F(var)
+
+where `var.old` temporarily holds the combination of previous solutions and
+stage values that the scheme calls for and the time step is a fraction of
+the actual one. The coefficient of the `TransientTerm` must therefore be
+constant in time.
+"""
+__docformat__ = 'restructuredtext'
+
+__all__ = []
+
+from fipy.steppers.stepper import Stepper
+from fipy.tools import numerix
+
+class _AdaptiveStepper(Stepper):
+    """
+    .. attention:: This class is abstract. Always create one of its subclasses.
+
+    :Parameters:
+      - `vardata`: A sequence of `(var, eqn, bcs)` tuples of the
+        `CellVariable` to solve for, with `hasOld=True`, the equation to
+        solve and its boundary conditions.
+      - `rtol`: The local error allowed in each cell, relative to the value
+        of the cell.
+      - `atol`: The absolute local error allowed in each cell.
+      - `safety`: The fraction of the step size that the error estimate
+        suggests that the next step is taken at.
+      - `facmin`: The smallest ratio between successive steps.
+      - `facmax`: The largest ratio between successive steps.
+    """
+    def __init__(self, vardata=(), rtol=1e-3, atol=1e-6, safety=0.9, facmin=0.2, facmax=5.):
+        Stepper.__init__(self, vardata=vardata)
+        self.rtol = rtol
+        self.atol = atol
+        self.safety = safety
+        self.facmin = facmin
+        self.facmax = facmax
+
+    def _values(self):
+        return [var.value.copy() for var, eqn, bcs in self.vardata]
+
+    def _setValues(self, values):
+        for (var, eqn, bcs), value in zip(self.vardata, values):
+            var.setValue(value)
+
+    def _setOldValues(self, olds):
+        for (var, eqn, bcs), old in zip(self.vardata, olds):
+            var.old.setValue(old)
+
+    def _solveImplicit(self, olds, dt, sweepFn, *args, **kwargs):
+        """Solve `(var - old) / dt = F(var)` for every variable."""
+        self._setOldValues(olds)
+        return sweepFn(vardata=self.vardata, dt=dt, *args, **kwargs)
+
+    def _errorNorm(self, errors, starts):
+        """
+        Root mean square, over every cell of every variable, of the local
+        `errors` relative to the tolerance ``atol + rtol * |value|`` of each
+        cell, where the value is the larger of the value at the start and at
+        the end of the step.
+
+            >>> from fipy import Grid1D, CellVariable
+            >>> mesh = Grid1D(nx=2)
+            >>> u = CellVariable(mesh=mesh, value=(1., 10.), hasOld=True)
+            >>> v = CellVariable(mesh=mesh, value=(0., 0.), hasOld=True)
+            >>> stepper = _AdaptiveStepper(vardata=((u, None, ()), (v, None, ())),
+            ...                            rtol=0.1, atol=0.01)
+            >>> errors = [numerix.array((0.11, 1.01)), numerix.array((0.01, -0.03))]
+            >>> starts = [numerix.array((1., 10.)), numerix.array((0., 0.))]
+            >>> print numerix.allclose(stepper._errorNorm(errors, starts),
+            ...                        numerix.sqrt((1. + 1. + 1. + 9.) / 4.))
+            True
+        """
+        scaled = []
+        for (var, eqn, bcs), error, start in zip(self.vardata, errors, starts):
+            scale = self.atol + self.rtol * numerix.maximum(abs(numerix.array(start)),
+                                                            abs(numerix.array(var.value)))
+            ids = var.mesh._localNonOverlappingCellIDs
+            scaled.append((numerix.array(error) / scale)[..., ids].ravel())
+        scaled = numerix.concatenate(scaled)
+
+        communicator = self.vardata[0][0].mesh.communicator
+        total = communicator.sum(numerix.array([[numerix.dot(scaled, scaled), len(scaled)]]), axis=0)
+        return numerix.sqrt(total[0] / max(total[1], 1))
+
+    def _resize(self, dt, error, order):
+        """
+        The step size that should make the `error` of a scheme, whose local
+        error is of `order + 1` in `dt`, equal to the tolerance.
+
+            >>> stepper = _AdaptiveStepper(safety=1.)
+            >>> print stepper._resize(dt=1., error=8., order=2)
+            0.5
+            >>> print stepper._resize(dt=1., error=0., order=2)
+            5.0
+        """
+        if error > 0:
+            factor = self.safety * error**(-1. / (order + 1))
+        else:
+            factor = self.facmax
+        return dt * min(self.facmax, max(self.facmin, factor))
+
+    def _reject(self, dt, error, order, starts, failFn, *args, **kwargs):
+        failFn(vardata=self.vardata, dt=dt, *args, **kwargs)
+        self._setValues(starts)
+        return self._lowerBound(min(self._resize(dt, error, order), self.safety * dt))
+
+def _test():
+    import fipy.tests.doctestPlus
+    return fipy.tests.doctestPlus.testmod()
+
+if __name__ == "__main__":
+    _test()
@@ -85,7 +85,7 @@ class PIDStepper(Stepper):
                 self.nrej += 1
 
                 for var, eqn, bcs in self.vardata:
-                    var.setValue(var.old)
+                    var._resetToOld()
 
                 factor = min(1. / self.error[2], 0.8)
 
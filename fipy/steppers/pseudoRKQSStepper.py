@@ -74,7 +74,7 @@ class PseudoRKQSStepper(Stepper):
 
                 # revert
                 for var, eqn, bcs in self.vardata:
-                    var.setValue(var.old)
+                    var._resetToOld()
 
                     dt = max(self.safety * dt * residual**self.pgrow, 0.1 * dt)
 
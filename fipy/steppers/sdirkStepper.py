@@ -0,0 +1,135 @@
+__docformat__ = 'restructuredtext'
+
+from fipy.steppers.adaptiveStepper import _AdaptiveStepper
+from fipy.tools import numerix
+
+__all__ = ["SDIRKStepper"]
+
+# root of 6 x**3 - 18 x**2 + 9 x - 1 that makes the scheme L-stable
+_gamma = 0.43586652150845899942
+_c2 = (1. + _gamma) / 2.
+
+class SDIRKStepper(_AdaptiveStepper):
+    r"""
+    Adaptive stepper based on the three stage, third order, L-stable,
+    singly diagonally implicit Runge-Kutta scheme of::
+
+        @article{Alexander1977,
+           author =  {R. Alexander},
+           title =   {Diagonally implicit {R}unge-{K}utta methods for stiff {O.D.E.}'s},
+           journal = {SIAM J. Numer. Anal.},
+           volume =  14,
+           year =    1977,
+           pages =   {1006-1021},
+        }
+
+    with an embedded second order solution that does not use the last
+    stage. Each stage is one backward Euler solution of the equations with
+    a time step of :math:`\gamma \Delta t`.
+
+    The solution of the decay equation :math:`\partial \phi / \partial t =
+    -\phi` has the expected accuracy
+
+        >>> from fipy import Grid1D, CellVariable, TransientTerm, ImplicitSourceTerm
+        >>> var = CellVariable(mesh=Grid1D(nx=1), value=1., hasOld=True)
+        >>> eq = TransientTerm() == -ImplicitSourceTerm(coeff=1.)
+        >>> stepper = SDIRKStepper(vardata=((var, eq, ()),), rtol=1e-5, atol=1e-8)
+        >>> dtPrev, dtTry = stepper.step(dt=2., dtTry=0.01)
+        >>> print numerix.allclose(var, numerix.exp(-2.), rtol=1e-5)
+        True
+
+    in far fewer steps than the 200 of the `dtTry` it started from
+
+        >>> print stepper.steps < 100
+        True
+
+    and does not blow up with steps much longer than the time scale of a
+    stiff problem
+
+        >>> var.value = 1.
+        >>> stiff = TransientTerm() == -ImplicitSourceTerm(coeff=1e6)
+        >>> stepper = SDIRKStepper(vardata=((var, stiff, ()),), rtol=1e-3, atol=1e-8)
+        >>> dtPrev, dtTry = stepper.step(dt=1., dtTry=1e-7)
+        >>> print abs(var.value[0]) < 1e-8, stepper.steps < 100
+        True True
+
+    The tableau is given by the class attributes `A`, `b` and `bhat`, and
+    the orders `order` and `embeddedOrder` of the two solutions, so
+    another singly diagonally implicit scheme can be used by overriding
+    them.
+    """
+
+    A = ((_gamma, 0., 0.),
+         (_c2 - _gamma, _gamma, 0.),
+         (-1.5 * _gamma**2 + 4. * _gamma - 0.25, 1.5 * _gamma**2 - 5. * _gamma + 1.25, _gamma))
+    b = A[-1]
+    # second order weights of the first two stages
+    bhat = ((_c2 - 0.5) / (_c2 - _gamma), (0.5 - _gamma) / (_c2 - _gamma), 0.)
+    order = 3
+    embeddedOrder = 2
+
+    def __init__(self, vardata=(), rtol=1e-3, atol=1e-6, safety=0.9, facmin=0.2, facmax=5.):
+        _AdaptiveStepper.__init__(self, vardata=vardata, rtol=rtol, atol=atol,
+                                  safety=safety, facmin=facmin, facmax=facmax)
+        self.steps = 0
+        self.nrej = 0
+
+    def _stages(self, dt, starts, sweepFn, *args, **kwargs):
+        """The derivative of every variable at each stage."""
+        stages = []
+        for i, row in enumerate(self.A):
+            olds = []
+            for v, start in enumerate(starts):
+                old = start.copy()
+                for a, derivatives in zip(row[:i], stages):
+                    if a != 0:
+                        old += (dt * a) * derivatives[v]
+                olds.append(old)
+
+            stageDt = row[i] * dt
+            self._solveImplicit(olds, stageDt, sweepFn, *args, **kwargs)
+
+            stages.append([(var.value - old) / stageDt
+                           for (var, eqn, bcs), old in zip(self.vardata, olds)])
+        return stages
+
+    def _combine(self, dt, starts, weights, stages):
+        values = []
+        for v, start in enumerate(starts):
+            value = numerix.array(start, dtype=float)
+            for weight, derivatives in zip(weights, stages):
+                if weight != 0:
+                    value += (dt * weight) * derivatives[v]
+            values.append(value)
+        return values
+
+    def _step(self, dt, dtPrev, sweepFn, failFn, *args, **kwargs):
+        starts = self._values()
+        stiffly = self.b == self.A[-1]
+        differences = tuple(b - bhat for b, bhat in zip(self.b, self.bhat))
+        while 1:
+            stages = self._stages(dt, starts, sweepFn, *args, **kwargs)
+            if not stiffly:
+                self._setValues(self._combine(dt, starts, self.b, stages))
+
+            errors = self._combine(dt, [numerix.zeros(start.shape) for start in starts],
+                                   differences, stages)
+            error = self._errorNorm(errors, starts)
+
+            if error > 1.:
+                self.nrej += 1
+                dt = self._reject(dt, error, self.embeddedOrder, starts, failFn, *args, **kwargs)
+            else:
+                break
+
+        self.steps += 1
+        self._setOldValues(starts)
+
+        return dt, self._resize(dt, error, self.embeddedOrder)
+
+def _test():
+    import fipy.tests.doctestPlus
+    return fipy.tests.doctestPlus.testmod()
+
+if __name__ == "__main__":
+    _test()
@@ -223,7 +223,7 @@ class _AbstractConvectionTerm(FaceTerm):
             self.constraintL = (alpha * constraintMask * exteriorCoeff).divergence * mesh.cellVolumes
             self.constraintB =  -((1 - alpha) * var.arithmeticFaceValue * constraintMask * exteriorCoeff).divergence * mesh.cellVolumes
 
-        ids = self._reshapeIDs(var, numerix.arange(mesh.numberOfCells))
+        ids = mesh.topology._reshapedCellIDs(self._vectorSize(var))
         L.addAt(numerix.array(self.constraintL).ravel(), ids.ravel(), ids.swapaxes(0,1).ravel())
         b += numerix.reshape(self.constraintB.value, ids.shape).sum(0).ravel()
 
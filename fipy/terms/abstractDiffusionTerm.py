@@ -221,24 +221,18 @@ class _AbstractDiffusionTerm(_UnaryTerm):
     def __getCoefficientMatrix(self, SparseMatrix, var, coeff):
         mesh = var.mesh
 
-        id1, id2 = mesh._adjacentCellIDs
-        interiorFaces = numerix.nonzero(mesh.interiorFaces)[0]
-
-        id1 = numerix.take(id1, interiorFaces)
-        id2 = numerix.take(id2, interiorFaces)
-
-        id1 = self._reshapeIDs(var, id1)
-        id2 = self._reshapeIDs(var, id2)
+        interiorFaces = mesh.topology._interiorFaceIDs
+        row1, row2, column1, column2 = mesh.topology._interiorFaceMatrixIDs(self._vectorSize(var))
 
 ##         print 'id1',id1
 ##         print 'id2',id2
 
         coefficientMatrix = SparseMatrix(mesh=mesh, bandwidth = mesh._maxFacesPerCell + 1)
         interiorCoeff = numerix.take(coeff, interiorFaces, axis=-1).ravel()
-        coefficientMatrix.addAt(interiorCoeff, id1.ravel(), id1.swapaxes(0,1).ravel())
-        coefficientMatrix.addAt(-interiorCoeff, id1.ravel(), id2.swapaxes(0,1).ravel())
-        coefficientMatrix.addAt(-interiorCoeff, id2.ravel(), id1.swapaxes(0,1).ravel())
-        coefficientMatrix.addAt(interiorCoeff, id2.ravel(), id2.swapaxes(0,1).ravel())
+        coefficientMatrix.addAt(interiorCoeff, row1, column1)
+        coefficientMatrix.addAt(-interiorCoeff, row1, column2)
+        coefficientMatrix.addAt(-interiorCoeff, row2, column1)
+        coefficientMatrix.addAt(interiorCoeff, row2, column2)
 
 ##         print 'coefficientMatrix',coefficientMatrix
 ##         raw_input('stopped')
@@ -358,11 +352,9 @@ class _AbstractDiffusionTerm(_UnaryTerm):
 
                 self.constraintB -= (constrainedNormalsDotCoeffOverdAP * var.arithmeticFaceValue).divergence * mesh.cellVolumes
 
-                ids = self._reshapeIDs(var, numerix.arange(mesh.numberOfCells))
-
                 self.constraintL = -constrainedNormalsDotCoeffOverdAP.divergence * mesh.cellVolumes
 
-            ids = self._reshapeIDs(var, numerix.arange(mesh.numberOfCells))
+            ids = mesh.topology._reshapedCellIDs(self._vectorSize(var))
             L.addAt(self.constraintL.ravel(), ids.ravel(), ids.swapaxes(0,1).ravel())
             b += numerix.reshape(self.constraintB.ravel(), ids.shape).sum(-2).ravel()
 
@@ -155,7 +155,7 @@ class CellTerm(_NonDiffusionTerm):
         L.addAtDiagonal(updatePyArray)
 
     def _buildMatrixNoInline_(self, L, oldArray, b, dt, coeffVectors):
-        ids = self._reshapeIDs(oldArray, numerix.arange(oldArray.shape[-1]))
+        ids = oldArray.mesh.topology._reshapedCellIDs(self._vectorSize(oldArray))
         b += (oldArray.value[numerix.newaxis] * coeffVectors['old value']).sum(-2).ravel() / dt
         b += coeffVectors['b vector'][numerix.newaxis].sum(-2).ravel()
         L.addAt(coeffVectors['new value'].ravel() / dt, ids.ravel(), ids.swapaxes(0,1).ravel())
@@ -77,17 +77,16 @@ class FaceTerm(_NonDiffusionTerm):
                                 'cell 2 offdiag': coeff * weight['cell 2 offdiag']}
         return self.coeffMatrix
 
-    def _implicitBuildMatrix_(self, SparseMatrix, L, id1, id2, b, weight, var, boundaryConditions, interiorFaces, dt):
+    def _implicitBuildMatrix_(self, SparseMatrix, L, matrixIDs, b, weight, var, boundaryConditions, interiorFaces, dt):
         mesh = var.mesh
         coeffMatrix = self._getCoeffMatrix_(var, weight)
 
-        id1 = self._reshapeIDs(var, id1)
-        id2 = self._reshapeIDs(var, id2)
+        row1, row2, column1, column2 = matrixIDs
 
-        L.addAt(numerix.take(coeffMatrix['cell 1 diag'], interiorFaces, axis=-1).ravel(), id1.ravel(), id1.swapaxes(0,1).ravel())
-        L.addAt(numerix.take(coeffMatrix['cell 1 offdiag'], interiorFaces, axis=-1).ravel(), id1.ravel(), id2.swapaxes(0,1).ravel())
-        L.addAt(numerix.take(coeffMatrix['cell 2 offdiag'], interiorFaces, axis=-1).ravel(), id2.ravel(), id1.swapaxes(0,1).ravel())
-        L.addAt(numerix.take(coeffMatrix['cell 2 diag'], interiorFaces, axis=-1).ravel(), id2.ravel(), id2.swapaxes(0,1).ravel())
+        L.addAt(numerix.take(coeffMatrix['cell 1 diag'], interiorFaces, axis=-1).ravel(), row1, column1)
+        L.addAt(numerix.take(coeffMatrix['cell 1 offdiag'], interiorFaces, axis=-1).ravel(), row1, column2)
+        L.addAt(numerix.take(coeffMatrix['cell 2 offdiag'], interiorFaces, axis=-1).ravel(), row2, column1)
+        L.addAt(numerix.take(coeffMatrix['cell 2 diag'], interiorFaces, axis=-1).ravel(), row2, column2)
 
         N = mesh.numberOfCells
         M = mesh._maxFacesPerCell
@@ -176,11 +175,8 @@ class FaceTerm(_NonDiffusionTerm):
         """Implicit portion considers
         """
         mesh = var.mesh
-        id1, id2 = mesh._adjacentCellIDs
-        interiorFaces = numerix.nonzero(mesh.interiorFaces)[0]
-
-        id1 = numerix.take(id1, interiorFaces)
-        id2 = numerix.take(id2, interiorFaces)
+        id1, id2 = mesh.topology._interiorFaceCellIDs
+        interiorFaces = mesh.topology._interiorFaceIDs
 
         b = numerix.zeros(var.shape,'d').ravel()
         L = SparseMatrix(mesh=mesh)
@@ -188,7 +184,8 @@ class FaceTerm(_NonDiffusionTerm):
         weight = self._getWeight(var, transientGeomCoeff, diffusionGeomCoeff)
 
         if 'implicit' in weight:
-            self._implicitBuildMatrix_(SparseMatrix, L, id1, id2, b, weight['implicit'], var, boundaryConditions, interiorFaces, dt)
+            matrixIDs = mesh.topology._interiorFaceMatrixIDs(self._vectorSize(var))
+            self._implicitBuildMatrix_(SparseMatrix, L, matrixIDs, b, weight['implicit'], var, boundaryConditions, interiorFaces, dt)
 
         if 'explicit' in weight:
             self._explicitBuildMatrix_(SparseMatrix, var.old, id1, id2, b, weight['explicit'], var, boundaryConditions, interiorFaces, dt)
@@ -124,9 +124,6 @@ class Term(object):
     def _buildExplcitIfOther(self):
         raise NotImplementedError
 
-    def _reshapeIDs(self, var, ids):
-        raise NotImplementedError
-
     def _vectorSize(self, var=None):
         if var is None or var.rank != 1:
             return 1
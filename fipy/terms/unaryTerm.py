@@ -131,14 +131,6 @@ class _UnaryTerm(Term):
 
         return (var, matrix, RHSvector)
 
-    def _reshapeIDs(self, var, ids):
-        shape = (self._vectorSize(var), self._vectorSize(var), ids.shape[-1])
-        ids = numerix.resize(ids, shape)
-        X, Y =  numerix.indices(shape[:-1])
-        X *= var.mesh.numberOfCells
-        ids += X[...,numerix.newaxis]
-        return ids
-
     def _getDefaultSolver(self, var, solver, *args, **kwargs):
         if solver and not solver._canSolveAsymmetric():
             import warnings
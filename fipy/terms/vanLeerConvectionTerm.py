@@ -76,7 +76,7 @@ class VanLeerConvectionTerm(ExplicitUpwindConvectionTerm):
 
         mesh = oldArray.mesh
 
-        interiorIDs = numerix.nonzero(mesh.interiorFaces)[0]
+        interiorIDs = mesh.topology._interiorFaceIDs
         interiorFaceAreas = numerix.take(mesh._faceAreas, interiorIDs)
         interiorFaceNormals = numerix.take(mesh._orientedFaceNormals, interiorIDs, axis=-1)
 
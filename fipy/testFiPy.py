@@ -59,6 +59,7 @@ def _suite():
         'meshes.test',
         'variables.test',
         'viewers.test',
+        'steppers.test',
 	'boundaryConditions.test',
     ), base = __name__)
 
@@ -0,0 +1,202 @@
+"""Values of the cells or faces of a mesh distributed among processes
+
+Each process owns some of the elements of a parallel mesh and holds ghost
+copies of some elements owned by its neighbors. A `_Distribution` gathers
+the global IDs of the elements owned by every process only once, and uses
+them to assemble the values of every process, on every process or only on
+one, to look up individual global elements by a parallel sum, and to update
+the ghost values of a process from the processes that own them by
+exchanging messages with those neighbors only.
+"""
+__docformat__ = 'restructuredtext'
+
+__all__ = []
+
+from fipy.tools import numerix
+
+class _Distribution(object):
+    """
+    :Parameters:
+      - `communicator`: The processes the elements are distributed among.
+      - `localIDs`: The local IDs of the elements owned by this process.
+      - `globalIDs`: The global IDs of the elements owned by this process.
+      - `overlappingGlobalIDs`: The global IDs of all the local elements of
+        this process, ghosts included, in local order.
+    """
+    def __init__(self, communicator, localIDs, globalIDs, overlappingGlobalIDs):
+        self.communicator = communicator
+        self.localIDs = numerix.asarray(localIDs)
+        self.globalIDs = numerix.asarray(globalIDs)
+        self.overlappingGlobalIDs = numerix.asarray(overlappingGlobalIDs)
+
+    @property
+    def _gathered(self):
+        """The global IDs owned by each process, concatenated in order of
+        rank, and how many of them each process owns."""
+        if not hasattr(self, '_gatheredCache'):
+            gathered = self.communicator.allgather(self.globalIDs)
+            self._gatheredCache = (numerix.concatenate(gathered),
+                                   numerix.array([len(ids) for ids in gathered]))
+        return self._gatheredCache
+
+    def _owned(self, localValue):
+        if localValue.shape[-1] != 0:
+            localValue = localValue[..., self.localIDs]
+        return localValue
+
+    def _assemble(self, values):
+        """Place the `values` owned by each process at their global IDs
+
+            >>> from fipy.tools import serialComm
+            >>> distribution = _Distribution(serialComm, localIDs=[0, 1],
+            ...                              globalIDs=[2, 0], overlappingGlobalIDs=[2, 0])
+            >>> distribution._gatheredCache = (numerix.array([2, 0, 1]), numerix.array([2, 1]))
+            >>> print distribution._assemble([numerix.array([[20., 0.]]), numerix.array([[10.]])])
+            [[  0.  10.  20.]]
+        """
+        gatheredIDs, counts = self._gathered
+        values = numerix.concatenate(values, axis=-1)
+        globalValue = numerix.empty(values.shape[:-1] + (max(gatheredIDs) + 1,),
+                                    dtype=numerix.obj2sctype(values))
+        globalValue[..., gatheredIDs] = values
+        return globalValue
+
+    def allgather(self, localValue):
+        """The values of all processes, on every process."""
+        if self.communicator.Nproc == 1:
+            return localValue
+        return self._assemble(self.communicator.allgather(self._owned(localValue)))
+
+    def gather(self, localValue, root=0):
+        """The values of all processes on `root`, and `None` on every other
+        process."""
+        if self.communicator.Nproc == 1:
+            return localValue
+        values = self.communicator.gather(self._owned(localValue), root=root)
+        if self.communicator.procID == root:
+            return self._assemble(values)
+        else:
+            return None
+
+    def _ownedPositions(self, ids):
+        """Local positions of the global `ids` among the elements owned by
+        this process, or -1 for those owned by other processes.
+
+            >>> from fipy.tools import serialComm
+            >>> distribution = _Distribution(serialComm, localIDs=[1, 2],
+            ...                              globalIDs=[7, 3], overlappingGlobalIDs=[5, 7, 3])
+            >>> print distribution._ownedPositions(numerix.array([3, 5, 7, 9]))
+            [ 2 -1  1 -1]
+        """
+        if not hasattr(self, '_ownedOrder'):
+            self._ownedOrder = numerix.argsort(self.globalIDs)
+        order = self._ownedOrder
+        sortedIDs = self.globalIDs[order]
+        if len(sortedIDs) == 0:
+            return -numerix.ones(ids.shape, dtype=numerix.INT_DTYPE)
+        found = numerix.minimum(numerix.searchsorted(sortedIDs, ids), len(sortedIDs) - 1)
+        return numerix.where(sortedIDs[found] == ids, self.localIDs[order[found]], -1)
+
+    def take(self, localValue, ids):
+        """The values of the elements with global `ids`.
+
+        Each process contributes the values of the elements it owns and the
+        contributions are summed, so no process needs to hold the values of
+        every element.
+        """
+        ids = numerix.asarray(ids)
+        if self.communicator.Nproc == 1:
+            return localValue[..., ids]
+
+        if not isinstance(localValue, numerix.ndarray) or localValue.dtype.kind != 'f':
+            return self.allgather(localValue)[..., ids]
+
+        positions = self._ownedPositions(ids)
+        mine = positions >= 0
+        taken = numerix.zeros(localValue.shape[:-1] + ids.shape, dtype=localValue.dtype)
+        taken[..., mine] = localValue[..., positions[mine]]
+        summed = self.communicator.sum(taken.reshape((1, -1)), axis=0)
+        return numerix.reshape(summed, taken.shape)
+
+    @staticmethod
+    def _calcExchangePlan(procID, owners, ghostIDs, overlappingGlobalIDs):
+        """
+        The local IDs of the ghosts that each neighbor sends to this process
+        and of the owned elements that this process sends to each neighbor.
+
+        Two processes that share the 6 cells of a `Grid1D` with an overlap of
+        2 each send 2 cells to the other
+
+            >>> from fipy import Grid1D
+            >>> from fipy.tools.comms.dummyComm import DummyComm
+            >>> class _Comm(DummyComm):
+            ...     def __init__(self, procID, Nproc):
+            ...         self._procID, self._Nproc = procID, Nproc
+            ...     procID = property(lambda self: self._procID)
+            ...     Nproc = property(lambda self: self._Nproc)
+            >>> meshes = [Grid1D(nx=6, communicator=_Comm(procID, 2)) for procID in range(2)]
+            >>> owners = numerix.zeros((6,), dtype=int)
+            >>> for procID, mesh in enumerate(meshes):
+            ...     owners[mesh._globalNonOverlappingCellIDs] = procID
+            >>> ghostIDs = [numerix.setdiff1d(mesh._globalOverlappingCellIDs,
+            ...                               mesh._globalNonOverlappingCellIDs) for mesh in meshes]
+            >>> for procID, mesh in enumerate(meshes):
+            ...     receives, sends = _Distribution._calcExchangePlan(procID, owners, ghostIDs,
+            ...                                                       mesh._globalOverlappingCellIDs)
+            ...     print mesh._globalOverlappingCellIDs, receives, sends
+            [0 1 2 3 4] {1: array([3, 4])} {1: array([1, 2])}
+            [1 2 3 4 5] {0: array([0, 1])} {0: array([2, 3])}
+        """
+        order = numerix.argsort(overlappingGlobalIDs)
+
+        def local(ids):
+            return order[numerix.searchsorted(overlappingGlobalIDs[order], ids)]
+
+        receives = {}
+        sends = {}
+        for rank, ghosts in enumerate(ghostIDs):
+            ghostOwners = owners[ghosts]
+            if rank == procID:
+                for source in numerix.unique(ghostOwners):
+                    receives[int(source)] = local(ghosts[ghostOwners == source])
+            else:
+                wanted = ghosts[ghostOwners == procID]
+                if len(wanted) > 0:
+                    sends[rank] = local(wanted)
+
+        return receives, sends
+
+    @property
+    def _exchangePlan(self):
+        if not hasattr(self, '_exchangePlanCache'):
+            gatheredIDs, counts = self._gathered
+            owners = numerix.zeros((max(gatheredIDs) + 1,), dtype=numerix.INT_DTYPE)
+            owners[gatheredIDs] = numerix.repeat(numerix.arange(len(counts)), counts)
+
+            ghosts = numerix.ones(self.overlappingGlobalIDs.shape, dtype=bool)
+            ghosts[self.localIDs] = False
+            ghostIDs = self.communicator.allgather(self.overlappingGlobalIDs[ghosts])
+
+            self._exchangePlanCache = self._calcExchangePlan(self.communicator.procID, owners,
+                                                             ghostIDs, self.overlappingGlobalIDs)
+        return self._exchangePlanCache
+
+    def exchange(self, localValue):
+        """Overwrite the ghost values in `localValue` with the values of the
+        processes that own them, in place."""
+        if self.communicator.Nproc > 1:
+            receives, sends = self._exchangePlan
+            requests = [self.communicator.isend(localValue[..., ids], dest=rank)
+                        for rank, ids in sends.items()]
+            for rank, ids in receives.items():
+                localValue[..., ids] = self.communicator.recv(source=rank)
+            for request in requests:
+                request.wait()
+        return localValue
+
+def _test():
+    import fipy.tests.doctestPlus
+    return fipy.tests.doctestPlus.testmod()
+
+if __name__ == "__main__":
+    _test()
@@ -94,3 +94,17 @@ class Mpi4pyCommWrapper(CommWrapper):
 
         """
         return self.mpi4py_comm.allgather(sendobj=obj)
+
+    def gather(self, obj, root=0):
+        """mpi4py gather
+
+        Like `allgather`, but only `root` receives the list of objects;
+        every other rank gets `None`.
+        """
+        return self.mpi4py_comm.gather(sendobj=obj, root=root)
+
+    def isend(self, obj, dest, tag=0):
+        return self.mpi4py_comm.isend(obj, dest=dest, tag=tag)
+
+    def recv(self, source, tag=0):
+        return self.mpi4py_comm.recv(source=source, tag=tag)
@@ -0,0 +1,222 @@
+"""Counter-based random numbers
+
+The samples of a `CounterRandom` generator are a pure function of a key,
+the index of each element (e.g., the global ID of a cell) and a counter, so
+any subset of the elements can be generated independently of the rest. Every
+process of a parallel run draws exactly the values of its own cells, cells
+shared by several processes receive the same values on each of them, and the
+result does not depend on how the mesh is partitioned.
+
+The bits are produced by the Philox4x32-10 bijection of Salmon *et al.*,
+"Parallel random numbers: as easy as 1, 2, 3", SC '11.
+"""
+__docformat__ = 'restructuredtext'
+
+__all__ = ["CounterRandom"]
+
+from fipy.tools import numerix
+
+_mask32 = 0xFFFFFFFF
+# NumPy promotes mixed uint64 and int64 operands to float64
+_uint64Mask32 = numerix.uint64(_mask32)
+_uint64Shift32 = numerix.uint64(32)
+
+_philoxM0 = 0xD2511F53
+_philoxM1 = 0xCD9E8D57
+_philoxW0 = 0x9E3779B9
+_philoxW1 = 0xBB67AE85
+
+def _philox4x32(counter, key, rounds=10):
+    """
+    Encrypt the four 32 bit words of `counter` with the two 32 bit words of `key`.
+
+    The known answers of the reference implementation
+
+        >>> def hexify(words):
+        ...     print " ".join(["%08x" % w for w in words])
+        >>> hexify(_philox4x32([0, 0, 0, 0], [0, 0]))
+        6627e8d5 e169c58d bc57ac4c 9b00dbd8
+        >>> hexify(_philox4x32([0xffffffff] * 4, [0xffffffff] * 2))
+        408f276d 41c83b0e a20bc7c6 6d5451fd
+        >>> hexify(_philox4x32([0x243f6a88, 0x85a308d3, 0x13198a2e, 0x03707344],
+        ...                    [0xa4093822, 0x299f31d0]))
+        d16cfe09 94fdcceb 5001e420 24126ea1
+
+    Each word of `counter` may be an array, and the blocks of an array are
+    encrypted independently of one another
+
+        >>> ids = numerix.arange(4, dtype=numerix.uint64)
+        >>> blocks = _philox4x32([ids, 0, 0, 0], [0, 0])
+        >>> hexify([word[0] for word in blocks])
+        6627e8d5 e169c58d bc57ac4c 9b00dbd8
+        >>> print [word[2] for word in blocks] == list(_philox4x32([2, 0, 0, 0], [0, 0]))
+        True
+    """
+    c0, c1, c2, c3 = numerix.broadcast_arrays(*[numerix.asarray(word, dtype=numerix.uint64) & _uint64Mask32
+                                                for word in counter])
+    k0, k1 = [int(word) & _mask32 for word in key]
+    m0 = numerix.uint64(_philoxM0)
+    m1 = numerix.uint64(_philoxM1)
+    for r in range(rounds):
+        lo0 = m0 * c0
+        lo1 = m1 * c2
+        c0 = lo1 >> _uint64Shift32
+        c0 ^= c1
+        c0 ^= numerix.uint64(k0)
+        c2 = lo0 >> _uint64Shift32
+        c2 ^= c3
+        c2 ^= numerix.uint64(k1)
+        lo1 &= _uint64Mask32
+        lo0 &= _uint64Mask32
+        c1, c3 = lo1, lo0
+        k0 = (k0 + _philoxW0) & _mask32
+        k1 = (k1 + _philoxW1) & _mask32
+    return c0, c1, c2, c3
+
+class CounterRandom(object):
+    """
+    Random samples indexed by `ids`.
+
+    Successive calls draw new streams of values, so the `n`-th call of a
+    generator returns the same values as the `n`-th call of any other
+    generator with the same `seed` and `counter`, for whichever of the `ids`
+    they have in common.
+
+        >>> ids = numerix.arange(10)
+        >>> whole = CounterRandom(seed=7, counter=3, ids=ids)
+        >>> part = CounterRandom(seed=7, counter=3, ids=ids[6:])
+        >>> for draw in ("uniform", "normal", "exponential"):
+        ...     print numerix.all(getattr(whole, draw)()[6:] == getattr(part, draw)())
+        True
+        True
+        True
+        >>> print numerix.all(whole.gamma(shape=0.5)[6:] == part.gamma(shape=0.5))
+        True
+        >>> print numerix.all(whole.beta(a=2., b=numerix.arange(1., 11.))[6:]
+        ...                   == part.beta(a=2., b=numerix.arange(7., 11.)))
+        True
+
+    Samples differ with the `seed` and with the `counter`
+
+        >>> print numerix.any(CounterRandom(seed=7, counter=4, ids=ids).uniform()
+        ...                   == CounterRandom(seed=7, counter=3, ids=ids).uniform())
+        False
+        >>> print numerix.any(CounterRandom(seed=8, counter=3, ids=ids).uniform()
+        ...                   == CounterRandom(seed=7, counter=3, ids=ids).uniform())
+        False
+
+    and are distributed as expected
+
+        >>> many = CounterRandom(seed=0, counter=0, ids=numerix.arange(100000))
+        >>> u = many.uniform(-1., 1.)
+        >>> print (u.min() > -1.) and (u.max() < 1.) and abs(u.mean()) < 0.01
+        True
+        >>> n = many.normal(loc=1., scale=2.)
+        >>> print abs(n.mean() - 1.) < 0.03, abs(n.std() - 2.) < 0.03
+        True True
+        >>> e = many.exponential(scale=3.)
+        >>> print e.min() > 0, abs(e.mean() - 3.) < 0.05
+        True True
+        >>> for shape in (0.3, 1., 4.5):
+        ...     g = many.gamma(shape=shape, scale=2.)
+        ...     print abs(g.mean() / (shape * 2.) - 1.) < 0.02, abs(g.var() / (shape * 4.) - 1.) < 0.05
+        True True
+        True True
+        True True
+        >>> b = many.beta(a=2., b=5.)
+        >>> print abs(b.mean() - 2. / 7.) < 0.005
+        True
+
+    :Parameters:
+      - `seed`: A non-negative integer of at most 64 bits that selects the sequence.
+      - `counter`: A non-negative integer of at most 32 bits, typically the
+        number of times the samples have been regenerated.
+      - `ids`: The non-negative integer index of each sample.
+    """
+    def __init__(self, seed, counter, ids):
+        self.key = (int(seed) & _mask32, (int(seed) >> 32) & _mask32)
+        self.counter = int(counter) & _mask32
+        self.ids = numerix.asarray(ids, dtype=numerix.uint64)
+        self.stream = 0
+
+    def _nextStream(self):
+        self.stream += 1
+        return self.stream - 1
+
+    def _uniformPair(self, stream, draw, index=None):
+        """Two uniform samples in (0, 1) of each of `ids[index]`"""
+        ids = self.ids
+        if index is not None:
+            ids = ids[index]
+        words = _philox4x32((ids & _uint64Mask32, ids >> _uint64Shift32, self.counter, (stream << 16) | draw),
+                            self.key)
+        # 53 random bits per sample, offset to stay clear of 0 and 1
+        samples = []
+        for hi, lo in (words[:2], words[2:]):
+            hi >>= numerix.uint64(5)
+            hi <<= numerix.uint64(26)
+            lo >>= numerix.uint64(6)
+            hi |= lo
+            sample = hi.astype(float)
+            sample += 0.5
+            sample *= 2.**-53
+            samples.append(sample)
+        return samples
+
+    def _normal(self, stream, draw, index=None):
+        u1, u2 = self._uniformPair(stream, draw, index)
+        return numerix.sqrt(-2. * numerix.log(u1)) * numerix.cos(2. * numerix.pi * u2)
+
+    def uniform(self, low=0., high=1.):
+        return low + (high - low) * self._uniformPair(self._nextStream(), 0)[0]
+
+    def normal(self, loc=0., scale=1.):
+        return loc + scale * self._normal(self._nextStream(), 0)
+
+    def exponential(self, scale=1.):
+        return -scale * numerix.log(self._uniformPair(self._nextStream(), 0)[0])
+
+    def gamma(self, shape, scale=1.):
+        """
+        Gamma distributed samples, by the rejection method of Marsaglia and
+        Tsang, "A simple method for generating gamma variables", ACM TOMS 26
+        (2000). Each attempt uses values of its own, so the outcome for a
+        sample does not depend on how many attempts any other sample needs.
+        """
+        stream = self._nextStream()
+        shape = numerix.array(shape, dtype=float) * numerix.ones(self.ids.shape)
+        boost = shape < 1.
+        d = numerix.where(boost, shape + 1., shape) - 1. / 3.
+        c = 1. / numerix.sqrt(9. * d)
+
+        samples = numerix.empty(self.ids.shape)
+        pending = numerix.arange(len(self.ids))
+        draw = 1
+        while len(pending) > 0:
+            x = self._normal(stream, draw, pending)
+            u = self._uniformPair(stream, draw + 1, pending)[0]
+            draw += 2
+            v = (1. + c[pending] * x)**3
+            with numerix.errstate(invalid='ignore', divide='ignore'):
+                accept = (v > 0.) & (numerix.log(u) < 0.5 * x**2 + d[pending] * (1. - v + numerix.log(v)))
+            samples[pending[accept]] = d[pending[accept]] * v[accept]
+            pending = pending[~accept]
+
+        if boost.any():
+            u = self._uniformPair(stream, 0)[0]
+            with numerix.errstate(divide='ignore'):
+                samples[boost] *= u[boost]**(1. / shape[boost])
+
+        return samples * scale
+
+    def beta(self, a, b):
+        x = self.gamma(shape=a)
+        y = self.gamma(shape=b)
+        return x / (x + y)
+
+def _test():
+    import fipy.tests.doctestPlus
+    return fipy.tests.doctestPlus.testmod()
+
+if __name__ == "__main__":
+    _test()
@@ -48,13 +48,16 @@
 __docformat__ = 'restructuredtext'
 
 import cPickle
+import hashlib
 import os
 import sys
 import gzip
+import struct
 
+from fipy.tools import numerix
 from fipy.tools import parallelComm
 
-__all__ = ["write", "read"]
+__all__ = ["write", "read", "writeCheckpoint", "readCheckpoint", "FieldArchive"]
 
 # TODO: add test to show that round trip pickle of mesh doesn't work properly
 # FIXME: pickle fails to work properly on numpy 1.1 (run gapFillMesh.py)
@@ -161,6 +164,716 @@ def read(filename, fileobject=None, communicator=parallelComm, mesh_unmangle=Fal
 
     return unpickler.load()
 
+_checkpointMagic = "FIPYCKPT"
+_checkpointVersion = 1
+_checkpointAlignment = 64
+
+class _CheckpointArray(object):
+    """Placeholder, in a checkpoint header, for a raw binary array.
+
+    :Parameters:
+      - `offset`: Position of the array, in bytes, after the header.
+      - `dtype`: Type of the array elements.
+      - `shape`: Shape of the array.
+      - `mask`: `_CheckpointArray` of a masked array's mask, if any.
+    """
+    def __init__(self, offset, dtype, shape, mask=None):
+        self.offset = offset
+        self.dtype = numerix.dtype(dtype).str
+        self.shape = tuple(shape)
+        self.mask = mask
+
+    @property
+    def nbytes(self):
+        return numerix.dtype(self.dtype).itemsize * int(numerix.prod(self.shape))
+
+    def memmap(self, filename, dataStart, mode='r'):
+        if self.nbytes == 0:
+            return numerix.zeros(self.shape, dtype=self.dtype)
+        else:
+            return numerix.memmap(filename, dtype=self.dtype, mode=mode,
+                                  offset=dataStart + self.offset, shape=self.shape)
+
+    def read(self, filename, dataStart):
+        arr = numerix.array(self.memmap(filename, dataStart))
+        if self.mask is not None:
+            arr = numerix.MA.array(arr, mask=self.mask.read(filename, dataStart))
+        return arr
+
+def _align(nbytes):
+    return -(-nbytes // _checkpointAlignment) * _checkpointAlignment
+
+def _globalMeshState(mesh, communicator):
+    """
+    The state of `mesh`, which must be the same on every processor for the
+    processor that saves it to save the whole mesh. A `Grid` holds the
+    same description on every processor, but a parallel `Gmsh2D` or a
+    part from `partitionMesh` only holds the cells of its own processor.
+
+        >>> from fipy import Grid2D
+        >>> from fipy.meshes.meshPartitioner import partitionMesh
+        >>> from fipy.tools.comms.dummyComm import DummyComm
+        >>> class _Comm(DummyComm):
+        ...     shared = {}
+        ...     def __init__(self, procID):
+        ...         self._procID = procID
+        ...     procID = property(lambda self: self._procID)
+        ...     Nproc = 2
+        ...     def bcast(self, obj, root=0):
+        ...         if self.procID == root:
+        ...             _Comm.shared[root] = obj
+        ...         return _Comm.shared[root]
+        >>> whole = Grid2D(nx=4, ny=1)
+        >>> print _globalMeshState(whole, _Comm(0)) == _globalMeshState(whole, _Comm(1))
+        True
+        >>> parts = [partitionMesh(whole, communicator=_Comm(procID), overlap=0)
+        ...          for procID in range(2)]
+        >>> print sorted(_globalMeshState(parts[0], _Comm(0)).keys())
+        ['_RepresentationClass', 'cellFaceIDs', 'faceVertexIDs', 'vertexCoords']
+        >>> _globalMeshState(parts[1], _Comm(1))
+        Traceback (most recent call last):
+            ...
+        ValueError: the mesh is not the same on every processor, so it cannot be saved
+    """
+    state = mesh.__getstate__()
+    if communicator.Nproc > 1:
+        digest = hashlib.md5(cPickle.dumps(state, 2)).hexdigest()
+        same = digest == communicator.bcast(digest, root=0)
+        if not communicator.all(numerix.array(same)):
+            raise ValueError("the mesh is not the same on every processor, so it cannot be saved")
+    return state
+
+def writeCheckpoint(variables, filename, communicator=parallelComm):
+    """
+    Write `CellVariable` and `FaceVariable` objects, and the mesh they share,
+    to a binary checkpoint file.
+
+    Unlike `write()`, the mesh arrays and each variable's `value` and `old`
+    are stored as raw, aligned binary arrays following a small pickled
+    header. In parallel, each processor writes its own non-overlapping
+    elements in place, so no global array is gathered. The mesh must
+    therefore be the same on every processor, as a `Grid` is.
+
+    :Parameters:
+      - `variables`: A `dict` of the variables to save, keyed by name.
+      - `filename`: The name of the checkpoint file.
+      - `communicator`: Object with `procID` and `Nproc` attributes.
+
+    A checkpoint is restored with `readCheckpoint()`, which memory-maps
+    the file and reads only the elements needed by each processor.
+
+        >>> import tempfile
+        >>> from fipy import Grid2D, CellVariable, FaceVariable
+        >>> mesh = Grid2D(nx=3, ny=2) + ((3,), (0,))
+        >>> x, y = mesh.cellCenters
+        >>> phi = CellVariable(mesh=mesh, name="phi", value=x * y, hasOld=True)
+        >>> phi.updateOld()
+        >>> phi.setValue(-phi)
+        >>> flux = FaceVariable(mesh=mesh, rank=1, value=mesh.faceCenters)
+        >>> (f, filename) = tempfile.mkstemp('.ckpt')
+        >>> writeCheckpoint(dict(phi=phi, flux=flux), filename)
+        >>> restored = readCheckpoint(filename)
+        >>> print sorted(restored.keys())
+        ['flux', 'phi']
+        >>> print restored['phi'].name, restored['phi'].mesh.__class__.__name__
+        phi UniformGrid2D
+        >>> print numerix.allequal(restored['phi'].mesh.cellCenters, mesh.cellCenters)
+        True
+        >>> print numerix.allequal(restored['phi'], phi)
+        True
+        >>> print numerix.allequal(restored['phi'].old, phi.old)
+        True
+        >>> print restored['flux'].shape == flux.shape
+        True
+        >>> print numerix.allequal(restored['flux'], flux)
+        True
+
+    The variables can also be restored onto an existing mesh
+
+        >>> restored = readCheckpoint(filename, mesh=mesh)
+        >>> print restored['phi'].mesh is mesh
+        True
+
+    Only variables defined on a single mesh can be saved
+
+        >>> writeCheckpoint(dict(phi=phi, other=CellVariable(mesh=Grid2D(nx=3, ny=2))), filename)
+        Traceback (most recent call last):
+            ...
+        ValueError: all variables in a checkpoint must share one mesh
+
+        >>> os.close(f)
+        >>> os.remove(filename)
+    """
+    meshes = set([var.mesh for var in variables.values()])
+    if len(meshes) != 1:
+        raise ValueError("all variables in a checkpoint must share one mesh")
+    mesh = meshes.pop()
+
+    arrays = []
+    nbytes = [0]
+
+    def reserve(arr, shape=None):
+        if shape is None:
+            shape = arr.shape
+        record = _CheckpointArray(offset=nbytes[0], dtype=arr.dtype, shape=shape)
+        nbytes[0] += _align(record.nbytes)
+        arrays.append((record, arr))
+        if isinstance(arr, numerix.MA.MaskedArray):
+            record.mask = reserve(numerix.MA.getmaskarray(arr))
+        return record
+
+    meshState = _globalMeshState(mesh, communicator).copy()
+    for key, value in meshState.items():
+        if isinstance(value, numerix.ndarray):
+            meshState[key] = reserve(value)
+    # mesh arrays are the same on all processors
+    meshArrays = list(arrays)
+
+    records = []
+    for name, var in sorted(variables.items()):
+        value = numerix.asarray(var.value)
+        record = dict(name=name,
+                      variableClass=var._getArithmeticBaseClass(),
+                      variableName=var.name,
+                      unit=var.unit,
+                      elementshape=var.elementshape,
+                      value=reserve(value, shape=value.shape[:-1] + (var._globalNumberOfElements,)),
+                      old=None)
+        if getattr(var, "_old", None) is not None:
+            old = numerix.asarray(var.old.value)
+            record["old"] = reserve(old, shape=old.shape[:-1] + (var._globalNumberOfElements,))
+        records.append(record)
+
+    header = cPickle.dumps(dict(meshClass=mesh.__class__,
+                                meshState=meshState,
+                                variables=records), 2)
+    dataStart = _align(len(_checkpointMagic) + 2 * 8 + len(header))
+
+    # the variables are written where the header of the first processor
+    # says they are
+    dataStart, records = communicator.bcast((dataStart, records), root=0)
+
+    if communicator.procID == 0:
+        fileStream = open(filename, mode='wb')
+        fileStream.write(_checkpointMagic)
+        fileStream.write(struct.pack("<QQ", _checkpointVersion, len(header)))
+        fileStream.write(header)
+        for record, arr in meshArrays:
+            fileStream.seek(dataStart + record.offset)
+            numerix.ascontiguousarray(arr).tofile(fileStream)
+        fileStream.truncate(dataStart + nbytes[0])
+        fileStream.close()
+
+    communicator.Barrier()
+
+    # each processor writes its own part of the variables, unbuffered, as
+    # runs of consecutive elements that no other processor writes to
+    fileStream = open(filename, mode='r+b', buffering=0)
+    try:
+        for name, var in sorted(variables.items()):
+            record = [r for r in records if r["name"] == name][0]
+            for key in ("value", "old"):
+                if record[key] is None or record[key].nbytes == 0:
+                    continue
+                _writeRuns(fileStream, dataStart + record[key].offset, record[key],
+                           numerix.asarray(getattr(var, key))[..., var._localNonOverlappingIDs],
+                           numerix.asarray(var._globalNonOverlappingIDs))
+    finally:
+        fileStream.close()
+
+    communicator.Barrier()
+
+def _writeRuns(fileStream, start, record, values, globalIDs):
+    """
+    Write `values` at `globalIDs` of the last axis of the array of `record`,
+    which starts at `start`, with one write for each run of consecutive
+    IDs in each row.
+
+        >>> import tempfile
+        >>> (f, filename) = tempfile.mkstemp()
+        >>> record = _CheckpointArray(offset=0, dtype=float, shape=(2, 6))
+        >>> fileStream = open(filename, mode='w+b')
+        >>> fileStream.truncate(record.nbytes)
+        >>> _writeRuns(fileStream, 0, record, numerix.array([[1., 2., 3.], [4., 5., 6.]]),
+        ...            numerix.array([5, 1, 2]))
+        >>> fileStream.close()
+        >>> print record.read(filename, 0)
+        [[ 0.  2.  3.  0.  0.  1.]
+         [ 0.  5.  6.  0.  0.  4.]]
+        >>> os.close(f)
+        >>> os.remove(filename)
+    """
+    if len(globalIDs) == 0:
+        return
+    order = numerix.argsort(globalIDs)
+    globalIDs = globalIDs[order]
+    values = numerix.asarray(values, dtype=record.dtype)[..., order]
+    values = values.reshape((-1, len(globalIDs)))
+
+    breaks = numerix.nonzero(globalIDs[1:] != globalIDs[:-1] + 1)[0] + 1
+    firsts = numerix.concatenate(([0], breaks))
+    lasts = numerix.concatenate((breaks, [len(globalIDs)]))
+
+    itemsize = numerix.dtype(record.dtype).itemsize
+    count = record.shape[-1]
+    for row, rowValues in enumerate(values):
+        for first, last in zip(firsts, lasts):
+            fileStream.seek(start + (row * count + globalIDs[first]) * itemsize)
+            fileStream.write(numerix.ascontiguousarray(rowValues[first:last]).tostring())
+
+def readCheckpoint(filename, mesh=None, communicator=parallelComm):
+    """
+    Read the variables saved by `writeCheckpoint()`. Returns a `dict` of
+    the variables, keyed by name.
+
+    Each processor memory-maps the file and copies only the elements that
+    overlap its part of the mesh.
+
+    :Parameters:
+      - `filename`: The name of the checkpoint file.
+      - `mesh`: An existing mesh to define the variables on. If `None`,
+        the saved mesh is restored.
+      - `communicator`: Object with `procID` and `Nproc` attributes.
+    """
+    fileStream = open(filename, mode='rb')
+    try:
+        if fileStream.read(len(_checkpointMagic)) != _checkpointMagic:
+            raise IOError("%s is not a FiPy checkpoint" % filename)
+        version, headerLength = struct.unpack("<QQ", fileStream.read(2 * 8))
+        if version > _checkpointVersion:
+            raise IOError("%s has unsupported checkpoint version %d" % (filename, version))
+        header = cPickle.loads(fileStream.read(headerLength))
+    finally:
+        fileStream.close()
+
+    dataStart = _align(len(_checkpointMagic) + 2 * 8 + headerLength)
+
+    if mesh is None:
+        meshState = header["meshState"].copy()
+        for key, value in meshState.items():
+            if isinstance(value, _CheckpointArray):
+                meshState[key] = value.read(filename, dataStart)
+
+        meshClass = header["meshClass"]
+        mesh = meshClass.__new__(meshClass)
+        mesh.__setstate__(meshState)
+
+    variables = {}
+    for record in header["variables"]:
+        kwargs = dict(mesh=mesh, name=record["variableName"], unit=record["unit"],
+                      elementshape=record["elementshape"])
+        if record["old"] is not None:
+            kwargs["hasOld"] = True
+        var = record["variableClass"](**kwargs)
+
+        IDs = var._globalOverlappingIDs
+        var.setValue(record["value"].memmap(filename, dataStart)[..., IDs])
+        if record["old"] is not None:
+            var.old.setValue(record["old"].memmap(filename, dataStart)[..., IDs])
+
+        variables[record["name"]] = var
+
+    return variables
+
+_archiveVersion = 1
+
+class FieldArchive(object):
+    """
+    A directory that holds a time series of `CellVariable` and
+    `FaceVariable` snapshots on one mesh.
+
+    Unlike saving each snapshot with `write()` or `writeCheckpoint()`, the
+    mesh is saved only once, and the snapshots of each variable are
+    gathered into `zlib` compressed chunks of `timeChunk` times by
+    `elementChunk` elements. In parallel, each processor writes the chunks
+    of the elements it owns, so no values are communicated, and the mesh,
+    which the first processor saves, must be the same on every processor,
+    as a `Grid` is. Reading a
+    window of times, or a subset of the elements, reads only the chunks
+    that hold them.
+
+        >>> import tempfile, shutil
+        >>> from fipy import Grid2D, CellVariable, FaceVariable
+        >>> dirname = tempfile.mkdtemp()
+        >>> mesh = Grid2D(nx=4, ny=3)
+        >>> x, y = mesh.cellCenters
+        >>> phi = CellVariable(mesh=mesh, name="phi", value=0., hasOld=True)
+        >>> flux = FaceVariable(mesh=mesh, rank=1)
+
+        >>> archive = FieldArchive(dirname, mode='w', timeChunk=4, elementChunk=5)
+        >>> for step in range(10):
+        ...     phi.setValue(x + y * step)
+        ...     flux.setValue(phi.faceGrad)
+        ...     archive.append(dict(phi=phi, flux=flux), time=step * 0.5)
+        >>> archive.close()
+
+    The 10 snapshots of the 12 cells of `phi` are kept in 3 by 3 chunks
+
+        >>> print len(os.listdir(os.path.join(dirname, "phi")))
+        9
+
+    and can be read for any window of times
+
+        >>> archive = FieldArchive(dirname)
+        >>> print archive.times
+        [ 0.   0.5  1.   1.5  2.   2.5  3.   3.5  4.   4.5]
+        >>> values = archive.read("phi", start=1., stop=2.)
+        >>> print values.shape
+        (3, 12)
+        >>> print numerix.allclose(values[-1], x + y * 4)
+        True
+
+    or for some of the elements, in the order they are asked for
+
+        >>> print archive.read("phi", start=4., ids=(11, 0))
+        [[ 23.5   4.5]
+         [ 26.    5. ]]
+        >>> print archive.read("flux", stop=0.).shape
+        (1, 2, 31)
+
+    A snapshot is restored as a variable on the saved mesh or on an
+    existing one
+
+        >>> restored = archive.variable("phi", index=4)
+        >>> print restored.name, restored.mesh.__class__.__name__
+        phi UniformGrid2D
+        >>> print numerix.allclose(restored, x + y * 4)
+        True
+        >>> print archive.variable("flux", mesh=mesh).mesh is mesh
+        True
+
+    An archive opened with `mode='a'` can be added to
+
+        >>> archive = FieldArchive(dirname, mode='a')
+        >>> archive.append(dict(phi=phi, flux=flux), time=5.)
+        >>> archive.close()
+        >>> print numerix.allclose(FieldArchive(dirname).read("phi", start=4.5), phi)
+        True
+
+    but every snapshot must have the same variables
+
+        >>> archive = FieldArchive(dirname, mode='a')
+        >>> archive.append(dict(phi=phi))
+        Traceback (most recent call last):
+            ...
+        ValueError: an archive of ['flux', 'phi'] cannot save ['phi']
+
+        >>> shutil.rmtree(dirname)
+    """
+    def __init__(self, dirname, mode='r', timeChunk=16, elementChunk=2**16, communicator=parallelComm):
+        """
+        :Parameters:
+          - `dirname`: The name of the directory that holds the archive.
+          - `mode`: 'r' to read an existing archive, 'w' to create a new one,
+            replacing any archive of the same name, or 'a' to add to an
+            existing archive, or to create one.
+          - `timeChunk`: The number of times in each chunk of a new archive.
+          - `elementChunk`: The number of elements in each chunk of a new
+            archive.
+          - `communicator`: Object with `procID` and `Nproc` attributes.
+        """
+        if mode not in ('r', 'w', 'a'):
+            raise ValueError("mode must be 'r', 'w' or 'a', not %s" % repr(mode))
+
+        self.dirname = dirname
+        self.mode = mode
+        self.communicator = communicator
+
+        self._mesh = None
+        self._slices = {}
+        self._buffer = {}
+
+        exists = os.path.exists(self._path("index"))
+
+        if mode == 'w' or (mode == 'a' and not exists):
+            if communicator.procID == 0:
+                if exists:
+                    import shutil
+                    shutil.rmtree(dirname)
+                if not os.path.exists(dirname):
+                    os.makedirs(dirname)
+            communicator.Barrier()
+
+            self._index = dict(version=_archiveVersion,
+                               timeChunk=timeChunk,
+                               elementChunk=elementChunk,
+                               slices=communicator.Nproc,
+                               fields=None,
+                               times=[])
+        else:
+            fileStream = open(self._path("index"), mode='rb')
+            try:
+                self._index = cPickle.load(fileStream)
+            finally:
+                fileStream.close()
+
+            if self._index["version"] > _archiveVersion:
+                raise IOError("%s has unsupported archive version %d" % (dirname, self._index["version"]))
+
+            if mode == 'a':
+                if self._index["slices"] != communicator.Nproc:
+                    raise ValueError("an archive written by %d processors cannot be added to by %d"
+                                     % (self._index["slices"], communicator.Nproc))
+                self._readPartialChunk()
+
+    def _path(self, *names):
+        return os.path.join(self.dirname, *names)
+
+    def _chunkPath(self, name, timeChunk, slice, elementChunk):
+        return self._path(name, "%d.%d.%d" % (timeChunk, slice, elementChunk))
+
+    @property
+    def times(self):
+        """The times of the snapshots."""
+        return numerix.array(self._index["times"], dtype=float)
+
+    @property
+    def names(self):
+        """The names of the saved variables."""
+        return sorted((self._index["fields"] or {}).keys())
+
+    @property
+    def mesh(self):
+        """The mesh of the saved variables."""
+        if self._mesh is None:
+            self._mesh = read(self._path("mesh.gz"), communicator=self.communicator)
+        return self._mesh
+
+    def _sliceIDs(self, slice):
+        """The sorted global IDs of the cells and faces saved by `slice`."""
+        if slice not in self._slices:
+            fileStream = open(self._path("slices", "%d" % slice), mode='rb')
+            try:
+                self._slices[slice] = cPickle.load(fileStream)
+            finally:
+                fileStream.close()
+        return self._slices[slice]
+
+    def _start(self, variables):
+        """Save the mesh and the elements of each processor."""
+        meshes = set([var.mesh for var in variables.values()])
+        if len(meshes) != 1:
+            raise ValueError("all variables in an archive must share one mesh")
+        mesh = meshes.pop()
+        _globalMeshState(mesh, self.communicator)
+
+        fields = {}
+        ids = {}
+        for name, var in variables.items():
+            variableClass = var._getArithmeticBaseClass()
+            fields[name] = dict(variableClass=variableClass,
+                                variableName=var.name,
+                                unit=var.unit,
+                                elementshape=var.elementshape,
+                                dtype=numerix.asarray(var.value).dtype.str,
+                                numberOfElements=var._globalNumberOfElements,
+                                hasOld=getattr(var, "_old", None) is not None)
+            globalIDs = numerix.asarray(var._globalNonOverlappingIDs)
+            order = numerix.argsort(globalIDs)
+            ids[variableClass.__name__] = (globalIDs[order],
+                                           numerix.asarray(var._localNonOverlappingIDs)[order])
+        self._index["fields"] = fields
+
+        if self.communicator.procID == 0:
+            os.makedirs(self._path("slices"))
+            for name in fields.keys():
+                os.makedirs(self._path(name))
+            write(mesh, self._path("mesh.gz"), communicator=self.communicator)
+        self.communicator.Barrier()
+
+        self._localIDs = dict([(key, local) for key, (globalIDs, local) in ids.items()])
+        self._slices[self.communicator.procID] = dict([(key, globalIDs) for key, (globalIDs, local) in ids.items()])
+
+        fileStream = open(self._path("slices", "%d" % self.communicator.procID), mode='wb')
+        try:
+            cPickle.dump(self._slices[self.communicator.procID], fileStream, 2)
+        finally:
+            fileStream.close()
+
+    def append(self, variables, time=None):
+        """
+        Add a snapshot of `variables`.
+
+        :Parameters:
+          - `variables`: A `dict` of the variables to save, keyed by name,
+            the same in every snapshot.
+          - `time`: The time of the snapshot. If `None`, the number of the
+            snapshot.
+        """
+        if self.mode == 'r':
+            raise IOError("%s is open for reading" % self.dirname)
+
+        if self._index["fields"] is None:
+            self._start(variables)
+        elif sorted(variables.keys()) != self.names:
+            raise ValueError("an archive of %s cannot save %s" % (self.names, sorted(variables.keys())))
+
+        if time is None:
+            time = len(self._index["times"])
+        self._index["times"].append(float(time))
+
+        for name, var in variables.items():
+            field = self._index["fields"][name]
+            local = self._localIDs[field["variableClass"].__name__]
+            value = numerix.asarray(var.value, dtype=field["dtype"])[..., local]
+            self._buffer.setdefault(name, []).append(value)
+
+        if len(self._index["times"]) % self._index["timeChunk"] == 0:
+            self.flush()
+            self._buffer = {}
+
+    def _readPartialChunk(self):
+        """Reload the snapshots of a chunk that is not yet full."""
+        self._localIDs = {}
+        if self._index["fields"] is None:
+            return
+
+        for name, field in self._index["fields"].items():
+            key = field["variableClass"].__name__
+            if key not in self._localIDs:
+                var = field["variableClass"](mesh=self.mesh, elementshape=field["elementshape"])
+                globalIDs = numerix.asarray(var._globalNonOverlappingIDs)
+                self._localIDs[key] = numerix.asarray(var._localNonOverlappingIDs)[numerix.argsort(globalIDs)]
+
+        if len(self._index["times"]) % self._index["timeChunk"] > 0:
+            timeChunk = len(self._index["times"]) // self._index["timeChunk"]
+            for name in self._index["fields"].keys():
+                self._buffer[name] = list(self._readSlice(name, timeChunk, self.communicator.procID))
+
+    def flush(self):
+        """
+        Write the snapshots that are not yet in a full chunk, and the
+        index of the archive.
+        """
+        import zlib
+
+        timeChunk = (len(self._index["times"]) - 1) // self._index["timeChunk"]
+        elementChunk = self._index["elementChunk"]
+        procID = self.communicator.procID
+        for name, values in self._buffer.items():
+            values = numerix.array(values)
+            for chunk, start in enumerate(range(0, values.shape[-1], elementChunk)):
+                data = numerix.ascontiguousarray(values[..., start:start + elementChunk]).tostring()
+                fileStream = open(self._chunkPath(name, timeChunk, procID, chunk), mode='wb')
+                try:
+                    fileStream.write(zlib.compress(data))
+                finally:
+                    fileStream.close()
+
+        if procID == 0 and self._index["fields"] is not None:
+            fileStream = open(self._path("index.tmp"), mode='wb')
+            try:
+                cPickle.dump(self._index, fileStream, 2)
+            finally:
+                fileStream.close()
+            os.rename(self._path("index.tmp"), self._path("index"))
+
+        self.communicator.Barrier()
+
+    def close(self):
+        """Write any snapshots that are not yet saved."""
+        if self.mode != 'r':
+            self.flush()
+
+    def _readSlice(self, name, timeChunk, slice, chunks=None):
+        """
+        The values of `name` at the times of `timeChunk` and the elements
+        of `slice`, or only of its element `chunks`.
+        """
+        import zlib
+
+        field = self._index["fields"][name]
+        ids = self._sliceIDs(slice)[field["variableClass"].__name__]
+        elementChunk = self._index["elementChunk"]
+        if chunks is None:
+            chunks = range(-(-len(ids) // elementChunk))
+
+        values = []
+        for chunk in chunks:
+            fileStream = open(self._chunkPath(name, timeChunk, slice, chunk), mode='rb')
+            try:
+                data = zlib.decompress(fileStream.read())
+            finally:
+                fileStream.close()
+            count = len(ids[chunk * elementChunk:(chunk + 1) * elementChunk])
+            values.append(numerix.fromstring(data, dtype=field["dtype"]).reshape((-1,) + field["elementshape"] + (count,)))
+
+        if len(values) == 0:
+            return numerix.zeros((0,) + field["elementshape"] + (0,), dtype=field["dtype"])
+        return numerix.concatenate(values, axis=-1)
+
+    def _read(self, name, indices, ids=None):
+        field = self._index["fields"][name]
+        key = field["variableClass"].__name__
+        timeChunk = self._index["timeChunk"]
+        elementChunk = self._index["elementChunk"]
+
+        indices = numerix.asarray(indices, dtype=int)
+        if ids is None:
+            ids = numerix.arange(field["numberOfElements"])
+        ids = numerix.asarray(ids, dtype=int)
+        order = numerix.argsort(ids)
+        sortedIDs = ids[order]
+
+        values = numerix.zeros((len(indices),) + field["elementshape"] + (len(ids),), dtype=field["dtype"])
+        for chunk in numerix.unique(indices // timeChunk):
+            rows = numerix.nonzero(indices // timeChunk == chunk)[0]
+            for slice in range(self._index["slices"]):
+                sliceIDs = self._sliceIDs(slice)[key]
+                wanted = numerix.in1d(sliceIDs, sortedIDs)
+                chunks = numerix.unique(numerix.nonzero(wanted)[0] // elementChunk)
+                if len(chunks) == 0:
+                    continue
+                positions = numerix.concatenate([numerix.arange(c * elementChunk, min((c + 1) * elementChunk, len(sliceIDs)))
+                                                 for c in chunks])
+                data = self._readSlice(name, chunk, slice, chunks)
+                data = data[indices[rows] % timeChunk]
+                keep = wanted[positions]
+                where = order[numerix.searchsorted(sortedIDs, sliceIDs[positions][keep])]
+                for row, rowData in zip(rows, data):
+                    values[row][..., where] = rowData[..., keep]
+        return values
+
+    def read(self, name, start=None, stop=None, ids=None):
+        """
+        The values of `name` at the times between `start` and `stop`,
+        inclusive, as an array with the times along the first axis.
+
+        :Parameters:
+          - `name`: The name of the variable.
+          - `start`, `stop`: The first and last times to read, or `None`
+            for the first and last saved.
+          - `ids`: The global IDs of the cells or faces to read, or `None`
+            to read them all.
+        """
+        times = self.times
+        selected = numerix.ones(len(times), dtype=bool)
+        if start is not None:
+            selected &= times >= start
+        if stop is not None:
+            selected &= times <= stop
+        return self._read(name, numerix.nonzero(selected)[0], ids=ids)
+
+    def variable(self, name, index=-1, mesh=None):
+        """
+        The variable `name` of snapshot `index`.
+
+        :Parameters:
+          - `name`: The name of the variable.
+          - `index`: The number of the snapshot, counting from the end if
+            negative.
+          - `mesh`: An existing mesh to define the variable on. If `None`,
+            the saved mesh is restored.
+        """
+        field = self._index["fields"][name]
+        if mesh is None:
+            mesh = self.mesh
+        var = field["variableClass"](mesh=mesh, name=field["variableName"], unit=field["unit"],
+                                     elementshape=field["elementshape"])
+        index = range(len(self._index["times"]))[index]
+        var.setValue(self._read(name, [index], ids=var._globalOverlappingIDs)[0])
+        return var
+
 def _test():
     import fipy.tests.doctestPlus
     return fipy.tests.doctestPlus.testmod()
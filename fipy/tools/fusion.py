@@ -0,0 +1,305 @@
+"""Fused evaluation of `_OperatorVariable` expression trees
+
+When enabled with the ``--fuse`` command line flag or the `FIPY_FUSE`
+environment variable, an `_OperatorVariable` whose uncached operands are
+themselves elementwise operators is evaluated as a single sequence of NumPy
+ufunc calls. Every intermediate result is written with ``out=`` into a
+buffer borrowed from a scratch pool, so a tree of `N` nodes allocates one
+result array instead of `N` temporaries.
+"""
+__docformat__ = 'restructuredtext'
+
+__all__ = ["doFuse"]
+
+import dis
+import os
+import sys
+
+from fipy.tools import numerix
+
+if '--fuse' in [s.lower() for s in sys.argv[1:]]:
+    doFuse = True
+else:
+    doFuse = 'FIPY_FUSE' in os.environ
+
+_binaryOpcodes = {
+    'BINARY_ADD': 'add',
+    'BINARY_SUBTRACT': 'subtract',
+    'BINARY_MULTIPLY': 'multiply',
+    'BINARY_DIVIDE': 'divide',
+    'BINARY_TRUE_DIVIDE': 'true_divide',
+    'BINARY_FLOOR_DIVIDE': 'floor_divide',
+    'BINARY_POWER': 'power',
+    'BINARY_MODULO': 'remainder',
+    'BINARY_AND': 'bitwise_and',
+    'BINARY_OR': 'bitwise_or',
+    'BINARY_XOR': 'bitwise_xor',
+}
+
+_unaryOpcodes = {
+    'UNARY_NEGATIVE': 'negative',
+    'UNARY_INVERT': 'invert',
+}
+
+_comparisons = {
+    '<': 'less',
+    '<=': 'less_equal',
+    '==': 'equal',
+    '!=': 'not_equal',
+    '>': 'greater',
+    '>=': 'greater_equal',
+}
+
+def _instructions(code):
+    """(opname, argval) pairs of the bytecode of `code`"""
+    try:
+        return [(ins.opname, ins.argval) for ins in dis.get_instructions(code)]
+    except AttributeError:
+        bytecodes = [ord(byte) for byte in code.co_code]
+        instructions = []
+        i = 0
+        while i < len(bytecodes):
+            opname = dis.opname[bytecodes[i]]
+            if bytecodes[i] >= dis.HAVE_ARGUMENT:
+                arg = bytecodes[i + 1] + bytecodes[i + 2] * 256
+                i += 3
+                if opname in ('LOAD_GLOBAL', 'LOAD_ATTR'):
+                    arg = code.co_names[arg]
+                elif opname == 'COMPARE_OP':
+                    arg = dis.cmp_op[arg]
+                elif opname == 'LOAD_CONST':
+                    arg = code.co_consts[arg]
+            else:
+                arg = None
+                i += 1
+            instructions.append((opname, arg))
+        return instructions
+
+def _numerixUfunc(name):
+    ufunc = getattr(numerix.NUMERIX, name, None)
+    if isinstance(ufunc, numerix.ufunc):
+        return ufunc
+    else:
+        return None
+
+_ufuncCache = {}
+
+def _ufuncOf(op, nargs):
+    """
+    Find the NumPy ufunc that `op` applies to its arguments.
+
+    Returns the ufunc and the order in which `op` passes its arguments to
+    it, or `None` if `op` is not a simple elementwise operation.
+
+        >>> print _ufuncOf(lambda a, b: b - a, 2)
+        (<ufunc 'subtract'>, (1, 0))
+        >>> print _ufuncOf(lambda a, b: a < b, 2)
+        (<ufunc 'less'>, (0, 1))
+        >>> print _ufuncOf(lambda a, b: pow(a, b), 2)
+        (<ufunc 'power'>, (0, 1))
+        >>> print _ufuncOf(lambda a: -a, 1)
+        (<ufunc 'negative'>, (0,))
+        >>> print _ufuncOf(lambda a: numerix.exp(a), 1)
+        (<ufunc 'exp'>, (0,))
+        >>> print _ufuncOf(numerix.sin, 1)
+        (<ufunc 'sin'>, (0,))
+
+    Anything else can't be fused
+
+        >>> print _ufuncOf(lambda a: a[0], 1)
+        None
+        >>> print _ufuncOf(lambda a: numerix.dot(a, a), 1)
+        None
+        >>> print _ufuncOf(lambda a, b: a + b + 1, 2)
+        None
+    """
+    if isinstance(op, numerix.ufunc):
+        if op.nin == nargs and op.nout == 1:
+            return (op, tuple(range(nargs)))
+        else:
+            return None
+
+    code = getattr(op, 'func_code', getattr(op, '__code__', None))
+    if code is None or len(code.co_freevars) > 0:
+        return None
+
+    key = (code, nargs)
+    if key not in _ufuncCache:
+        _ufuncCache[key] = _parseUfunc(op, code, nargs)
+
+    return _ufuncCache[key]
+
+def _parseUfunc(op, code, nargs):
+    instructions = _instructions(code)
+
+    if len(instructions) == 0 or instructions[-1][0] != 'RETURN_VALUE':
+        return None
+    instructions = instructions[:-1]
+
+    ufunc = None
+    args = []
+    if instructions[0] == ('LOAD_GLOBAL', 'pow') and instructions[-1][0] == 'CALL_FUNCTION':
+        globals = getattr(op, 'func_globals', getattr(op, '__globals__', {}))
+        if globals.get('pow', pow) is pow:
+            ufunc = numerix.NUMERIX.power
+        args = instructions[1:-1]
+    elif (len(instructions) > 2
+          and instructions[0] == ('LOAD_GLOBAL', 'numerix')
+          and instructions[1][0] == 'LOAD_ATTR'
+          and instructions[-1][0] == 'CALL_FUNCTION'):
+        globals = getattr(op, 'func_globals', getattr(op, '__globals__', {}))
+        if globals.get('numerix') is numerix:
+            ufunc = _numerixUfunc(instructions[1][1])
+        args = instructions[2:-1]
+    elif len(instructions) == nargs + 1:
+        opname, argval = instructions[-1]
+        if nargs == 2 and opname in _binaryOpcodes:
+            ufunc = _numerixUfunc(_binaryOpcodes[opname])
+        elif nargs == 2 and opname == 'COMPARE_OP' and argval in _comparisons:
+            ufunc = _numerixUfunc(_comparisons[argval])
+        elif nargs == 1 and opname in _unaryOpcodes:
+            ufunc = _numerixUfunc(_unaryOpcodes[opname])
+        args = instructions[:-1]
+
+    if (ufunc is None
+        or ufunc.nin != nargs
+        or ufunc.nout != 1
+        or len(args) != nargs
+        or [opname for opname, argval in args] != ['LOAD_FAST'] * nargs):
+        return None
+
+    order = tuple(code.co_varnames.index(argval) if isinstance(argval, str) else argval
+                  for opname, argval in args)
+    if sorted(order) != range(nargs):
+        return None
+
+    return (ufunc, order)
+
+class _ScratchPool(object):
+    """
+    Reusable intermediate buffers, keyed by shape and type.
+
+        >>> pool = _ScratchPool()
+        >>> a = pool.acquire((3,), numerix.float64)
+        >>> pool.release(a)
+        >>> pool.acquire((3,), numerix.float64) is a
+        True
+        >>> pool.acquire((3,), numerix.float64) is a
+        False
+    """
+    def __init__(self):
+        self.buffers = {}
+
+    def acquire(self, shape, dtype):
+        free = self.buffers.get((shape, numerix.dtype(dtype)), [])
+        if len(free) > 0:
+            return free.pop()
+        else:
+            return numerix.empty(shape, dtype=dtype)
+
+    def release(self, buffer):
+        self.buffers.setdefault((buffer.shape, buffer.dtype), []).append(buffer)
+
+    def clear(self):
+        self.buffers = {}
+
+_scratch = _ScratchPool()
+
+class _FusedKernel(object):
+    """
+    Evaluation sequence of an expression tree of ufuncs.
+
+    Each instruction is a ufunc and the operands it takes, either the index
+    of a leaf value or the index of an earlier instruction. Intermediate
+    results go to scratch buffers, which are released as soon as they have
+    been consumed, so an operator can write in place of its operand.
+
+    :Parameters:
+      - `structure`: Nested tuples of `(ufunc, operands)`, where each
+        operand is either the index of a leaf or another `(ufunc, operands)`.
+
+        >>> kernel = _FusedKernel((numerix.add, ((numerix.multiply, (0, 1)), 2)))
+        >>> print kernel(numerix.array([1., 2.]), numerix.array([3., 4.]), 1)
+        [ 4.  9.]
+        >>> print kernel(numerix.array([1, 2]), 2, 0.5)
+        [ 2.5  4.5]
+    """
+    def __init__(self, structure):
+        self.instructions = []
+        self._compile(structure)
+
+    def _compile(self, structure):
+        ufunc, operands = structure
+        compiled = []
+        for operand in operands:
+            if isinstance(operand, tuple):
+                compiled.append(('result', self._compile(operand)))
+            else:
+                compiled.append(('leaf', operand))
+        self.instructions.append((ufunc, tuple(compiled)))
+        return len(self.instructions) - 1
+
+    @staticmethod
+    def _sample(value):
+        if isinstance(value, numerix.ndarray) and value.ndim > 0:
+            return value.ravel()[:1]
+        else:
+            return value
+
+    def __call__(self, *leaves):
+        results = [None] * len(self.instructions)
+        last = len(self.instructions) - 1
+        try:
+            for i, (ufunc, operands) in enumerate(self.instructions):
+                args = []
+                for kind, index in operands:
+                    if kind == 'leaf':
+                        args.append(leaves[index])
+                    else:
+                        args.append(results[index])
+
+                shape = numerix.broadcast(*args).shape
+                # resolve the result type, with the same scalar casting rules
+                # as the unfused ufunc, from one element of each operand
+                with numerix.errstate(all='ignore'):
+                    dtype = ufunc(*[self._sample(arg) for arg in args]).dtype
+
+                # operands computed here are not needed any more
+                for kind, index in operands:
+                    if kind == 'result':
+                        _scratch.release(results[index])
+                        results[index] = None
+
+                if i == last:
+                    out = numerix.empty(shape, dtype=dtype)
+                else:
+                    out = _scratch.acquire(shape, dtype)
+                results[i] = ufunc(*args, out=out)
+        except:
+            for result in results[:last]:
+                if result is not None:
+                    _scratch.release(result)
+            raise
+
+        return results[last]
+
+_kernelCache = {}
+
+def _getKernel(structure):
+    """
+    The compiled kernel of an expression tree, which is only compiled the
+    first time a tree of that structure is evaluated.
+
+        >>> _getKernel((numerix.sin, (0,))) is _getKernel((numerix.sin, (0,)))
+        True
+    """
+    if structure not in _kernelCache:
+        _kernelCache[structure] = _FusedKernel(structure)
+    return _kernelCache[structure]
+
+def _test():
+    import fipy.tests.doctestPlus
+    return fipy.tests.doctestPlus.testmod()
+
+if __name__ == "__main__":
+    _test()
@@ -52,9 +52,12 @@ import fipy.tests.testProgram
 
 def _suite():
     theSuite = _LateImportDocTestSuite(docTestModuleNames = (
+            'comms.distribution',
             'dimensions.physicalField',
             'numerix',
+            'counterRandom',
             'dump',
+            'fusion',
             'vector',
         ), base = __name__)
 
@@ -102,6 +102,11 @@ class _AddOverFacesVariable(CellVariable):
         return self._makeValue(value = val)
 
     def _calcValueNoInline(self):
+        if self.mesh.topology._cellFaceIncidence is not None:
+            faceValues = self.faceVariable.value
+            if type(faceValues) is numerix.ndarray:
+                return self.mesh._sumOverCellFaces(faceValues) / self.mesh.cellVolumes
+
         ids = self.mesh.cellFaceIDs
 
         contributions = numerix.take(self.faceVariable, ids, axis=-1)
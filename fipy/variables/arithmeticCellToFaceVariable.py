@@ -73,6 +73,20 @@ class _ArithmeticCellToFaceVariable(_CellToFaceVariable):
             return self._makeValue(value = val)
     else:
         def _calcValue_(self, alpha, id1, id2):
+            if self.mesh._cellToFaceInterpolation is not None:
+                cellValues = self.var.value
+                if type(cellValues) is numerix.ndarray:
+                    shape = cellValues.shape[:-1] + (self.mesh.numberOfFaces,)
+                    return self.mesh._interpolateToFaces(cellValues,
+                                                         out=self._outBuffer(shape, numerix.result_type(float, cellValues)))
+
             cell1 = numerix.take(self.var, id1, axis=-1)
             cell2 = numerix.take(self.var, id2, axis=-1)
-            return (cell2 - cell1) * alpha + cell1
+            if type(cell1) is numerix.ndarray and type(alpha) is numerix.ndarray:
+                value = self._outBuffer(cell1.shape, numerix.result_type(cell1, alpha))
+                numerix.subtract(cell2, cell1, out=value)
+                value *= alpha
+                value += cell1
+                return value
+            else:
+                return (cell2 - cell1) * alpha + cell1
@@ -46,7 +46,6 @@
 
 __docformat__ = 'restructuredtext'
 
-from fipy.tools.numerix import random
 from fipy.variables.noiseVariable import NoiseVariable
 
 __all__ = ["BetaNoiseVariable"]
@@ -122,21 +121,21 @@ class BetaNoiseVariable(NoiseVariable):
       :alt: histogram of random values with a beta distribution
 
     """
-    def __init__(self, mesh, alpha, beta, name = '', hasOld = 0):
+    def __init__(self, mesh, alpha, beta, name = '', hasOld = 0, seed = None):
         r"""
         :Parameters:
             - `mesh`: The mesh on which to define the noise.
             - `alpha`: The parameter :math:`\alpha`.
             - `beta`: The parameter :math:`\beta`.
+            - `seed`: A non-negative integer that selects the sequence of noise.
 
         """
-        NoiseVariable.__init__(self, mesh = mesh, name = name, hasOld = hasOld)
+        NoiseVariable.__init__(self, mesh = mesh, name = name, hasOld = hasOld, seed = seed)
         self.alpha = self._requires(alpha)
         self.beta = self._requires(beta)
 
-    def random(self):
-        return random.beta(a = self.alpha, b = self.beta,
-                           size = [self.mesh.globalNumberOfCells])
+    def _sample(self, generator, parameter):
+        return generator.beta(a = parameter(self.alpha), b = parameter(self.beta))
 
 def _test():
     import fipy.tests.doctestPlus
@@ -47,8 +47,12 @@
 
 __docformat__ = 'restructuredtext'
 
+import os
+import weakref
+
 from fipy.variables.meshVariable import _MeshVariable
 from fipy.tools import numerix
+from fipy.tools import parser
 
 __all__ = ["CellVariable"]
 
@@ -72,14 +76,31 @@ class CellVariable(_MeshVariable):
     >>> print var.allclose(unPickledVar, atol = 1e-10, rtol = 1e-10)
     1
 
+    When double buffering is enabled (with ``--double-buffer`` or
+    `FIPY_DOUBLE_BUFFER`), `updateOld()` hands the current array to `old`
+    by reference instead of copying it, and the two only part when one of
+    them is written or its `value` is handed out. Rejecting a time step then just points the
+    `CellVariable` back at the array of `old`, which leaves anything
+    computed from `old`, or from a `CellVariable` that did not change,
+    cached.
+
     """
 
+    _doubleBuffered = (os.getenv("FIPY_DOUBLE_BUFFER") is not None) or False
+    if parser.parse("--double-buffer", action="store_true"):
+        _doubleBuffered = True
+
+    _old = None
+    _spare = None
+    _current = None
+
     def __init__(self, mesh, name='', value=0., rank=None, elementshape=None, unit=None, hasOld=0):
         _MeshVariable.__init__(self, mesh=mesh, name=name, value=value,
                                rank=rank, elementshape=elementshape, unit=unit)
 
         if hasOld:
             self._old = self.copy()
+            self._old._current = weakref.ref(self)
         else:
             self._old = None
 
@@ -154,6 +175,10 @@ class CellVariable(_MeshVariable):
     def _globalNumberOfElements(self):
         return self.mesh.globalNumberOfCells
 
+    @property
+    def _distribution(self):
+        return self.mesh.topology._cellDistribution
+
     @property
     def _globalOverlappingIDs(self):
         return self.mesh._globalOverlappingCellIDs
@@ -162,6 +187,10 @@ class CellVariable(_MeshVariable):
     def _localNonOverlappingIDs(self):
         return self.mesh._localNonOverlappingCellIDs
 
+    @property
+    def _globalNonOverlappingIDs(self):
+        return self.mesh._globalNonOverlappingCellIDs
+
     @property
     def globalValue(self):
         """Concatenate and return values from all processors
@@ -169,18 +198,37 @@ class CellVariable(_MeshVariable):
         When running on a single processor, the result is identical to
         :attr:`~fipy.variables.variable.Variable.value`.
         """
-        return self._getGlobalValue(self.mesh._localNonOverlappingCellIDs,
-                                    self.mesh._globalNonOverlappingCellIDs)
+        return self._getGlobalValue()
+
+    def updateGhosts(self):
+        """Replace the values of the ghost cells of this processor with the
+        values of the processors that own them
+
+        Only neighboring processors exchange values, so this is much
+        cheaper than assembling the :attr:`globalValue`. Does nothing when
+        running on a single processor.
+
+            >>> from fipy import Grid1D
+            >>> var = CellVariable(mesh=Grid1D(nx=3), value=(1., 2., 3.))
+            >>> var.updateGhosts()
+            >>> print var
+            [ 1.  2.  3.]
+        """
+        if self.mesh.communicator.Nproc > 1:
+            self.setValue(self._distribution.exchange(self.value.copy()))
 
     def setValue(self, value, unit = None, where = None):
         _MeshVariable.setValue(self, value=self._globalToLocalValue(value), unit=unit, where=where)
 
     def __call__(self, points=None, order=0, nearestCellIDs=None):
         r"""
-        Interpolates the CellVariable to a set of points using a
-        method that has a memory requirement on the order of Ncells by
-        Npoints in general, but uses only Ncells when the
-        CellVariable's mesh is a UniformGrid object.
+        Interpolates the CellVariable to a set of points. The nearest
+        cells are found with a spatial index of the cell centers that is
+        cached on the mesh, or directly when the CellVariable's mesh is a
+        UniformGrid object. First order interpolation is linear within the
+        cell that contains each point; to interpolate to the same points
+        repeatedly, build the operator once with
+        :meth:`~fipy.meshes.abstractMesh.AbstractMesh.cellInterpolator`.
 
         :Parameters:
 
@@ -197,7 +245,7 @@ class CellVariable(_MeshVariable):
             >>> print v(((0., 1.1, 1.2), (0., 1., 1.)))
             [ 0.5  1.5  1.5]
             >>> print v(((0., 1.1, 1.2), (0., 1., 1.)), order=1)
-            [ 0.25  1.1   1.2 ]
+            [ 0.   1.1  1.2]
             >>> m0 = Grid2D(nx=2, ny=2, dx=1., dy=1.)
             >>> m1 = Grid2D(nx=4, ny=4, dx=.5, dy=.5)
             >>> x, y = m0.cellCenters
@@ -206,24 +254,21 @@ class CellVariable(_MeshVariable):
             [ 0.25  0.25  0.75  0.75  0.25  0.25  0.75  0.75  0.75  0.75  2.25  2.25
               0.75  0.75  2.25  2.25]
             >>> print v0(m1.cellCenters.globalValue, order=1)
-            [ 0.125  0.25   0.5    0.625  0.25   0.375  0.875  1.     0.5    0.875
-              1.875  2.25   0.625  1.     2.25   2.625]
+            [ 0.    0.25  0.25  0.5   0.25  0.5   1.    1.25  0.25  1.    1.5   2.25
+              0.5   1.25  2.25  3.  ]
 
         """
         if points is not None:
 
-            if nearestCellIDs is None:
+            if nearestCellIDs is None and order == 0:
                 nearestCellIDs = self.mesh._getNearestCellID(points)
 
             if order == 0:
-                return self.globalValue[..., nearestCellIDs]
+                return self._distribution.take(self.value, nearestCellIDs)
 
             elif order == 1:
-                ##cellID = self.mesh._getNearestCellID(points)
-##                return self[...,self.mesh._getNearestCellID(points)] + numerix.dot(points - self.mesh.cellCenters[...,cellID], self.grad[...,cellID])
-                return (self.globalValue[..., nearestCellIDs]
-                        + numerix.dot(points - self.mesh.cellCenters.globalValue[...,nearestCellIDs],
-                                      self.grad.globalValue[...,nearestCellIDs]))
+                return self.mesh.cellInterpolator(points, order=1,
+                                                  nearestCellIDs=nearestCellIDs)(self)
 
             else:
                 raise ValueError, 'order should be either 0 or 1'
@@ -503,15 +548,118 @@ class CellVariable(_MeshVariable):
            ...
         AssertionError: The updateOld method requires the CellVariable to have an old value. Set hasOld to True when instantiating the CellVariable.
 
+        A double buffered `CellVariable` shares its array with `old` until
+        either of them is written or its `value` is handed out
+
+        >>> CellVariable._doubleBuffered = True
+        >>> v = CellVariable(mesh=Grid1D(nx=3), value=(1., 2., 3.), hasOld=True)
+        >>> v.updateOld()
+        >>> print v.old._value is v._value
+        True
+        >>> v[1] = 5.
+        >>> print v, v.old
+        [ 1.  5.  3.] [ 1.  2.  3.]
+        >>> v.updateOld()
+        >>> v.old[0] = 4.
+        >>> print v, v.old
+        [ 1.  5.  3.] [ 4.  5.  3.]
+        >>> v.updateOld()
+        >>> v.value = 0.
+        >>> print v, v.old
+        [ 0.  0.  0.] [ 1.  5.  3.]
+        >>> v.updateOld()
+        >>> v.value += 1.
+        >>> v.value[2] = 7.
+        >>> print v, v.old
+        [ 1.  1.  7.] [ 0.  0.  0.]
+        >>> v.updateOld()
+        >>> numerix.put(v.old.value, [0], 9.)
+        >>> print v, v.old
+        [ 1.  1.  7.] [ 9.  1.  7.]
+        >>> CellVariable._doubleBuffered = False
+
         """
         if self._old is None:
             raise AssertionError, 'The updateOld method requires the CellVariable to have an old value. Set hasOld to True when instantiating the CellVariable.'
+        elif self._canDoubleBuffer():
+            if self._old._value is not self._value:
+                self._spare = self._old._value
+                self._old._value = self._value
+                self._old._markFresh()
         else:
             self._old.value = self.value.copy()
 
     def _resetToOld(self):
+        """
+        Restore the values of the previous solution sweep, e.g., to reject
+        a time step.
+
+        A double buffered `CellVariable` goes back to the array of `old`
+        without copying it, and a `CellVariable` that has not been written
+        or read since `updateOld()` doesn't even mark its dependents stale
+
+        >>> from fipy.meshes import Grid1D
+        >>> CellVariable._doubleBuffered = True
+        >>> v = CellVariable(mesh=Grid1D(nx=3), value=(1., 2., 3.), hasOld=True)
+        >>> w = CellVariable(mesh=Grid1D(nx=3), value=(4., 5., 6.), hasOld=True)
+        >>> vw = v * w
+        >>> doubled = w * 2
+        >>> print vw, doubled
+        [  4.  10.  18.] [  8.  10.  12.]
+        >>> v.updateOld()
+        >>> w.updateOld()
+        >>> v[:] = (7., 8., 9.)
+        >>> v._resetToOld()
+        >>> w._resetToOld()
+        >>> print v.old._value is v._value
+        True
+        >>> print vw.stale, doubled.stale
+        1 0
+
+        and takes back the array it wrote the rejected values to the next
+        time it is read or written
+
+        >>> rejected = v._spare
+        >>> print vw
+        [  4.  10.  18.]
+        >>> print v._value is rejected, v.old
+        True [ 1.  2.  3.]
+        >>> CellVariable._doubleBuffered = False
+        """
+        if self._old is not None:
+            if self._canDoubleBuffer():
+                if self._old._value is not self._value:
+                    self._spare = self._value
+                    self._value = self._old._value
+                    self._markFresh()
+            else:
+                self.value = (self._old.value)
+
+    def _canDoubleBuffer(self):
+        return (self._doubleBuffered
+                and type(self._value) is numerix.ndarray
+                and type(self._old._value) is numerix.ndarray
+                and self._old._value.shape == self._value.shape
+                and self._old._value.dtype == self._value.dtype)
+
+    def _ownValue(self, overwrite=False):
         if self._old is not None:
-            self.value = (self._old.value)
+            sharer = self._old
+        elif self._current is not None:
+            sharer = self._current()
+        else:
+            sharer = None
+
+        if sharer is not None and sharer._value is self._value:
+            spare = self._spare
+            if (spare is None
+                or spare.shape != self._value.shape
+                or spare.dtype != self._value.dtype):
+                spare = numerix.empty_like(self._value)
+            if not overwrite:
+                spare[...] = self._value
+            self._spare = None
+            self._value = spare
 
     def _getShapeFromMesh(mesh):
         """
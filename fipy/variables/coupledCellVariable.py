@@ -96,6 +96,10 @@ class _CoupledCellVariable(object):
 
     value = property(_getValue, _setValue)
 
+    def _ownValue(self, overwrite=False):
+        # the value is assembled anew each time
+        pass
+
     @property
     def globalValue(self):
         return numerix.concatenate([numerix.array(var.globalValue) for var in self.vars])
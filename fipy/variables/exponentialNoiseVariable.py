@@ -44,7 +44,6 @@
 
 __docformat__ = 'restructuredtext'
 
-from fipy.tools.numerix import random
 from fipy.variables.noiseVariable import NoiseVariable
 
 __all__ = ["ExponentialNoiseVariable"]
@@ -114,18 +113,18 @@ class ExponentialNoiseVariable(NoiseVariable):
       :alt: histogram of random values with an exponential distribution
 
     """
-    def __init__(self, mesh, mean=0.0, name = '', hasOld = 0):
+    def __init__(self, mesh, mean=0.0, name = '', hasOld = 0, seed = None):
         r"""
         :Parameters:
             - `mesh`: The mesh on which to define the noise.
             - `mean`: The mean of the distribution :math:`\mu`.
+            - `seed`: A non-negative integer that selects the sequence of noise.
         """
-        NoiseVariable.__init__(self, mesh = mesh, name = name, hasOld = hasOld)
+        NoiseVariable.__init__(self, mesh = mesh, name = name, hasOld = hasOld, seed = seed)
         self.mean = self._requires(mean)
 
-    def random(self):
-        return random.exponential(scale = self.mean,
-                                  size = [self.mesh.globalNumberOfCells])
+    def _sample(self, generator, parameter):
+        return generator.exponential(scale = parameter(self.mean))
 
 def _test():
     import fipy.tests.doctestPlus
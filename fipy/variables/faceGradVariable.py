@@ -186,7 +186,16 @@ class _FaceGradVariable(FaceVariable):
         T1 = (t1grad1 + t1grad2) / 2.
         T2 = (t2grad1 + t2grad2) / 2.
 
-        return normals[s] * N[numerix.newaxis] + tangents1[s] * T1[numerix.newaxis] + tangents2[s] * T2[numerix.newaxis]
+        if type(normals) is numerix.ndarray and type(N) is numerix.ndarray:
+            normalGrad = (normals[s], N[numerix.newaxis])
+            grad = self._outBuffer(numerix.broadcast(*normalGrad).shape,
+                                   numerix.result_type(*(normalGrad + (T1, T2))))
+            numerix.multiply(normalGrad[0], normalGrad[1], out=grad)
+            grad += tangents1[s] * T1[numerix.newaxis]
+            grad += tangents2[s] * T2[numerix.newaxis]
+            return grad
+        else:
+            return normals[s] * N[numerix.newaxis] + tangents1[s] * T1[numerix.newaxis] + tangents2[s] * T2[numerix.newaxis]
 
 def _test():
     import fipy.tests.doctestPlus
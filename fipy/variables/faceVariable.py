@@ -79,8 +79,7 @@ class FaceVariable(_MeshVariable):
 
     @property
     def globalValue(self):
-        return self._getGlobalValue(self.mesh._localNonOverlappingFaceIDs,
-                                    self.mesh._globalNonOverlappingFaceIDs)
+        return self._getGlobalValue()
 
     def setValue(self, value, unit = None, where = None):
         _MeshVariable.setValue(self, value=self._globalToLocalValue(value), unit=unit, where=where)
@@ -108,6 +107,10 @@ class FaceVariable(_MeshVariable):
     def _globalNumberOfElements(self):
         return self.mesh.globalNumberOfFaces
 
+    @property
+    def _distribution(self):
+        return self.mesh.topology._faceDistribution
+
     @property
     def _globalOverlappingIDs(self):
         return self.mesh._globalOverlappingFaceIDs
@@ -116,6 +119,10 @@ class FaceVariable(_MeshVariable):
     def _localNonOverlappingIDs(self):
         return self.mesh._localNonOverlappingFaceIDs
 
+    @property
+    def _globalNonOverlappingIDs(self):
+        return self.mesh._globalNonOverlappingFaceIDs
+
 def _test():
     import fipy.tests.doctestPlus
     return fipy.tests.doctestPlus.testmod()
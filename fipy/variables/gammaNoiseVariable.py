@@ -44,7 +44,6 @@
 
 __docformat__ = 'restructuredtext'
 
-from fipy.tools.numerix import random
 from fipy.variables.noiseVariable import NoiseVariable
 
 __all__ = ["GammaNoiseVariable"]
@@ -119,21 +118,21 @@ class GammaNoiseVariable(NoiseVariable):
       :alt: histogram of random values with a gamma distribution
 
     """
-    def __init__(self, mesh, shape, rate, name = '', hasOld = 0):
+    def __init__(self, mesh, shape, rate, name = '', hasOld = 0, seed = None):
         r"""
         :Parameters:
             - `mesh`: The mesh on which to define the noise.
             - `shape`: The shape parameter, :math:`\alpha`.
             - `rate`: The rate or inverse scale parameter, :math:`\beta`.
+            - `seed`: A non-negative integer that selects the sequence of noise.
 
         """
-        NoiseVariable.__init__(self, mesh = mesh, name = name, hasOld = hasOld)
+        NoiseVariable.__init__(self, mesh = mesh, name = name, hasOld = hasOld, seed = seed)
         self.shapeParam = self._requires(shape)
         self.rate = self._requires(rate)
 
-    def random(self):
-        return random.gamma(shape=self.shapeParam, scale=self.rate,
-                            size=[self.mesh.globalNumberOfCells])
+    def _sample(self, generator, parameter):
+        return generator.gamma(shape=parameter(self.shapeParam), scale=parameter(self.rate))
 
 def _test():
     import fipy.tests.doctestPlus
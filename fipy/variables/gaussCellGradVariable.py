@@ -114,9 +114,22 @@ class _GaussCellGradVariable(CellVariable):
         return self._makeValue(value = val)
 
     def _calcValueNoInline(self, N, M, ids, orientations, volumes):
+        if self.mesh.topology._cellFaceIncidence is not None:
+            contributions = self.faceGradientContributions.value
+            if type(contributions) is numerix.ndarray and type(volumes) is numerix.ndarray:
+                shape = contributions.shape[:-1] + (N,)
+                grad = self.mesh._sumOverCellFaces(contributions,
+                                                   out=self._outBuffer(shape, numerix.result_type(float, contributions)))
+                grad /= volumes
+                return grad
+
         contributions = numerix.take(self.faceGradientContributions, ids, axis=-1)
         grad = numerix.array(numerix.sum(orientations * contributions, -2))
-        return grad / volumes
+        if type(volumes) is numerix.ndarray:
+            return numerix.divide(grad, volumes,
+                                  out=self._outBuffer(grad.shape, numerix.result_type(grad, volumes)))
+        else:
+            return grad / volumes
 
     def _calcValue(self):
         if inline.doInline and self.var.rank == 0:
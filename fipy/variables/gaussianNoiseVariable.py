@@ -46,7 +46,7 @@
 
 __docformat__ = 'restructuredtext'
 
-from fipy.tools.numerix import random, sqrt
+from fipy.tools.numerix import sqrt
 from fipy.variables.noiseVariable import NoiseVariable
 
 __all__ = ["GaussianNoiseVariable"]
@@ -148,29 +148,20 @@ class GaussianNoiseVariable(NoiseVariable):
       :alt: histogram of random values with a Gaussian distribution
 
     """
-    def __init__(self, mesh, name = '', mean = 0., variance = 1., hasOld = 0):
+    def __init__(self, mesh, name = '', mean = 0., variance = 1., hasOld = 0, seed = None):
         """
         :Parameters:
             - `mesh`: The mesh on which to define the noise.
             - `mean`: The mean of the noise distribution, :math:`\mu`.
             - `variance`: The variance of the noise distribution, :math:`\sigma^2`.
+            - `seed`: A non-negative integer that selects the sequence of noise.
         """
         self.mean = mean
         self.variance = variance
-        NoiseVariable.__init__(self, mesh = mesh, name = name, hasOld = hasOld)
+        NoiseVariable.__init__(self, mesh = mesh, name = name, hasOld = hasOld, seed = seed)
 
-    def parallelRandom(self):
-
-        if hasattr(self.variance, 'globalValue'):
-            variance = self.variance.globalValue
-        else:
-            variance = self.variance
-
-        if self.mesh.communicator.procID == 0:
-            return random.normal(self.mean, sqrt(variance),
-                                 size = [self.mesh.globalNumberOfCells])
-        else:
-            return None
+    def _sample(self, generator, parameter):
+        return generator.normal(parameter(self.mean), sqrt(parameter(self.variance)))
 
 def _test():
     import fipy.tests.doctestPlus
@@ -157,20 +157,28 @@ class _MeshVariable(Variable):
             value = value.value
         return value
 
-    def _getGlobalValue(self, localIDs, globalIDs):
-        localValue = self.value
-        if self.mesh.communicator.Nproc > 1:
-            if localValue.shape[-1] != 0:
-                localValue = localValue[..., localIDs]
-            globalIDs = numerix.concatenate(self.mesh.communicator.allgather(globalIDs))
-
-            globalValue = numerix.empty(localValue.shape[:-1] + (max(globalIDs) + 1,),
-                                        dtype=numerix.obj2sctype(localValue))
-            globalValue[..., globalIDs] = numerix.concatenate(self.mesh.communicator.allgather(localValue), axis=-1)
-
-            return globalValue
-        else:
-            return localValue
+    @property
+    def _distribution(self):
+        raise NotImplementedError
+
+    def _getGlobalValue(self):
+        return self._distribution.allgather(self.value)
+
+    def gatherValue(self, root=0):
+        """Concatenate the values from all processors on processor `root`
+
+        Unlike :attr:`globalValue`, the values are only sent to `root`, so
+        this is the cheaper choice when only one processor needs them, e.g.,
+        to write them out. Every other processor gets `None`.
+
+        When running on a single processor, the result is identical to
+        :attr:`~fipy.variables.variable.Variable.value`.
+
+            >>> from fipy import Grid1D, CellVariable
+            >>> print CellVariable(mesh=Grid1D(nx=3), value=(1, 2, 3)).gatherValue()
+            [1 2 3]
+        """
+        return self._distribution.gather(self.value, root=root)
 
     def __str__(self):
         return str(self.globalValue)
@@ -44,6 +44,8 @@
 
 __docformat__ = 'restructuredtext'
 
+from fipy.tools import numerix
+from fipy.tools.counterRandom import CounterRandom
 from fipy.variables.cellVariable import CellVariable
 
 __all__ = ["NoiseVariable"]
@@ -58,15 +60,47 @@ class NoiseVariable(CellVariable):
 
         <Specific>NoiseVariable(...).faceGrad.divergence
 
-    The `seed()` and `get_seed()` functions of the
-    `fipy.tools.numerix.random` module can be set and query the random
-    number generated used by all `NoiseVariable` objects.
+    The noise is drawn from a counter-based generator, keyed on the `seed`
+    of the `NoiseVariable`, the number of times it has been scrambled and the
+    global ID of each cell. Each process of a parallel run only generates the
+    values of its own cells, and the noise is identical whatever the number
+    of processes. Unless a `seed` is given, it is drawn from the
+    `fipy.tools.numerix.random` module, whose `seed()` function can be set
+    for the sake of reproducible results.
+
+    >>> from fipy.meshes import Grid1D
+    >>> from fipy.variables.uniformNoiseVariable import UniformNoiseVariable
+    >>> noise = UniformNoiseVariable(mesh=Grid1D(nx=10), seed=5)
+    >>> first = noise.copy()
+    >>> print numerix.allclose(noise, UniformNoiseVariable(mesh=Grid1D(nx=10), seed=5))
+    True
+    >>> noise.scramble()
+    >>> print numerix.allclose(noise, first)
+    False
+
+    Noise generated on a subset of the cells matches
+
+    >>> print numerix.allclose(noise.random(ids=numerix.arange(3, 7)), noise[3:7])
+    True
     """
-    def __init__(self, mesh, name = '', hasOld = 0):
+    def __init__(self, mesh, name = '', hasOld = 0, seed = None):
+        """
+        :Parameters:
+            - `mesh`: The mesh on which to define the noise.
+            - `seed`: A non-negative integer that selects the sequence of noise.
+        """
         if self.__class__ is NoiseVariable:
             raise NotImplementedError, "can't instantiate abstract base class"
 
         CellVariable.__init__(self, mesh = mesh, name = name, hasOld = hasOld)
+
+        if seed is None:
+            if mesh.communicator.procID == 0:
+                seed = numerix.random.randint(2**31)
+            seed = mesh.communicator.bcast(seed, root=0)
+        self.seed = seed
+        self.scrambles = 0
+
         self.scramble()
 
     def copy(self):
@@ -82,26 +116,42 @@ class NoiseVariable(CellVariable):
         """
         Generate a new random distribution.
         """
+        self.scrambles += 1
         self._markStale()
 
-    def random(self):
-        pass
-
-    def parallelRandom(self):
-
-        if self.mesh.communicator.procID == 0:
-            return self.random()
+    def random(self, ids=None):
+        """
+        The noise of the cells with global IDs `ids`, by default the local
+        cells of this process, including ghosts.
+        """
+        if ids is None:
+            ids = self.mesh._globalOverlappingCellIDs
+            parameter = numerix.array
         else:
-            return None
+            def parameter(value):
+                if isinstance(value, CellVariable):
+                    return value._distribution.take(value.value, ids)
+                else:
+                    return numerix.array(value)
+
+        return self._sample(CounterRandom(seed=self.seed,
+                                          counter=self.scrambles,
+                                          ids=ids),
+                            parameter)
+
+    def _sample(self, generator, parameter):
+        """
+        Draw the noise from `generator`, with `parameter(p)` the value of
+        a distribution parameter `p` at each of the sampled cells.
+        """
+        raise NotImplementedError
 
     def _calcValue(self):
-        from fipy.tools import parallelComm
-
-        rnd = self.parallelRandom()
+        return self.random()
 
-        if parallelComm.Nproc > 1:
-            rnd = parallelComm.bcast(rnd, root=0)
+def _test():
+    import fipy.tests.doctestPlus
+    return fipy.tests.doctestPlus.testmod()
 
-            return rnd[self.mesh._globalOverlappingCellIDs]
-        else:
-            return rnd
+if __name__ == "__main__":
+    _test()
@@ -89,12 +89,74 @@ def _OperatorVariableClass(baseClass=object):
             if not self.canInline:
                 return self._calcValue_()
             else:
-                from fipy.tools import inline
+                from fipy.tools import inline, fusion
                 if inline.doInline:
                     return self._execInline(comment=self.comment)
+                elif fusion.doFuse:
+                    return self._execFused()
                 else:
                     return self._calcValue_()
 
+        def _canFuse(self):
+            from fipy.tools import fusion
+            return (self.canInline
+                    and not self._isCached()
+                    and len(self.constraints) == 0
+                    and fusion._ufuncOf(self.op, len(self.var)) is not None)
+
+        def _fusedStructure(self, leaves, nodes):
+            """Structure of the elementwise tree rooted here.
+
+            Appends the values of the operands that are not fused to
+            `leaves` and the fused operators, in evaluation order, to `nodes`.
+            """
+            from fipy.tools import fusion
+            ufunc, order = fusion._ufuncOf(self.op, len(self.var))
+            operands = []
+            for i in order:
+                var = self.var[i]
+                if hasattr(var, '_fusedStructure') and var._canFuse():
+                    operands.append(var._fusedStructure(leaves, nodes))
+                else:
+                    if isinstance(var, Variable):
+                        var = var.value
+                    leaves.append(var)
+                    operands.append(len(leaves) - 1)
+            nodes.append(self)
+            return (ufunc, tuple(operands))
+
+        def _execFused(self):
+            """
+            Evaluate this operator and its uncached elementwise operands in
+            one pass, without allocating an array for each intermediate
+            result.
+            """
+            from fipy.tools import fusion
+            from fipy.tools.dimensions.physicalField import PhysicalField
+
+            if (self.shape == ()
+                or fusion._ufuncOf(self.op, len(self.var)) is None
+                or not [var for var in self.var
+                        if hasattr(var, '_fusedStructure') and var._canFuse()]):
+                # nothing to gain
+                return self._calcValue_()
+
+            leaves = []
+            nodes = []
+            structure = self._fusedStructure(leaves, nodes)
+
+            for leaf in leaves:
+                if (isinstance(leaf, (PhysicalField, numerix.MA.MaskedArray, str))
+                    or not numerix.isscalar(leaf) and not isinstance(leaf, numerix.ndarray)):
+                    return self._calcValue_()
+
+            value = fusion._getKernel(structure)(*leaves)
+
+            for node in nodes[:-1]:
+                node._markFresh()
+
+            return value
+
         def _calcValue_(self):
             pass
 
@@ -1239,6 +1301,42 @@ def _testBinOp(self):
     """
     pass
 
+def _testFusion(self):
+    """
+    Test of fused evaluation, which is only switched on while each value
+    is evaluated, so that it never leaks into other tests
+
+        >>> from fipy.tools import fusion
+        >>> def fused(evaluate):
+        ...     doFuse = fusion.doFuse
+        ...     fusion.doFuse = True
+        ...     try:
+        ...         return evaluate()
+        ...     finally:
+        ...         fusion.doFuse = doFuse
+
+        >>> from fipy import Grid1D, CellVariable
+        >>> mesh = Grid1D(nx=4)
+        >>> x = mesh.cellCenters[0]
+        >>> a = CellVariable(mesh=mesh, value=x)
+        >>> b = numerix.exp(-a) * (a - 1)**2 / (1 + a)
+        >>> print fused(lambda: numerix.allclose(b, numerix.exp(-x) * (x - 1)**2 / (1 + x)))
+        True
+        >>> a.setValue(2 * x)
+        >>> print fused(lambda: numerix.allclose(b, numerix.exp(-2 * x) * (2 * x - 1)**2 / (1 + 2 * x)))
+        True
+
+    Cached operands are evaluated separately, so they stay current
+
+        >>> c = a * a
+        >>> d = c + 1
+        >>> e = c - 1
+        >>> a.setValue(x)
+        >>> print fused(lambda: (d.value, e.value))
+        (array([  1.25,   3.25,   7.25,  13.25]), array([ -0.75,   1.25,   5.25,  11.25]))
+    """
+    pass
+
 def _test():
     import fipy.tests.doctestPlus
     return fipy.tests.doctestPlus.testmod()
@@ -60,6 +60,7 @@ def _suite():
             'fipy.variables.cellVariable',
             'fipy.variables.faceVariable',
             'fipy.variables.operatorVariable',
+            'fipy.variables.noiseVariable',
             'fipy.variables.betaNoiseVariable',
             'fipy.variables.exponentialNoiseVariable',
             'fipy.variables.gammaNoiseVariable',
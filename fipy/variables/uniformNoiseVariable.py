@@ -44,7 +44,6 @@
 
 __docformat__ = 'restructuredtext'
 
-from fipy.tools.numerix import random
 from fipy.variables.noiseVariable import NoiseVariable
 
 __all__ = ["UniformNoiseVariable"]
@@ -85,20 +84,20 @@ class UniformNoiseVariable(NoiseVariable):
        :align: center
        :alt: histogram of random values with a uniform distribution
     """
-    def __init__(self, mesh, name = '', minimum = 0., maximum = 1., hasOld = 0):
+    def __init__(self, mesh, name = '', minimum = 0., maximum = 1., hasOld = 0, seed = None):
         """
         :Parameters:
             - `mesh`: The mesh on which to define the noise.
             - `minimum`: The minimum (not-inclusive) value of the distribution.
             - `maximum`: The maximum (not-inclusive) value of the distribution.
+            - `seed`: A non-negative integer that selects the sequence of noise.
         """
         self.minimum = minimum
         self.maximum = maximum
-        NoiseVariable.__init__(self, mesh = mesh, name = name, hasOld = hasOld)
+        NoiseVariable.__init__(self, mesh = mesh, name = name, hasOld = hasOld, seed = seed)
 
-    def random(self):
-        return random.uniform(self.minimum, self.maximum,
-                              size=[self.mesh.globalNumberOfCells])
+    def _sample(self, generator, parameter):
+        return generator.uniform(parameter(self.minimum), parameter(self.maximum))
 
 def _test():
     import fipy.tests.doctestPlus
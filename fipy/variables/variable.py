@@ -48,6 +48,8 @@
 __docformat__ = 'restructuredtext'
 
 import os
+import sys
+import weakref
 
 from fipy.tools.dimensions import physicalField
 from fipy.tools import numerix
@@ -88,6 +90,14 @@ class Variable(object):
 
     _cacheNever = False
 
+    _reuseBuffers = (os.getenv("FIPY_REUSE_BUFFERS") is not None) or False
+    if parser.parse("--reuse-buffers", action="store_true"):
+        _reuseBuffers = True
+
+    # the constrained value and the constraints it was made with
+    _constrainedValue = None
+    _compiledConstraints = (None, None, None)
+
     def __new__(cls, *args, **kwds):
         return object.__new__(cls)
 
@@ -476,18 +486,21 @@ class Variable(object):
     def __setitem__(self, index, value):
         if self._value is None:
             self._getValue()
+        self._ownValue(overwrite=isinstance(index, slice) and index == slice(None))
         self._value[index] = value
         self._markFresh()
 
     def itemset(self, value):
         if self._value is None:
             self._getValue()
+        self._ownValue(overwrite=True)
         self._value.itemset(value)
         self._markFresh()
 
     def put(self, indices, value):
         if self._value is None:
             self._getValue()
+        self._ownValue()
         numerix.put(self._value, indices, value)
         self._markFresh()
 
@@ -529,23 +542,136 @@ class Variable(object):
                 self._setValueInternal(value=None)
             self._markFresh()
         else:
+            # the array handed out may be written in place
+            self._ownValue()
             value = self._value
 
-        if len(self.constraints) > 0:
-            value = value.copy()
-            for constraint in self.constraints:
-                if constraint.where is None:
-                    value[:] = constraint.value
-                else:
-                    mask = constraint.where
+        constraints = self.constraints
+        if len(constraints) > 0:
+            value = self._constrainValue(value, constraints)
+
+        return value
+
+    @staticmethod
+    def _constraintsKey(constraints):
+        key = ()
+        for constraint in constraints:
+            key += (constraint, constraint.value, constraint.where)
+        return key
+
+    @staticmethod
+    def _sameKey(key, other):
+        return (other is not None
+                and len(key) == len(other)
+                and all([a is b for a, b in zip(key, other)]))
+
+    def _constraintMasks(self, constraints, key):
+        """
+        The boolean masks of the `where` of each of the `constraints`, or
+        `None` for a constraint that applies everywhere. The masks given as
+        arrays are only converted once, for as long as the same constraints
+        apply; those given as `Variable` are evaluated every time, and
+        watched for changes.
+        """
+        if not self._sameKey(key, self._compiledConstraints[0]):
+            masks = []
+            watchers = []
+            for constraint in constraints:
+                mask = constraint.where
+                if isinstance(mask, Variable):
+                    watcher = _ConstraintWatcher(self)
+                    mask.subscribedVariables.append(weakref.ref(watcher))
+                    watchers.append(watcher)
+                elif mask is not None:
                     if not hasattr(mask, 'dtype') or mask.dtype != bool:
                         mask = numerix.array(mask, dtype=numerix.NUMERIX.bool)
+                masks.append(mask)
+            self._compiledConstraints = (key, masks, watchers)
+
+        masks = []
+        for mask in self._compiledConstraints[1]:
+            if isinstance(mask, Variable):
+                mask = mask.value
+                if not hasattr(mask, 'dtype') or mask.dtype != bool:
+                    mask = numerix.array(mask, dtype=numerix.NUMERIX.bool)
+            masks.append(mask)
+        return masks
+
+    def _constrainValue(self, value, constraints):
+        """
+        A copy of `value` with the `constraints` applied.
+
+        The copy is kept until `self` changes or is marked stale, which it
+        also is when the value of a constraint is a `Variable` that
+        changes, until the `where` of a constraint is a `Variable` that
+        changes, or until the constraints themselves change, so that reading
+        the value of a constrained `Variable` again only costs a copy.
+        Constraints given as arrays must not be changed in place.
+
+            >>> v = Variable((0., 1., 2., 3.))
+            >>> v.constrain(5., where=(True, False, False, False))
+            >>> print v.value is v.value
+            False
 
-                    if 0 not in value.shape:
-                        try:
-                            value[..., mask] = constraint.value
-                        except:
-                            value[..., mask] = numerix.array(constraint.value)[..., mask]
+        Each read gets its own copy, which can be changed without affecting
+        the `Variable`
+
+            >>> v.value[1] = 9.
+            >>> print v
+            [ 5.  1.  2.  3.]
+
+            >>> mask = Variable((False, False, False, True))
+            >>> v.constrain(7., where=mask)
+            >>> print v
+            [ 5.  1.  2.  7.]
+            >>> mask.value = (False, True, False, False)
+            >>> print v
+            [ 5.  7.  2.  3.]
+            >>> v[2] = 4.
+            >>> print v
+            [ 5.  7.  4.  3.]
+            >>> del v.constraints[0]
+            >>> print v
+            [ 0.  7.  4.  3.]
+
+        Changes made through the copy are set as usual
+
+            >>> v.value += 1.
+            >>> print v
+            [ 1.  7.  5.  4.]
+
+        and the copy can be solved for
+
+            >>> from fipy import Grid1D, CellVariable, TransientTerm, DiffusionTerm, LinearLUSolver
+            >>> mesh = Grid1D(nx=4)
+            >>> var = CellVariable(mesh=mesh, value=0.)
+            >>> var.constrain(1., where=mesh.x < 1)
+            >>> (TransientTerm() == DiffusionTerm()).solve(var=var, dt=1., solver=LinearLUSolver())
+            >>> print var.value[0]
+            1.0
+        """
+        key = self._constraintsKey(constraints)
+        if self._constrainedValue is not None and self._sameKey(key, self._constrainedValue[0]):
+            return self._constrainedValue[1].copy()
+
+        masks = self._constraintMasks(constraints, key)
+
+        value = value.copy()
+        for constraint, mask in zip(constraints, masks):
+            if mask is None:
+                value[:] = constraint.value
+            elif 0 not in value.shape:
+                try:
+                    value[..., mask] = constraint.value
+                except:
+                    value[..., mask] = numerix.array(constraint.value)[..., mask]
+
+        if self._isCached():
+            # keep a private copy, so that changes to the one returned do not
+            # show up in later reads
+            cached = value.copy()
+            cached.flags.writeable = False
+            self._constrainedValue = (key, cached)
 
         return value
 
@@ -649,6 +775,83 @@ class Variable(object):
             for var in self.requiredVariables:
                 var.dontCacheMe(recursive=False)
 
+    def _outBuffer(self, shape, dtype):
+        """
+        Array for `_calcValue()` to write the new value of the `Variable` into.
+
+        When buffer reuse is enabled (with ``--reuse-buffers`` or
+        `FIPY_REUSE_BUFFERS`), this is the previous value of a cached
+        `Variable`, as long as it has the same shape and type and nothing
+        else holds a reference to it. Otherwise, it is a new array, so
+        anyone who kept the previous value still sees it unchanged.
+
+            >>> Variable._reuseBuffers = True
+            >>> b = Variable(value=(1., 2.)) * 2
+            >>> b.cacheMe()
+            >>> print b
+            [ 2.  4.]
+            >>> b._outBuffer((2,), float) is b._value
+            True
+            >>> b._outBuffer((3,), float) is b._value
+            False
+            >>> b._outBuffer((2,), int) is b._value
+            False
+            >>> old = b.value
+            >>> b._outBuffer((2,), float) is b._value
+            False
+
+        so a face value is recomputed in place, unless its previous value
+        is still in use
+
+            >>> from fipy.meshes import Grid1D
+            >>> from fipy.variables.cellVariable import CellVariable
+            >>> v = CellVariable(mesh=Grid1D(nx=3), value=(0., 1., 2.))
+            >>> f = v.arithmeticFaceValue
+            >>> print f
+            [ 0.   0.5  1.5  2. ]
+            >>> address = id(f._value)
+            >>> v.value = (2., 1., 0.)
+            >>> print f
+            [ 2.   1.5  0.5  0. ]
+            >>> print id(f._value) == address
+            True
+            >>> old = f.value
+            >>> v.value = (1., 1., 1.)
+            >>> print f
+            [ 1.  1.  1.  1.]
+            >>> print old
+            [ 2.   1.5  0.5  0. ]
+            >>> Variable._reuseBuffers = False
+        """
+        value = getattr(self, '_value', None)
+        # referenced by self._value, by value and by the getrefcount() argument
+        if (self._reuseBuffers
+            and self._isCached()
+            and type(value) is numerix.ndarray
+            and value.shape == tuple(shape)
+            and value.dtype == numerix.dtype(dtype)
+            and value.base is None
+            and sys.getrefcount(value) <= 3):
+            return value
+        else:
+            return numerix.empty(shape, dtype=dtype)
+
+    def _ownValue(self, overwrite=False):
+        """
+        Make sure that `self._value` can be written in place without
+        changing the value of any other `Variable`.
+
+        Called before every in-place write, and before `value` hands out
+        the array. A plain `Variable` never shares its value, but a double
+        buffered `CellVariable` shares it with its `old` value until one of
+        them changes or is handed out.
+
+        :Parameters:
+          - `overwrite`: Whether every element is about to be replaced, so
+            the current values need not be kept.
+        """
+        pass
+
     def _setValueInternal(self, value, unit=None, array=None):
         self._value = self._makeValue(value=value, unit=unit, array=array)
 
@@ -740,6 +943,7 @@ class Variable(object):
 
         value = self._makeValue(value=tmp, unit=unit, array=None)
 
+        self._ownValue(overwrite=True)
         if numerix.getShape(self._value) == ():
             self._value.itemset(value)
         else:
@@ -848,10 +1052,12 @@ class Variable(object):
                 subscriber()._markStale()
 
     def _markFresh(self):
+        self._constrainedValue = None
         self.stale = 0
         self.__markStale()
 
     def _markStale(self):
+        self._constrainedValue = None
         if not self.stale:
             self.stale = 1
             self.__markStale()
@@ -1690,6 +1896,20 @@ class Variable(object):
         pass
 
 
+class _ConstraintWatcher(object):
+    """
+    Subscribes to the `where` of a constraint in place of the `Variable`
+    it constrains, which only has to forget its constrained value when the
+    `where` changes and does not otherwise depend on it.
+    """
+    def __init__(self, var):
+        self.var = weakref.ref(var)
+
+    def _markStale(self):
+        var = self.var()
+        if var is not None:
+            var._constrainedValue = None
+
 def _test():
     import fipy.tests.doctestPlus
     return fipy.tests.doctestPlus.testmod()
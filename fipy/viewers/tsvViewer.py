@@ -108,35 +108,114 @@ class TSVViewer(AbstractViewer):
             assert mesh is var.mesh
 
 
-    def _plot(self, values, f, dim):
-        for index in range(values.shape[-1]):
-            lineValues = values[...,index]
+    # the number of cells or faces written at a time
+    _chunk = 10000
 
-            # omit any elements whose cell centers lie outside of the specified limits
-            skip = False
-            for axis in range(dim):
-                mini = self._getLimit("%smin" % self._axis[axis])
-                maxi = self._getLimit("%smax" % self._axis[axis])
+    def _plot(self, values, f, dim):
+        """
+        Write the coordinates and values of `values`, one cell or face per
+        column, as lines of tab-separated values.
+        """
+        values = self._limit(values, dim)
+        line = "\t".join(["%.15g"] * values.shape[0]) + "\n"
+        for start in range(0, values.shape[-1], self._chunk):
+            chunk = values[..., start:start + self._chunk]
+            f.write((line * chunk.shape[-1]) % tuple(chunk.transpose().ravel().tolist()))
 
-                if (mini and lineValues[axis] < mini) or (maxi and lineValues[axis] > maxi):
-                    skip = True
-                    break
+    def _limit(self, values, dim):
+        """
+        The columns of `values` whose coordinates lie within the limits,
+        with the first value of each that lies outside of the data limits
+        replaced by `nan`.
+
+            >>> from fipy.meshes import Grid1D
+            >>> viewer = TSVViewer(vars=CellVariable(mesh=Grid1D(nx=4)),
+            ...                    xmax=2., datamin=0.5, datamax=4.)
+            >>> print viewer._limit(numerix.array([[1., 2., 3., 1.],
+            ...                                    [1., 5., 1., -1.],
+            ...                                    [6., 1., 1., 7.]]), dim=1)
+            [[  1.   2.   1.]
+             [  1.  nan  nan]
+             [ nan   1.   7.]]
+        """
+        # omit any elements whose centers lie outside of the specified limits
+        inside = numerix.ones(values.shape[-1], dtype=bool)
+        for axis in range(dim):
+            mini = self._getLimit("%smin" % self._axis[axis])
+            maxi = self._getLimit("%smax" % self._axis[axis])
+            if mini:
+                inside &= ~(values[axis] < mini)
+            if maxi:
+                inside &= ~(values[axis] > maxi)
+        values = numerix.array(values[..., inside], dtype=float)
+
+        # replace the first value of each element that lies outside of the
+        # specified datalimits with 'nan'
+        mini = self._getLimit("datamin")
+        maxi = self._getLimit("datamax")
+        if mini or maxi:
+            data = values[dim:]
+            outside = numerix.zeros(data.shape, dtype=bool)
+            if mini:
+                outside |= data < mini
+            if maxi:
+                outside |= data > maxi
+            elements = numerix.nonzero(outside.any(axis=0))[0]
+            data[outside.argmax(axis=0)[elements], elements] = float("NaN")
+
+        return values
+
+    def _columns(self, centers, rank1Class):
+        """
+        The coordinates and values of the variables, one row per column of
+        output, at the cells or faces owned by this processor, in order of
+        their global IDs, which are returned too.
+        """
+        distribution = centers._distribution
+        ids = distribution.localIDs
+        columns = [numerix.array(centers.value)[..., ids]]
+        for var in self.vars:
+            value = numerix.array(var.value)[..., ids]
+            if isinstance(var, rank1Class) and var.rank == 1:
+                columns.append(value)
+            else:
+                columns.append(value[numerix.newaxis])
+        columns = numerix.concatenate(columns)
 
-            if skip:
-                continue
+        globalIDs = distribution.globalIDs
+        order = numerix.argsort(globalIDs)
+        return globalIDs[order], columns[..., order]
 
-            # replace any values that lie outside of the specified datalimits with 'nan'
-            for valIndex in range(dim, len(lineValues)):
-                mini = self._getLimit("datamin")
-                maxi = self._getLimit("datamax")
+    def _chunks(self, centers, rank1Class):
+        """
+        The columns of all processors, in order of global ID, a chunk at a
+        time, on processor 0. Every other processor gets `None` for each
+        chunk.
 
-                if (mini and lineValues[valIndex] < mini) or (maxi and lineValues[valIndex] > maxi):
-                    lineValues[valIndex] = float("NaN")
-                    break
+        Only one chunk of rows is gathered on processor 0 at a time, so it
+        never holds the values of the whole mesh.
+        """
+        globalIDs, columns = self._columns(centers, rank1Class)
+        communicator = centers.mesh.communicator
 
-            line = ["%.15g" % value for value in lineValues]
-            f.write("\t".join(line))
-            f.write("\n")
+        if communicator.Nproc == 1:
+            yield columns
+        else:
+            if len(globalIDs) > 0:
+                end = globalIDs[-1] + 1
+            else:
+                end = 0
+            end = max(communicator.allgather(end))
+
+            for start in range(0, end, self._chunk):
+                lo, hi = numerix.searchsorted(globalIDs, (start, start + self._chunk))
+                chunks = communicator.gather((globalIDs[lo:hi], columns[..., lo:hi]), root=0)
+                if chunks is None:
+                    yield None
+                else:
+                    ids = numerix.concatenate([chunkIDs for chunkIDs, chunk in chunks])
+                    chunk = numerix.concatenate([chunk for chunkIDs, chunk in chunks], axis=-1)
+                    yield chunk[..., numerix.argsort(ids)]
 
     def plot(self, filename=None):
         """
@@ -163,6 +242,23 @@ class TSVViewer(AbstractViewer):
         0.05    0.45    -2      35      -3.33333333333333
         0.15    0.45    5       35      5
 
+        If `filename` ends in ".npz", the columns are saved in binary, as
+        the arrays of a `numpy.savez` archive named by their headings
+
+        >>> import os, tempfile
+        >>> (fd, filename) = tempfile.mkstemp(suffix=".npz")
+        >>> os.close(fd)
+        >>> TSVViewer(vars = (v,), ymax = 0.2).plot(filename=filename)
+        >>> columns = numerix.load(filename)
+        >>> print sorted(columns.keys()) # doctest: +PROCESSOR_0
+        ['var', 'x', 'y']
+        >>> print columns['var'] # doctest: +PROCESSOR_0
+        [ 0.  2.]
+        >>> columns.close()
+        >>> os.remove(filename)
+
+        Only processor 0 writes anything.
+
         :Parameters:
           filename
             If not `None`, the name of a file to save the image into.
@@ -170,23 +266,22 @@ class TSVViewer(AbstractViewer):
 
         mesh = self.vars[0].mesh
         dim = mesh.dim
+        root = (mesh.communicator.procID == 0)
 
-        if filename is not None:
-            import os
-            if mesh.communicator.procID == 0:
-                if os.path.splitext(filename)[1] == ".gz":
-                    import gzip
-                    f = gzip.GzipFile(filename = filename, mode = 'w', fileobj = None)
-                else:
-                    f = open(filename, "w")
-            else:
-                f = open(os.devnull, mode='w')
-        else:
-            f = sys.stdout
+        import os
+        binary = filename is not None and os.path.splitext(filename)[1] == ".npz"
 
-        if self.title and len(self.title) > 0:
-            f.write(self.title)
-            f.write("\n")
+        if not root:
+            f = open(os.devnull, mode='w')
+        elif filename is None:
+            f = sys.stdout
+        elif binary:
+            f = open(filename, "wb")
+        elif os.path.splitext(filename)[1] == ".gz":
+            import gzip
+            f = gzip.GzipFile(filename = filename, mode = 'w', fileobj = None)
+        else:
+            f = open(filename, "w")
 
         headings = []
         for index in range(dim):
@@ -200,31 +295,36 @@ class TSVViewer(AbstractViewer):
             else:
                 headings.extend([name])
 
-        f.write("\t".join(headings))
-        f.write("\n")
+        if not binary:
+            if self.title and len(self.title) > 0:
+                f.write(self.title)
+                f.write("\n")
+
+            f.write("\t".join(headings))
+            f.write("\n")
 
         cellVars = [var for var in self.vars if isinstance(var, CellVariable)]
         faceVars = [var for var in self.vars if isinstance(var, FaceVariable)]
 
+        passes = []
         if len(cellVars) > 0:
-            values = mesh.cellCenters.globalValue
-            for var in self.vars:
-                if isinstance(var, CellVariable) and var.rank == 1:
-                    values = numerix.concatenate((values, numerix.array(var.globalValue)))
-                else:
-                    values = numerix.concatenate((values, (numerix.array(var.globalValue),)))
-
-            self._plot(values, f, dim)
-
+            passes.append((mesh.cellCenters, CellVariable))
         if len(faceVars) > 0:
-            values = mesh.faceCenters.globalValue
-            for var in self.vars:
-                if isinstance(var, FaceVariable) and var.rank == 1:
-                    values = numerix.concatenate((values, numerix.array(var.globalValue)))
+            passes.append((mesh.faceCenters, FaceVariable))
+
+        saved = []
+        for centers, rank1Class in passes:
+            for values in self._chunks(centers, rank1Class):
+                if values is None:
+                    continue
+                elif binary:
+                    saved.append(self._limit(values, dim))
                 else:
-                    values = numerix.concatenate((values, (numerix.array(var.globalValue),)))
+                    self._plot(values, f, dim)
 
-            self._plot(values, f, dim)
+        if binary and root:
+            values = numerix.concatenate(saved, axis=-1)
+            numerix.savez(f, **dict(zip(headings, values)))
 
         if f is not sys.stdout:
             f.close()
@@ -2,10 +2,12 @@ __docformat__ = 'restructuredtext'
 
 from fipy.viewers.vtkViewer.vtkCellViewer import VTKCellViewer
 from fipy.viewers.vtkViewer.vtkFaceViewer import VTKFaceViewer
+from fipy.viewers.vtkViewer.vtuViewer import VTUViewer
 
 __all__ = ["VTKViewer"]
 __all__.extend(vtkCellViewer.__all__)
 __all__.extend(vtkFaceViewer.__all__)
+__all__.extend(vtuViewer.__all__)
 
 def VTKViewer(vars, title=None, limits={}, **kwlimits):
     """Generic function for creating a `VTKViewer`.
@@ -0,0 +1,457 @@
+__docformat__ = 'restructuredtext'
+
+__all__ = ["VTUViewer"]
+
+import os
+import sys
+from xml.sax.saxutils import quoteattr
+
+from fipy.tools import numerix
+from fipy.variables.cellVariable import CellVariable
+from fipy.viewers.viewer import AbstractViewer
+
+_types = {
+    'float32': 'Float32',
+    'float64': 'Float64',
+    'int8': 'Int8',
+    'int16': 'Int16',
+    'int32': 'Int32',
+    'int64': 'Int64',
+    'uint8': 'UInt8',
+    'uint16': 'UInt16',
+    'uint32': 'UInt32',
+    'uint64': 'UInt64'
+}
+
+class VTUViewer(AbstractViewer):
+    """Writes `CellVariable` data in the XML format of VTK
+
+    Unlike the `VTKViewer`, the `VTUViewer` needs neither `tvtk` nor the
+    values of the whole mesh on one processor. Each processor writes the
+    cells it owns as a separate ".vtu" piece, and processor 0 writes a
+    ".pvtu" file that gathers the pieces into one dataset, without any
+    communication of the values. The coordinates, connectivity and values
+    follow the XML header as appended binary blocks, optionally compressed
+    with `zlib`.
+
+        >>> import os, tempfile
+        >>> from fipy import Grid2D
+        >>> dirname = tempfile.mkdtemp()
+        >>> filename = os.path.join(dirname, "phi.vtu")
+
+        >>> mesh = Grid2D(nx=3, ny=2)
+        >>> x, y = mesh.cellCenters
+        >>> phi = CellVariable(mesh=mesh, name="phi", value=x * y)
+        >>> viewer = VTUViewer(vars=(phi, phi.grad))
+        >>> viewer.plot(filename=filename) # doctest: +SERIAL
+
+        >>> arrays = _read(filename) # doctest: +SERIAL
+        >>> print arrays["types"] # doctest: +SERIAL
+        [7 7 7 7 7 7]
+        >>> print arrays["offsets"] # doctest: +SERIAL
+        [ 4  8 12 16 20 24]
+        >>> print numerix.allclose(arrays["phi"], phi) # doctest: +SERIAL
+        True
+        >>> print numerix.allclose(arrays[phi.grad.name][..., :2], phi.grad.value.swapaxes(0, 1)) # doctest: +SERIAL
+        True
+
+    The mesh does not change between plots, so its blocks are encoded only
+    once
+
+        >>> blocks = viewer._meshBlocks
+        >>> phi.value = x + y
+        >>> viewer.plot(filename=filename) # doctest: +SERIAL
+        >>> print viewer._meshBlocks is blocks
+        True
+        >>> print numerix.allclose(_read(filename)["phi"], phi) # doctest: +SERIAL
+        True
+
+    A file named ".pvtu", or any file in parallel, is written as one piece
+    per processor
+
+        >>> viewer.plot(filename=os.path.join(dirname, "phi.pvtu"))
+        >>> print sorted(os.listdir(dirname)) # doctest: +SERIAL
+        ['phi.pvtu', 'phi.vtu', 'phi_0.vtu']
+        >>> print open(os.path.join(dirname, "phi.pvtu")).read() # doctest: +SERIAL, +ELLIPSIS
+        <?xml version="1.0"?>
+        <VTKFile type="PUnstructuredGrid" version="1.0" byte_order="..." header_type="UInt64">
+          <PUnstructuredGrid GhostLevel="0">
+            <PPoints>
+              <PDataArray type="Float64" NumberOfComponents="3"/>
+            </PPoints>
+            <PCellData Scalars="phi" Vectors="phi_gauss_grad">
+              <PDataArray type="Float64" Name="phi" NumberOfComponents="1"/>
+              <PDataArray type="Float64" Name="phi_gauss_grad" NumberOfComponents="3"/>
+            </PCellData>
+            <Piece Source="phi_0.vtu"/>
+          </PUnstructuredGrid>
+        </VTKFile>
+        <BLANKLINE>
+
+    Each plot of a viewer with a `collection` is added to a ".pvd" index of
+    the time series, which names each file after the collection if no
+    `filename` is given
+
+        >>> collection = os.path.join(dirname, "series.pvd")
+        >>> viewer = VTUViewer(vars=phi, collection=collection, compressor="zlib")
+        >>> for t in (0., 0.5):
+        ...     phi.value = x * y + t
+        ...     viewer.plot(time=t)
+        >>> print open(collection).read() # doctest: +PROCESSOR_0
+        <?xml version="1.0"?>
+        <VTKFile type="Collection" version="1.0">
+          <Collection>
+            <DataSet timestep="0.0" part="0" file="series_0000.vtu"/>
+            <DataSet timestep="0.5" part="0" file="series_0001.vtu"/>
+          </Collection>
+        </VTKFile>
+        <BLANKLINE>
+        >>> arrays = _read(os.path.join(dirname, "series_0001.vtu")) # doctest: +SERIAL
+        >>> print numerix.allclose(arrays["phi"], x * y + 0.5) # doctest: +SERIAL
+        True
+
+    Names are escaped, and tensors have the 3 x 3 components that VTK
+    expects
+
+        >>> tensor = phi.grad.grad
+        >>> tensor.name = '<grad("phi") & more>'
+        >>> viewer = VTUViewer(vars=(phi, tensor))
+        >>> viewer.plot(filename=filename) # doctest: +SERIAL
+        >>> from xml.dom import minidom
+        >>> header = open(filename, "rb").read().split("<AppendedData")[0] + "</VTKFile>" # doctest: +SERIAL
+        >>> print minidom.parseString(header).getElementsByTagName("CellData")[0].getAttribute("Tensors") # doctest: +SERIAL
+        <grad("phi") & more>
+        >>> arrays = _read(filename) # doctest: +SERIAL
+        >>> print arrays[tensor.name].shape # doctest: +SERIAL
+        (6, 9)
+        >>> print numerix.allclose(arrays[tensor.name].reshape((6, 3, 3))[:, :2, :2],
+        ...                        tensor.value.transpose((2, 0, 1))) # doctest: +SERIAL
+        True
+
+        >>> import shutil
+        >>> shutil.rmtree(dirname)
+
+    Other meshes are written with the cells that `VTKCellViewer` uses
+
+        >>> from fipy import Grid1D, Grid3D, Tri2D
+        >>> mesh = Grid2D(nx=1, ny=1) + (Tri2D(nx=1, ny=1) + ((1,), (0,)))
+        >>> points, connectivity, offsets, types = VTUViewer._cells(mesh)
+        >>> print offsets
+        [ 4  7 10 13 16]
+        >>> print types
+        [7 7 7 7 7]
+        >>> print VTUViewer._cells(Grid1D(nx=2))[3], VTUViewer._cells(Grid3D(nx=1, ny=1, nz=1))[3]
+        [3 3] [41]
+    """
+
+    _blockSize = 2**15
+
+    def __init__(self, vars, title=None, collection=None, compressor=None, limits={}, **kwlimits):
+        """Creates a `VTUViewer`
+
+        :Parameters:
+          vars
+            a `CellVariable` or a tuple of them
+          title
+            not used
+          collection
+            the name of a ".pvd" file that indexes the files written by
+            each call to `plot()`, or `None`
+          compressor
+            `None` to write the binary data raw, or "zlib"
+          limits : dict
+            a (deprecated) alternative to limit keyword arguments
+          xmin, xmax, ymin, ymax, zmin, zmax, datamin, datamax
+            not used
+        """
+        kwlimits.update(limits)
+        AbstractViewer.__init__(self, vars=vars, title=title, **kwlimits)
+
+        if compressor not in (None, "zlib"):
+            raise ValueError("compressor must be None or 'zlib', not %s" % repr(compressor))
+        self.compressor = compressor
+
+        self.collection = collection
+        self._dataSets = []
+
+        self.mesh = self.vars[0].mesh
+        self._meshBlocks = None
+
+    def _getSuitableVars(self, vars):
+        if type(vars) not in [type([]), type(())]:
+            vars = [vars]
+        vars = [var for var in vars if isinstance(var, CellVariable)]
+        if len(vars) == 0:
+            raise TypeError("%s can only display %s" % (self.__class__.__name__, CellVariable.__name__))
+        vars = [var for var in vars if var.mesh == vars[0].mesh]
+        return vars
+
+    @staticmethod
+    def _cells(mesh):
+        """
+        The coordinates of the vertices of the cells owned by this
+        processor, and the connectivity, end offsets and VTK types of those
+        cells. Only the vertices of those cells are written, numbered in
+        the order of the mesh.
+        """
+        ids = mesh._localNonOverlappingCellIDs
+        cvi = mesh._orderedCellVertexIDs[..., ids].swapaxes(0, 1)
+        if isinstance(cvi, numerix.ma.masked_array):
+            counts = cvi.count(axis=1)
+            connectivity = cvi.compressed()
+        else:
+            counts = numerix.array([cvi.shape[1]] * cvi.shape[0])
+            connectivity = cvi.ravel()
+
+        vertices = numerix.unique(connectivity)
+        connectivity = numerix.searchsorted(vertices, connectivity)
+        points = mesh._toVTK3D(numerix.array(mesh.vertexCoords)[..., vertices])
+
+        offsets = numerix.cumsum(counts)
+        types = numerix.array([mesh._VTKCellType] * len(ids), 'uint8')
+
+        return (points.astype('float64'), connectivity.astype('int64'),
+                offsets.astype('int64'), types)
+
+    def _fields(self):
+        """
+        The name, number of components and local values of each variable,
+        one row per owned cell.
+        """
+        ids = self.mesh._localNonOverlappingCellIDs
+        fields = []
+        for var in self.vars:
+            name = var.name or "%s #%d" % (var.__class__.__name__, id(var))
+            value = numerix.array(var.value)[..., ids]
+            if var.rank == 1:
+                value = self.mesh._toVTK3D(value, rank=1)
+            elif var.rank == 2:
+                # VTK tensors always have 3 x 3 components
+                tensor = numerix.zeros((3, 3) + value.shape[2:], dtype=value.dtype)
+                tensor[:value.shape[0], :value.shape[1]] = value
+                value = tensor.reshape((9, -1)).swapaxes(0, 1)
+            elif var.rank > 2:
+                value = value.reshape((-1, len(ids))).swapaxes(0, 1)
+            if value.dtype.name == 'bool':
+                value = value.astype('int8')
+            fields.append((name, var.rank, value))
+        return fields
+
+    def _encode(self, array):
+        """
+        An appended block of `array`, preceded by its size, or by the sizes
+        of its compressed pieces.
+
+            >>> from fipy import Grid1D
+            >>> viewer = VTUViewer(vars=CellVariable(mesh=Grid1D(nx=1)))
+            >>> array = numerix.arange(5000, dtype='float64')
+            >>> print _decode(viewer._encode(array), 0, 'float64', False)[-1]
+            4999.0
+            >>> viewer = VTUViewer(vars=viewer.vars, compressor="zlib")
+            >>> block = viewer._encode(array)
+            >>> print len(block) < array.nbytes
+            True
+            >>> print numerix.allclose(_decode(block, 0, 'float64', True), array)
+            True
+        """
+        data = numerix.ascontiguousarray(array).tostring()
+        if self.compressor is None:
+            return numerix.array([len(data)], 'uint64').tostring() + data
+        else:
+            import zlib
+            blocks = [zlib.compress(data[start:start + self._blockSize])
+                      for start in range(0, len(data), self._blockSize)]
+            header = [len(blocks), self._blockSize, len(data) % self._blockSize]
+            header += [len(block) for block in blocks]
+            return numerix.array(header, 'uint64').tostring() + "".join(blocks)
+
+    @staticmethod
+    def _components(array):
+        if len(array.shape) > 1:
+            return array.shape[1]
+        else:
+            return 1
+
+    def _dataArray(self, array, offset, name=None, tag="DataArray"):
+        attributes = ['type="%s"' % _types[array.dtype.name]]
+        if name is not None:
+            attributes.append('Name=%s' % quoteattr(name))
+        attributes.append('NumberOfComponents="%d"' % self._components(array))
+        if offset is not None:
+            attributes.extend(['format="appended"', 'offset="%d"' % offset])
+        return "<%s %s/>" % (tag, " ".join(attributes))
+
+    @staticmethod
+    def _active(fields):
+        active = []
+        for rank, kind in ((0, "Scalars"), (1, "Vectors"), (2, "Tensors")):
+            names = [name for name, fieldRank, value in fields if fieldRank == rank]
+            if len(names) > 0:
+                active.append(' %s=%s' % (kind, quoteattr(names[0])))
+        return "".join(active)
+
+    def _header(self, kind):
+        attributes = ['type="%s"' % kind,
+                      'version="1.0"',
+                      'byte_order="%s"' % {'little': 'LittleEndian', 'big': 'BigEndian'}[sys.byteorder],
+                      'header_type="UInt64"']
+        if self.compressor == "zlib" and kind == "UnstructuredGrid":
+            attributes.append('compressor="vtkZLibDataCompressor"')
+        return '<?xml version="1.0"?>\n<VTKFile %s>\n' % " ".join(attributes)
+
+    def _writePiece(self, filename, fields):
+        if self._meshBlocks is None:
+            arrays = self._cells(self.mesh)
+            blocks = [self._encode(array) for array in arrays]
+            self._meshBlocks = (arrays, blocks)
+        arrays, blocks = self._meshBlocks
+        points, connectivity, offsets, types = arrays
+
+        starts = numerix.cumsum([0] + [len(block) for block in blocks])
+
+        f = open(filename, "wb")
+        try:
+            f.write(self._header("UnstructuredGrid"))
+            f.write('  <UnstructuredGrid>\n')
+            f.write('    <Piece NumberOfPoints="%d" NumberOfCells="%d">\n' % (len(points), len(types)))
+            f.write('      <Points>\n')
+            f.write('        %s\n' % self._dataArray(points, starts[0]))
+            f.write('      </Points>\n')
+            f.write('      <Cells>\n')
+            for name, array, start in zip(("connectivity", "offsets", "types"), arrays[1:], starts[1:]):
+                f.write('        %s\n' % self._dataArray(array, start, name=name))
+            f.write('      </Cells>\n')
+
+            fieldBlocks = [self._encode(value) for name, rank, value in fields]
+            start = starts[-1]
+            f.write('      <CellData%s>\n' % self._active(fields))
+            for (name, rank, value), block in zip(fields, fieldBlocks):
+                f.write('        %s\n' % self._dataArray(value, start, name=name))
+                start += len(block)
+            f.write('      </CellData>\n')
+            f.write('    </Piece>\n')
+            f.write('  </UnstructuredGrid>\n')
+
+            f.write('  <AppendedData encoding="raw">\n   _')
+            for block in blocks + fieldBlocks:
+                f.write(block)
+            f.write('\n  </AppendedData>\n')
+            f.write('</VTKFile>\n')
+        finally:
+            f.close()
+
+    def _writeParallel(self, filename, fields, pieces):
+        f = open(filename, "w")
+        try:
+            f.write(self._header("PUnstructuredGrid"))
+            f.write('  <PUnstructuredGrid GhostLevel="0">\n')
+            f.write('    <PPoints>\n')
+            f.write('      %s\n' % self._dataArray(numerix.zeros((0, 3), 'float64'), None, tag="PDataArray"))
+            f.write('    </PPoints>\n')
+            f.write('    <PCellData%s>\n' % self._active(fields))
+            for name, rank, value in fields:
+                f.write('      %s\n' % self._dataArray(value, None, name=name, tag="PDataArray"))
+            f.write('    </PCellData>\n')
+            for piece in pieces:
+                f.write('    <Piece Source=%s/>\n' % quoteattr(os.path.basename(piece)))
+            f.write('  </PUnstructuredGrid>\n')
+            f.write('</VTKFile>\n')
+        finally:
+            f.close()
+
+    def _writeCollection(self):
+        f = open(self.collection, "w")
+        try:
+            f.write('<?xml version="1.0"?>\n')
+            f.write('<VTKFile type="Collection" version="1.0">\n')
+            f.write('  <Collection>\n')
+            for time, filename in self._dataSets:
+                f.write('    <DataSet timestep="%s" part="0" file=%s/>\n' % (repr(time), quoteattr(filename)))
+            f.write('  </Collection>\n')
+            f.write('</VTKFile>\n')
+        finally:
+            f.close()
+
+    def plot(self, filename=None, time=None):
+        """
+        Write the variables to `filename`.
+
+        In serial, a `filename` ending in ".vtu" is written as a single
+        file. Otherwise, each processor writes its cells to a piece named
+        after `filename` and its processor number, and processor 0 writes
+        the ".pvtu" file that names the pieces.
+
+        :Parameters:
+          filename
+            the name of the file to write, or `None` to name it after the
+            `collection` and the number of the plot
+          time
+            the time of this plot in the `collection`, by default the
+            number of the plot
+        """
+        if filename is None:
+            if self.collection is None:
+                raise ValueError("a filename is required without a collection")
+            filename = "%s_%04d.vtu" % (os.path.splitext(self.collection)[0], len(self._dataSets))
+
+        communicator = self.mesh.communicator
+        fields = self._fields()
+
+        root, ext = os.path.splitext(filename)
+        if ext == ".vtu" and communicator.Nproc == 1:
+            self._writePiece(filename, fields)
+        else:
+            filename = root + ".pvtu"
+            pieces = ["%s_%d.vtu" % (root, procID) for procID in range(communicator.Nproc)]
+            self._writePiece(pieces[communicator.procID], fields)
+            if communicator.procID == 0:
+                self._writeParallel(filename, fields, pieces)
+
+        if self.collection is not None:
+            if time is None:
+                time = len(self._dataSets)
+            self._dataSets.append((time, os.path.relpath(filename, os.path.dirname(os.path.abspath(self.collection)))))
+            if communicator.procID == 0:
+                self._writeCollection()
+
+def _decode(data, offset, dtype, compressed):
+    if compressed:
+        import zlib
+        count = int(numerix.fromstring(data[offset:offset + 8], 'uint64')[0])
+        start = offset + 24 + 8 * count
+        sizes = numerix.fromstring(data[offset + 24:start], 'uint64')
+        pieces = []
+        for size in sizes.astype(int):
+            pieces.append(zlib.decompress(data[start:start + size]))
+            start += size
+        return numerix.fromstring("".join(pieces), dtype)
+    else:
+        size = int(numerix.fromstring(data[offset:offset + 8], 'uint64')[0])
+        return numerix.fromstring(data[offset + 8:offset + 8 + size], dtype)
+
+def _read(filename):
+    """
+    The arrays of a ".vtu" file written by a `VTUViewer`, by name.
+    """
+    from xml.dom import minidom
+    data = open(filename, "rb").read()
+    header, appended = data.split('<AppendedData encoding="raw">\n   _', 1)
+    document = minidom.parseString(header + "</VTKFile>")
+    compressed = document.documentElement.hasAttribute("compressor")
+    dtypes = dict([(value, key) for key, value in _types.items()])
+    arrays = {}
+    for element in document.getElementsByTagName("DataArray"):
+        array = _decode(appended, int(element.getAttribute("offset")),
+                        dtypes[element.getAttribute("type")], compressed)
+        components = int(element.getAttribute("NumberOfComponents"))
+        if components > 1:
+            array = array.reshape((-1, components))
+        arrays[element.getAttribute("Name") or "Points"] = array
+    return arrays
+
+def _test():
+    import fipy.tests.doctestPlus
+    return fipy.tests.doctestPlus.testmod()
+
+if __name__ == "__main__":
+    _test()